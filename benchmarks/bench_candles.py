@@ -0,0 +1,51 @@
+"""
+Compares memory usage and construction time of tuple of candle dictionaries
+with columnar CandleSeries.
+
+Usage: python -m benchmarks.bench_candles [number_of_candles]
+"""
+import sys
+import time
+import tracemalloc
+
+from crypto_exchange_handler.kucoin import parse_candles
+
+
+def make_klines(amount: int) -> list:
+    """
+    Creates raw klines in format returned by Kucoin market/candles endpoint.
+    """
+    return [
+        [str(1655407800 + 60 * i), "20843.9", "20673.8", "20920.8", "20626", "1.5", "31000.2"]
+        for i in range(amount)
+    ]
+
+
+def measure(klines: list, as_series: bool):
+    """
+    :return: construction time in seconds and size of created result in bytes
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = parse_candles(klines, as_series=as_series)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, size
+
+
+def main():
+    """
+    Runs benchmark and prints results.
+    """
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    klines = make_klines(amount)
+
+    for name, as_series in (("tuple of dicts", False), ("CandleSeries", True)):
+        elapsed, size = measure(klines, as_series)
+        print(f"{name:>15}: {elapsed:6.2f} s, {size / 2 ** 20:8.1f} MiB for {amount} candles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Compares indicators computed in Python loops over candle dictionaries with
+vectorized indicators on columns and with rolling indicators updated per candle.
+
+Usage: python -m benchmarks.bench_indicators [number_of_candles]
+"""
+import math
+import random
+import sys
+import time
+
+from crypto_exchange_handler.candles import CandleSeries
+from crypto_exchange_handler.indicators import (
+    RollingATR, RollingEMA, RollingRSI, RollingSMA, atr, candle_columns, ema, rsi, sma
+)
+
+PERIOD = 14
+
+
+def make_candles(amount: int) -> CandleSeries:
+    """
+    Creates random walk candles ordered from the oldest one.
+    """
+    generator = random.Random(0)
+    series = CandleSeries()
+    close = 20000.0
+    for index in range(amount):
+        open_ = close
+        close = open_ + generator.gauss(0, 10)
+        high = max(open_, close) + generator.random() * 5
+        low = min(open_, close) - generator.random() * 5
+        series.append(60 * index, open_, high, low, close)
+    return series
+
+
+def naive_indicators(candles: tuple) -> dict:
+    """
+    Computes SMA, EMA, ATR and RSI the way consumers do it, in loops over dictionaries.
+    """
+    closes = [candle["close"] for candle in candles]
+    result = {"sma": [], "ema": [], "atr": [], "rsi": []}
+    alpha = 2 / (PERIOD + 1)
+    ema_value = atr_value = gain = loss = math.nan
+    ranges = 0.0
+    for index, candle in enumerate(candles):
+        window = closes[max(0, index - PERIOD + 1):index + 1]
+        result["sma"].append(sum(window) / PERIOD if len(window) == PERIOD else math.nan)
+        if index == PERIOD - 1:
+            ema_value = sum(window) / PERIOD
+        elif index >= PERIOD:
+            ema_value += alpha * (candle["close"] - ema_value)
+        result["ema"].append(ema_value)
+
+        true_range = candle["high"] - candle["low"]
+        if index:
+            previous = candles[index - 1]["close"]
+            true_range = max(
+                true_range, abs(candle["high"] - previous), abs(candle["low"] - previous)
+            )
+            change = candle["close"] - previous
+            if index <= PERIOD:
+                gain = (0 if index == 1 else gain) + max(change, 0) / PERIOD
+                loss = (0 if index == 1 else loss) + max(-change, 0) / PERIOD
+            else:
+                gain += (max(change, 0) - gain) / PERIOD
+                loss += (max(-change, 0) - loss) / PERIOD
+        if index < PERIOD:
+            ranges += true_range
+            atr_value = ranges / PERIOD if index == PERIOD - 1 else math.nan
+        else:
+            atr_value += (true_range - atr_value) / PERIOD
+        result["atr"].append(atr_value)
+        result["rsi"].append(100 - 100 / (1 + gain / loss) if index >= PERIOD else math.nan)
+    return result
+
+
+def vectorized_indicators(series: CandleSeries) -> dict:
+    """
+    Computes the same indicators on NumPy columns of series.
+    """
+    columns = candle_columns(series)
+    return {
+        "sma": sma(columns["close"], PERIOD),
+        "ema": ema(columns["close"], PERIOD),
+        "atr": atr(columns["high"], columns["low"], columns["close"], PERIOD),
+        "rsi": rsi(columns["close"], PERIOD),
+    }
+
+
+def rolling_update_time(candles: tuple) -> float:
+    """
+    :return: average time in seconds of updating all rolling indicators with one candle
+    """
+    indicators = (RollingSMA(PERIOD), RollingEMA(PERIOD), RollingATR(PERIOD), RollingRSI(PERIOD))
+    start = time.perf_counter()
+    for candle in candles:
+        for indicator in indicators:
+            indicator.update(candle)
+    return (time.perf_counter() - start) / len(candles)
+
+
+def main():
+    """
+    Runs benchmark and prints results.
+    """
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    series = make_candles(amount)
+    candles = series.to_dicts()
+
+    start = time.perf_counter()
+    naive_indicators(candles)
+    naive = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized_indicators(series)
+    vectorized = time.perf_counter() - start
+
+    print(f"{'naive loops':>15}: {naive:8.3f} s for {amount} candles")
+    print(f"{'vectorized':>15}: {vectorized:8.3f} s, {naive / vectorized:6.1f}x faster")
+    print(f"{'rolling update':>15}: {rolling_update_time(candles) * 1e6:8.2f} us per candle")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Measures update rate of local OrderBook replaying diff stream.
+Stream is read from file with Binance depthUpdate messages, one JSON message
+per line as recorded from combined streams, or generated when no file is given.
+
+Usage: python -m benchmarks.bench_order_book [number_of_updates | recorded_stream.jsonl]
+"""
+import json
+import random
+import sys
+import time
+
+from crypto_exchange_handler.exchange_template import MarketSide
+from crypto_exchange_handler.order_book import OrderBook
+
+LEVELS = 5000
+
+
+def make_stream(amount: int) -> list:
+    """
+    Creates diff messages changing random levels around the middle of the book.
+    """
+    generator = random.Random(0)
+    messages = []
+    for sequence in range(1, amount + 1):
+        bids = [
+            [f"{generator.randint(9000, 9999) / 100:.2f}", f"{generator.choice((0, 1.5, 3)):.8f}"]
+            for _ in range(generator.randint(1, 4))
+        ]
+        asks = [
+            [f"{generator.randint(10001, 11000) / 100:.2f}", f"{generator.choice((0, 2, 4)):.8f}"]
+            for _ in range(generator.randint(1, 4))
+        ]
+        messages.append({"data": {"U": sequence, "u": sequence, "b": bids, "a": asks}})
+    return messages
+
+
+def load_stream(path: str) -> list:
+    """
+    Reads recorded messages, one JSON message per line.
+    """
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def main():
+    """
+    Runs benchmark and prints results.
+    """
+    argument = sys.argv[1] if len(sys.argv) > 1 else "200000"
+    messages = make_stream(int(argument)) if argument.isdigit() else load_stream(argument)
+    first = messages[0]["data"]["U"]
+
+    book = OrderBook()
+    book.apply_snapshot(
+        {
+            "sequence": first - 1,
+            MarketSide.BID: [[f"{price / 100:.2f}", "1"] for price in range(5000, 5000 + LEVELS)],
+            MarketSide.ASK: [[f"{price / 100:.2f}", "1"] for price in range(10001, 10001 + LEVELS)],
+        }
+    )
+
+    start = time.perf_counter()
+    for message in messages:
+        data = message["data"]
+        book.update(data["U"], data["u"], data["b"], data["a"])
+        book.best_bid()
+        book.best_ask()
+    elapsed = time.perf_counter() - start
+
+    print(f"updates: {len(messages)}, synced: {book.synced}, resyncs: {book.resyncs}")
+    print(f"{len(messages) / elapsed:,.0f} updates/s with best bid/ask read after every update")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Measures cost of client order id generation, ids are taken for every order
+placed, so generation has to stay far below request latency.
+
+Usage: python -m benchmarks.bench_order_id [number_of_ids]
+"""
+import sys
+import time
+
+from crypto_exchange_handler.order_id import OrderIdGenerator
+
+
+def main():
+    """
+    Runs benchmark and prints results.
+    """
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    generator = OrderIdGenerator()
+
+    start = time.perf_counter()
+    for _ in range(amount):
+        generator.next_id()
+    elapsed = time.perf_counter() - start
+
+    print(f"ids: {amount}, last: {generator.next_id()}")
+    print(f"{elapsed / amount * 1e9:,.0f} ns per id")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Module contains Aggregator - runs the same request on many exchanges at once,
+so cross-exchange queries take the time of the slowest exchange instead of
+the sum of latencies, and merges results keyed by Pair.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Union
+
+from .exchange_template import ExchangeAPI, MarketSide
+from .pair import Pair
+
+
+class Aggregated(NamedTuple):
+    """
+    Merged result of request sent to many exchanges.
+    """
+    data: dict
+    timings: Dict[str, float]
+    errors: Dict[str, str]
+    elapsed: float
+
+
+class Aggregator:
+    """
+    Sends requests to many exchanges concurrently using thread pool.
+    Failure or timeout of single exchange is reported in `errors` of the result,
+    results of other exchanges are still returned.
+
+    A thread can not be interrupted, so request which timed out keeps its worker
+    until the transport timeout of the exchange client ends it. Meanwhile the
+    exchange is reported as busy instead of queueing another request, so every
+    exchange occupies at most one worker and a hanging exchange can not starve
+    the pool of the others.
+
+    Attributes
+    ----------
+    exchanges : dict
+        exchange name - exchange client pairs
+    timeout : float
+        maximal time in seconds to wait for exchanges, None waits for all of them
+    """
+
+    def __init__(
+        self,
+        exchanges: Iterable[ExchangeAPI],
+        timeout: Optional[float] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        :param exchanges: exchange clients, names of exchanges have to be unique
+        :param timeout: maximal time in seconds to wait for exchanges
+        :param max_workers: number of threads, one per exchange by default
+        """
+        self.exchanges = {exchange.name: exchange for exchange in exchanges}
+        self.timeout = timeout
+        self._running: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(len(self.exchanges), 1),
+            thread_name_prefix="aggregator",
+        )
+
+    def close(self):
+        """
+        Stops thread pool of the aggregator.
+        """
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _timed(method, args: tuple, kwargs: dict) -> tuple:
+        start = time.perf_counter()
+        result = method(*args, **kwargs)
+        return result, time.perf_counter() - start
+
+    def _submit(self, method: str, args: tuple, kwargs: dict, errors: dict) -> Dict[Future, str]:
+        """
+        Submits call of every exchange which is not busy with previous request.
+
+        :param errors: dictionary receiving busy exchanges
+        :return: future - exchange name pairs
+        """
+        futures: Dict[Future, str] = {}
+        with self._lock:
+            for name, exchange in self.exchanges.items():
+                previous = self._running.get(name)
+                if previous is not None and not previous.done():
+                    errors[name] = "busy with request which timed out"
+                    continue
+                future = self._executor.submit(
+                    self._timed, getattr(exchange, method), args, kwargs
+                )
+                self._running[name] = future
+                futures[future] = name
+        return futures
+
+    def gather(self, method: str, *args, **kwargs) -> Aggregated:
+        """
+        Calls method of every exchange concurrently.
+
+        :param method: name of ExchangeAPI method, i.e. get_order_book
+        :return: Aggregated with exchange name - result pairs as data
+        """
+        start = time.perf_counter()
+        errors: Dict[str, str] = {}
+        futures = self._submit(method, args, kwargs, errors)
+        done, _ = wait(futures, timeout=self.timeout)
+
+        data: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        for future, name in futures.items():
+            if future not in done:
+                future.cancel()
+                errors[name] = f"timeout after {self.timeout}s"
+                continue
+            try:
+                result, timings[name] = future.result()
+            except Exception as exception:  # pylint: disable=broad-except
+                errors[name] = repr(exception)
+                continue
+            if result is None:
+                errors[name] = "no data"
+            else:
+                data[name] = result
+        return Aggregated(data, timings, errors, time.perf_counter() - start)
+
+    def get_coins_prices(
+        self,
+        coins: Iterable[str],
+        quote: Union[str, Iterable[str]] = "BTC",
+        price_type: MarketSide = MarketSide.ASK,
+    ) -> Aggregated:
+        """
+        :param coins: currencies to get prices for
+        :param quote: quote currency or iterable of quote currencies
+        :param price_type: type of price to return
+        :return: Aggregated with data in format {Pair: {"binance": price, "kucoin": price}}
+        """
+        coins = tuple(coins)
+        quote = quote if isinstance(quote, str) else tuple(quote)
+        result = self.gather("get_coins_prices", coins, quote, price_type)
+        merged: Dict[Pair, Dict[str, str]] = {}
+        for name, prices in result.data.items():
+            for pair, price in prices.items():
+                merged.setdefault(Pair.parse(pair), {})[name] = price
+        return result._replace(data=merged)
+
+    def get_all_balances(self) -> Aggregated:
+        """
+        :return: Aggregated with data in format {"BTC": {"binance": balance, "kucoin": balance}}
+        """
+        result = self.gather("get_all_balances")
+        merged: Dict[str, Dict[str, str]] = {}
+        for name, balances in result.data.items():
+            for coin, balance in balances.items():
+                merged.setdefault(coin.upper(), {})[name] = balance
+        return result._replace(data=merged)
+
+    def get_order_book(self, coin: str, quote: str, numeric: bool = False) -> Aggregated:
+        """
+        :param coin: currency to trade
+        :param quote: quote currency
+        :param numeric: return NumericOrderBook instead of lists of [price, size] strings
+        :return: Aggregated with exchange name - order book pairs as data
+        """
+        return self.gather("get_order_book", coin, quote, numeric)
+
+    def get_available_markets(self) -> Aggregated:
+        """
+        :return: Aggregated with data in format {Pair: ("binance", "kucoin")}
+        """
+        result = self.gather("get_symbol_index")
+        merged: Dict[Pair, tuple] = {}
+        for name, index in result.data.items():
+            for pair in index.pairs():
+                merged[pair] = merged.get(pair, ()) + (name,)
+        return result._replace(data=merged)
@@ -0,0 +1,238 @@
+"""
+Module contains asyncio variant of Binance exchange client.
+Exhange address:   https://www.binance.com/
+Api documentation: https://binance-docs.github.io/apidocs/spot/en/
+"""
+# pylint: disable=duplicate-code
+import asyncio
+import hashlib
+import hmac
+import time
+from typing import Iterable, Optional, Tuple, Dict, Union
+from urllib.parse import urlencode
+
+import aiohttp
+
+from .async_exchange_template import AsyncExchangeAPI, send_json
+from .balances import Balances
+from .candles import CandleSeries
+from .exchange_template import DEFAULT_BALANCE_TTL, MarketSide, to_quotes
+from .intervals import exchange_interval
+from .numeric_book import NumericOrderBook
+from .pair import Pair, as_pair
+from .singleflight import coalesce
+from .symbols import SymbolIndex, binance_symbol_index
+from .binance import (
+    account_balances,
+    parse_ticker_price,
+    index_tickers,
+    parse_coins_prices,
+    find_markets,
+    parse_order_book,
+    parse_klines,
+    klines_params,
+    create_scheduler,
+)
+from .rate_limit import WeightScheduler
+from .retry import CircuitOpenError, RetryableError, RetryPolicy, TransportError
+
+
+class AsyncBinance(AsyncExchangeAPI):
+    """
+    Class handles asyncio connection to the Binance crypto exchange API.
+    """
+
+    def __init__(self, access_key: str, secret_key: str,  # pylint: disable=too-many-arguments
+                 session: Optional[aiohttp.ClientSession] = None,
+                 scheduler: Optional[WeightScheduler] = None,
+                 retry: Optional[RetryPolicy] = None,
+                 balance_ttl: float = DEFAULT_BALANCE_TTL):
+        """
+        :param scheduler: rate limiter, pass the same instance to clients sharing IP or account
+        :param retry: policy repeating failed requests
+        :param balance_ttl: time in seconds for which downloaded balances are reused
+        """
+        super().__init__("binance", access_key, secret_key, session=session)
+        self.balances.ttl = balance_ttl
+        self.api_addr = "https://api.binance.com"
+        self.scheduler = scheduler if scheduler is not None else create_scheduler()
+        self.retry = retry if retry is not None else RetryPolicy()
+
+    async def send_request(
+        self, path: str, params: Optional[dict] = None, req_type: str = "get", signed: bool = False
+    ):
+        """
+        Implementation of communication whith exchange API.
+        :param path: endpoint for request i.e. api/v3/depth
+        :param params: query params of the request
+        :param req_type: method of the request [post, get]
+        :param signed: True for endpoints requiring account authentication
+        :return: json data with response or None in case of error
+        """
+        if req_type not in ("get", "post"):
+            print(f"ERROR: Invalid request type: {req_type}. Use only ['post', 'get']")
+            return None
+
+        try:
+            return await self.retry.call_async(
+                path, self._send, path, params or {}, req_type, signed
+            )
+        except (RetryableError, CircuitOpenError, TransportError) as error:
+            print(f"ERROR: {error}")
+            return None
+
+    async def _send(self, path: str, params: dict, req_type: str, signed: bool):
+        params = dict(params)
+        await self.scheduler.acquire_async(path, params)
+        headers = {"X-MBX-APIKEY": self.access_key}
+        if signed:
+            params["timestamp"] = int(time.time() * 1000)
+            params["signature"] = hmac.new(
+                self.secret_key.encode("utf-8"),
+                urlencode(params).encode("utf-8"),
+                hashlib.sha256,
+            ).hexdigest()
+
+        endpoint_addr = f"{self.api_addr}/{path}"
+        if req_type == "get":
+            request = self.session.get(endpoint_addr, headers=headers, params=params)
+        else:
+            request = self.session.post(endpoint_addr, headers=headers, params=params)
+
+        status, data = await send_json(
+            request, req_type, lambda headers: self.scheduler.update_from_headers(path, headers)
+        )
+        if status != 200:
+            print(f"ERROR: status: {status}, response: {data}")
+            return None
+        return data
+
+    async def _load_balances(self) -> Optional[Balances]:
+        account = await self.send_request("api/v3/account", signed=True)
+        if account is None:
+            return None
+        return account_balances(account)
+
+    async def get_balance(self, coin: str) -> Optional[str]:
+        balances = await self.balances.get()
+        return balances.get(coin) if balances is not None else None
+
+    async def get_all_balances(self) -> Optional[Dict[str, str]]:
+        balances = await self.balances.get()
+        return balances.to_dict(non_zero=True) if balances is not None else None
+
+    async def withdraw_asset(self, asset, target_addr, amount):
+        try:
+            return await self.send_request(
+                "sapi/v1/capital/withdraw/apply",
+                {"coin": asset, "address": target_addr, "amount": amount},
+                req_type="post",
+                signed=True,
+            )
+        finally:
+            self.balances.invalidate()
+
+    async def _load_symbols(self) -> Optional[SymbolIndex]:
+        exchange_info = await self.send_request("api/v3/exchangeInfo")
+        if exchange_info is None:
+            return None
+        return binance_symbol_index(exchange_info)
+
+    async def get_available_markets(self) -> Optional[Tuple[Pair, ...]]:
+        index = await self.get_symbol_index()
+        if index is None:
+            return None
+        return index.pairs()
+
+    @coalesce
+    async def get_coins_prices(
+        self,
+        coins: Iterable[str],
+        quote: Union[str, Iterable[str]] = "BTC",
+        price_type: MarketSide = MarketSide.ASK,
+    ) -> Optional[dict]:
+        if price_type == MarketSide.LATEST:
+            ticker = await self.send_request("api/v3/ticker/price")
+        else:
+            ticker = await self.send_request("api/v3/ticker/bookTicker")
+        index = await self.get_symbol_index()
+        if ticker is None or index is None:
+            return None
+        markets = find_markets(index, coins, to_quotes(quote))
+        return parse_coins_prices(index_tickers(ticker), markets, price_type)
+
+    @coalesce
+    async def get_coin_price(
+        self, coin: str, quote: str = "BTC", price_type: MarketSide = MarketSide.ASK
+    ) -> Optional[str]:
+        tickers = await self.send_request("api/v3/ticker/bookTicker")
+        if tickers is None:
+            print("ERROR: Could not get ticker")
+            return None
+        return parse_ticker_price(index_tickers(tickers), as_pair(coin, quote).binance, price_type)
+
+    @coalesce
+    async def get_order_book(
+        self, coin: str, quote: str, numeric: bool = False
+    ) -> Optional[Union[dict, NumericOrderBook]]:
+        order_book = await self.send_request(
+            "api/v3/depth", {"symbol": as_pair(coin, quote).binance}
+        )
+        if order_book is None:
+            return None
+        if numeric:
+            return NumericOrderBook.from_dict(parse_order_book(order_book))
+        return parse_order_book(order_book)
+
+    async def get_candles(  # pylint: disable=too-many-arguments
+        self,
+        coin: str,
+        quote: str,
+        interval: str,
+        start: Optional[Union[str, int]] = None,
+        end: Optional[Union[str, int]] = None,
+        as_series: bool = False,
+    ) -> Optional[Union[tuple, CandleSeries]]:
+        pages_params = klines_params(coin, quote, interval, start, end)
+        if pages_params is None:
+            return None
+
+        pages = await asyncio.gather(
+            *(self.send_request("api/v3/klines", params) for params in pages_params)
+        )
+        if any(page is None for page in pages):
+            return None
+        klines = [kline for page in pages for kline in page]
+        return parse_klines(klines, as_series=as_series)
+
+    @coalesce
+    async def get_last_candles(  # pylint: disable=too-many-arguments
+        self, coin: str, quote: str, interval: str, amount: int, as_series: bool = False
+    ) -> Optional[Union[tuple, CandleSeries]]:
+        candle_interval = exchange_interval(interval, "binance")
+        if candle_interval is None:
+            return None
+        klines = await self.send_request(
+            "api/v3/klines",
+            {
+                "symbol": as_pair(coin, quote).binance,
+                "interval": candle_interval.binance,
+                "limit": amount,
+            },
+        )
+        if klines is None:
+            return None
+        return parse_klines(klines, as_series=as_series)
+
+    async def create_order(self, market, side, price, amount):
+        print(f"ERROR: {self.name} client - Not implemented")
+
+    async def create_market_order(  # pylint: disable=too-many-arguments
+        self,
+        side: str,
+        coin: str,
+        quote: str,
+        size: Optional[str] = None,
+        amount: Optional[str] = None,
+    ):
+        print(f"ERROR: {self.name} client - Not implemented")
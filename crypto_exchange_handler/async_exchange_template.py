@@ -0,0 +1,339 @@
+"""
+Module contains template class AsyncExchangeAPI from which every asyncio
+exchange class should derive. Methods mirror ExchangeAPI and keep its output format.
+"""
+# pylint: disable=duplicate-code
+
+import asyncio
+from typing import Any, Callable, Iterable, Mapping, Optional, Tuple, Dict, Union
+
+import aiohttp
+
+from .balances import Balances
+from .candles import CandleSeries
+from .exchange_template import DEFAULT_BALANCE_TTL, MarketSide
+from .order_id import ORDER_IDS
+from .retry import RetryableError, TransportError, is_retryable_status, parse_retry_after
+from .singleflight import AsyncSingleFlight
+from .snapshot import AsyncSnapshot
+from .symbols import SymbolIndex
+from .transport import DEFAULT_TIMEOUT, Timeout
+
+DEFAULT_ASYNC_POOL_SIZE = 100
+
+
+def create_async_session(
+    pool_size: int = DEFAULT_ASYNC_POOL_SIZE, timeout: Timeout = DEFAULT_TIMEOUT
+) -> aiohttp.ClientSession:
+    """
+    Creates aiohttp session which can be shared by many asyncio exchange clients.
+    Must be called from within running event loop.
+
+    :param pool_size: maximum number of simultaneously open connections
+    :param timeout: connect/read timeout in seconds, single value or (connect, read) tuple
+    :return: aiohttp.ClientSession
+    """
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=pool_size),
+        timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+    )
+
+
+async def read_json(response: aiohttp.ClientResponse) -> Any:
+    """
+    :param response: response of the API
+    :return: decoded body or None if body is not JSON, i.e. HTML error page
+    """
+    try:
+        return await response.json(content_type=None)
+    except ValueError:
+        return None
+
+
+async def send_json(
+    request, req_type: str, on_headers: Callable[[Mapping[str, str]], None]
+) -> Tuple[int, Any]:
+    """
+    Sends aiohttp request and decodes its JSON body. Status is checked before the body
+    is decoded, so rate limited or failed responses with HTML or empty body are retried.
+
+    :param request: request context manager, i.e. session.get(...)
+    :param req_type: method of the request [post, get]
+    :param on_headers: function receiving headers of every response, i.e. rate limiter
+    :return: status and decoded body of the response
+    :raises RetryableError: for responses worth repeating
+    :raises TransportError: for connection failure or timeout
+    """
+    try:
+        async with request as response:
+            on_headers(response.headers)
+            if is_retryable_status(response.status, req_type):
+                result = await read_json(response)
+                raise RetryableError(
+                    f"status: {response.status}, response: {result}",
+                    retry_after=parse_retry_after(response.headers),
+                    result=result,
+                )
+            return response.status, await read_json(response)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+        connect_failed = isinstance(error, aiohttp.ClientConnectorError)
+        raise TransportError(req_type, error, connect_failed) from error
+
+
+class AsyncExchangeAPI:  # pylint: disable=too-many-instance-attributes
+    """
+    A base class for every asyncio exchange specific class.
+    Defines common coroutines and contains common parameters.
+
+    Attributes
+    ----------
+    name : str
+        lowercase name of exchange
+    access_key : str
+        public API key
+    secret_key : str
+        private API key
+    api_passphrase : str optional
+        oassphrase required by some exchanges
+    session : aiohttp.ClientSession
+        connection pool used for requests, can be shared between clients
+    flights : AsyncSingleFlight
+        coalescing of concurrent identical public data requests
+    balances : AsyncSnapshot
+        balances of account reused for `ttl` seconds, invalidated after orders and withdrawals
+    order_ids : OrderIdGenerator
+        source of client order ids, shared by all clients of the process by default
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        name,
+        access_key: str,
+        secret_key: str,
+        api_passphrase: Optional[str] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
+        """
+        Constructs all the necessary attributes for the AsyncExchangeAPI object.
+
+        Parameters
+        ----------
+        name : str
+            lowercase name of exchange
+        access_key : str
+            public API key
+        secret_key : str
+            private API key
+        api_passphrase : str optional
+            oassphrase required by some exchanges
+        session : aiohttp.ClientSession optional
+            shared connection pool, if not provided client creates its own on first request
+        """
+        self.name = name.lower()
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.api_passphrase = api_passphrase
+        self._session = session
+        self._owns_session = session is None
+        self._symbol_index: Optional[SymbolIndex] = None
+        self.flights = AsyncSingleFlight()
+        self.balances = AsyncSnapshot(self._load_balances, ttl=DEFAULT_BALANCE_TTL)
+        self.order_ids = ORDER_IDS
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        Connection pool used by the client.
+        """
+        if self._session is None:
+            self._session = create_async_session()
+        return self._session
+
+    async def close(self):
+        """
+        Closes connection pool if it has been created by the client.
+        Shared session passed in constructor has to be closed by its owner.
+        """
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _load_symbols(self) -> Optional[SymbolIndex]:
+        """
+        Downloads metadata of all markets listed on exchange.
+
+        :return: SymbolIndex or None in case of error
+        """
+        raise NotImplementedError
+
+    async def get_symbol_index(self) -> Optional[SymbolIndex]:
+        """
+        Gets index of listed markets. Index is downloaded once and reused until refresh_symbols.
+
+        :return: SymbolIndex or None in case of error
+        """
+        if self._symbol_index is None:
+            self._symbol_index = await self._load_symbols()
+        return self._symbol_index
+
+    async def refresh_symbols(self) -> Optional[SymbolIndex]:
+        """
+        Downloads index of listed markets again, i.e. after new listing.
+
+        :return: SymbolIndex or None in case of error
+        """
+        self._symbol_index = None
+        return await self.get_symbol_index()
+
+    async def _load_balances(self) -> Optional[Balances]:
+        """
+        Downloads balances of all coins on account.
+
+        :return: Balances or None in case of error
+        """
+        raise NotImplementedError
+
+    async def get_all_balances(self) -> Optional[Dict[str, str]]:
+        """
+        Gets all balances available on account.
+
+        :return: Dictionary with coin - balance pair
+        """
+        raise NotImplementedError
+
+    async def get_balance(self, coin: str) -> Optional[str]:
+        """
+        Gets balance of coin specified in parameter.
+
+        :param coin: str with coin name
+        :return: str representing coin balance. If there is no such coin returns None
+        """
+        raise NotImplementedError
+
+    async def get_available_markets(self) -> Optional[Tuple[str, ...]]:
+        """
+        Gets tuple of markets available on target exchange.
+        :return: Tuple of available market.
+        """
+        raise NotImplementedError
+
+    async def get_coin_price(
+        self, coin: str, quote: str = "BTC", price_type: MarketSide = MarketSide.ASK
+    ) -> Optional[str]:
+        """
+        :param coin: currency to trade
+        :param quote: quote currency
+        :param price_type:
+        :return:
+        """
+        raise NotImplementedError
+
+    async def get_coins_prices(
+        self,
+        coins: Iterable[str],
+        quote: Union[str, Iterable[str]] = "BTC",
+        price_type: MarketSide = MarketSide.ASK,
+    ) -> Optional[dict]:
+        """
+        Gets prices of many markets with a single ticker request.
+
+        :param coins: currencies to get prices for
+        :param quote: quote currency or iterable of quote currencies
+        :param price_type: type of price to return
+        :return: dictionary with pair in format ADA-BTC - price pair, only listed pairs included
+        """
+        raise NotImplementedError
+
+    async def get_order_book(self, coin: str, quote: str, numeric: bool = False):
+        """
+        :param coin: currency to trade
+        :param quote: quote currency
+        :param numeric: return NumericOrderBook instead of lists of [price, size] strings
+        :return: dictionary with MarketSide keyed levels or NumericOrderBook
+        """
+        raise NotImplementedError
+
+    async def withdraw_asset(self, asset: str, target_addr: str, amount: str):
+        """
+        Sends request for asset withdrawal to the exchange.
+
+        :param asset:
+        :param target_addr:
+        :param amount:
+        :return: None
+        """
+        raise NotImplementedError
+
+    async def create_order(self, market, side, price, amount):
+        """
+        Send request to create order on target exchange
+        :param market:
+        :param side:
+        :param price:
+        :param amount:
+        :return:
+        """
+        raise NotImplementedError
+
+    async def create_market_order(  # pylint: disable=too-many-arguments
+        self,
+        side: str,
+        coin: str,
+        quote: str,
+        size: Optional[str] = None,
+        amount: Optional[str] = None,
+    ):
+        """
+        Send trade request to buy or sell at the market's current best available price.
+        :param side: buy or sell
+        :param coin: currency to trade
+        :param quote: quote currency
+        :param size: amount of base currency to use
+        :param amount: amount of quote currency to use
+        :return:
+        """
+        raise NotImplementedError
+
+    async def get_candles(  # pylint: disable=too-many-arguments
+        self,
+        coin: str,
+        quote: str,
+        interval: str,
+        start: Optional[Union[str, int]] = None,
+        end: Optional[Union[str, int]] = None,
+        as_series: bool = False,
+    ) -> Optional[Union[tuple, CandleSeries]]:
+        """
+        Gets market historical data in form of candles represented by dictionary.
+        Output is the same as ExchangeAPI.get_candles.
+
+        :param coin:
+        :param quote:
+        :param interval:
+        :param start: start time for data in format %Y-%m-%d or epoch timestamp in seconds
+        :param end: end time for data in format %Y-%m-%d or epoch timestamp in seconds
+        :param as_series: return candles as columnar CandleSeries
+        :return: tuple of kline dictionaries
+        """
+        raise NotImplementedError
+
+    async def get_last_candles(  # pylint: disable=too-many-arguments
+        self, coin: str, quote: str, interval: str, amount: int, as_series: bool = False
+    ) -> Optional[Union[tuple, CandleSeries]]:
+        """
+
+        :param coin:
+        :param quote:
+        :param interval:
+        :param amount:
+        :param as_series: return candles as columnar CandleSeries
+        :return:
+        """
+        raise NotImplementedError
@@ -0,0 +1,252 @@
+"""
+Module contains asyncio variant of Kucoin exchange client.
+Exhange address:  https://www.kucoin.com/
+Api documentation: https://docs.kucoin.com/
+"""
+# pylint: disable=duplicate-code
+import asyncio
+import json
+from urllib.parse import urlencode
+from typing import Iterable, Optional, Dict, Tuple, Union
+
+import aiohttp
+
+from .async_exchange_template import AsyncExchangeAPI, send_json
+from .balances import Balances, format_balance
+from .candles import CandleSeries
+from .exchange_template import DEFAULT_BALANCE_TTL, MarketSide
+from .numeric_book import NumericOrderBook
+from .pair import Pair, as_pair
+from .singleflight import coalesce
+from .symbols import SymbolIndex, kucoin_symbol_index
+from .kucoin import (
+    RequestSigner,
+    accounts_balances,
+    is_response_valid,
+    parse_level1_price,
+    parse_tickers_prices,
+    coins_symbols,
+    candles_params,
+    parse_candles,
+    market_order_params,
+    create_scheduler,
+    create_retry_policy,
+)
+from .rate_limit import WeightScheduler
+from .retry import CircuitOpenError, RetryableError, RetryPolicy, TransportError
+
+
+class AsyncKucoin(AsyncExchangeAPI):
+    """
+    Class handles asyncio connection to the KuCoin crypto exchange API.
+    """
+    def __init__(self, access_key: str, secret_key: str,  # pylint: disable=too-many-arguments
+                 api_passphrase: str,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 scheduler: Optional[WeightScheduler] = None,
+                 retry: Optional[RetryPolicy] = None,
+                 balance_ttl: float = DEFAULT_BALANCE_TTL):
+        """
+        :param scheduler: rate limiter, pass the same instance to clients sharing account
+        :param retry: policy repeating failed requests
+        :param balance_ttl: time in seconds for which downloaded balances are reused
+        """
+        super().__init__("kucoin", access_key, secret_key, api_passphrase, session)
+        self.balances.ttl = balance_ttl
+        self.api_addr = "https://api.kucoin.com"
+        self.scheduler = scheduler if scheduler is not None else create_scheduler()
+        self.retry = retry if retry is not None else create_retry_policy()
+        self.signer = RequestSigner(access_key, secret_key, api_passphrase)
+
+    async def send_priv_request(self, addr: str,
+                                data: Optional[dict] = None,
+                                req_type: str = "get") -> Optional[dict]:
+        """
+        Implementation of communication whith exchange API.
+        :param addr: endpoint for request
+        :param req_type: method of the request [post, get]
+        :param data: data for request
+        :return: json data with response
+        """
+        if req_type not in ("get", "post"):
+            print(
+                f"ERROR: Invalid request type: {req_type}. Use only ['post', 'get']"
+            )
+            return None
+
+        return await self._request(addr, data, req_type, signed=True)
+
+    async def send_pub_request(self, addr: str, data: Optional[dict] = None) -> Optional[dict]:
+        """
+        Sends unsigned GET request for public market data, i.e. tickers or candles.
+        :param addr: endpoint for request
+        :param data: query parameters
+        :return: json data with response
+        """
+        return await self._request(addr, data, "get", signed=False)
+
+    async def _request(
+            self, addr: str, data: Optional[dict], req_type: str, signed: bool
+    ) -> Optional[dict]:
+        try:
+            return await self.retry.call_async(addr, self._send, addr, data, req_type, signed)
+        except RetryableError as error:
+            print(f"ERROR: {error}")
+            return error.result
+        except (CircuitOpenError, TransportError) as error:
+            print(f"ERROR: {error}")
+            return None
+
+    async def _send(
+            self, addr: str, data: Optional[dict], req_type: str, signed: bool = True
+    ) -> Optional[dict]:
+        endpoint_addr = f'{self.api_addr}/api/v1/{addr}'
+        await self.scheduler.acquire_async(addr, data)
+        if not signed:
+            request = self.session.get(endpoint_addr, params=data)
+        elif req_type == "get":
+            query = f"?{urlencode(data)}" if data else ""
+            request = self.session.get(
+                endpoint_addr + query, headers=self.signer.headers(req_type, addr + query, "")
+            )
+        else:
+            json_data = json.dumps(data) if data else ""
+            request = self.session.post(
+                endpoint_addr,
+                headers=self.signer.headers(req_type, addr, json_data),
+                data=json_data,
+            )
+
+        _, result = await send_json(
+            request, req_type, lambda headers: self.scheduler.update_from_headers(addr, headers)
+        )
+        return result
+
+    async def _load_balances(self) -> Optional[Balances]:
+        data = await self.send_priv_request("accounts")
+        if not is_response_valid(data):
+            return None
+        return accounts_balances(data["data"])
+
+    async def get_all_balances(self) -> Optional[Dict[str, str]]:
+        balances = await self.balances.get()
+        return balances.to_dict() if balances is not None else None
+
+    async def get_balance(self, coin: str) -> Optional[str]:
+        balances = await self.balances.get()
+        if balances is None:
+            return None
+        return balances.get(coin, format_balance(0.0))
+
+    async def _load_symbols(self) -> Optional[SymbolIndex]:
+        data = await self.send_pub_request("symbols")
+        if not is_response_valid(data):
+            return None
+        return kucoin_symbol_index(data["data"])
+
+    async def get_available_markets(self) -> Optional[Tuple[Pair, ...]]:
+        index = await self.get_symbol_index()
+        if index is None:
+            return None
+        return index.pairs()
+
+    @coalesce
+    async def get_coin_price(self, coin: str,
+                             quote: str = "BTC",
+                             price_type: MarketSide = MarketSide.ASK) -> Optional[str]:
+        pair = as_pair(coin, quote).kucoin
+        data = await self.send_pub_request("market/orderbook/level1", {"symbol": pair})
+        if not is_response_valid(data):
+            return None
+        return parse_level1_price(data["data"], pair, price_type)
+
+    @coalesce
+    async def get_coins_prices(
+            self,
+            coins: Iterable[str],
+            quote: Union[str, Iterable[str]] = "BTC",
+            price_type: MarketSide = MarketSide.ASK,
+    ) -> Optional[dict]:
+        data = await self.send_pub_request("market/allTickers")
+        if not is_response_valid(data):
+            return None
+
+        return parse_tickers_prices(
+            data["data"]["ticker"], coins_symbols(coins, quote), price_type
+        )
+
+    @coalesce
+    async def get_order_book(
+            self, coin: str, quote: str, numeric: bool = False
+    ) -> Optional[Union[dict, NumericOrderBook]]:
+        data = await self.send_pub_request(
+            "market/orderbook/level2_100", {"symbol": as_pair(coin, quote).kucoin}
+        )
+        if not is_response_valid(data):
+            return None
+
+        order_book = {
+            MarketSide.ASK: data["data"][MarketSide.ASK.value],
+            MarketSide.BID: data["data"][MarketSide.BID.value]
+        }
+        return NumericOrderBook.from_dict(order_book) if numeric else order_book
+
+    async def withdraw_asset(self, asset: str, target_addr: str, amount: str):
+        print(f"ERROR: {self.name} client - Not implemented")
+
+    async def create_order(self, market: str, side: str, price: str, amount: str):
+        print(f"ERROR: {self.name} client - Not implemented")
+
+    async def create_market_order(  # pylint: disable=too-many-arguments
+            self, side: str, coin: str, quote: str,
+            size: Optional[str] = None, amount: Optional[str] = None
+    ):
+        params = market_order_params(
+            self.order_ids.next_id(), side, coin, quote, size, amount
+        )
+        if params is None:
+            return None
+
+        try:
+            response = await self.send_priv_request("orders", data=params, req_type="post")
+        finally:
+            self.balances.invalidate()
+        if not is_response_valid(response):
+            return None
+        return response
+
+    async def get_candles(  # pylint: disable=too-many-arguments
+            self,
+            coin: str,
+            quote: str,
+            interval: str,
+            start: Optional[Union[str, int]] = None,
+            end: Optional[Union[str, int]] = None,
+            as_series: bool = False,
+    ) -> Optional[Union[tuple, CandleSeries]]:
+        """
+        Ranges longer than single response page (1500 candles) are split into pages
+        fetched concurrently, then merged from the newest candle.
+        """
+        pages_params = candles_params(coin, quote, interval, start, end)
+        if pages_params is None:
+            return None
+
+        pages = await asyncio.gather(
+            *(self.send_pub_request("market/candles", data=params) for params in pages_params)
+        )
+        if not all(is_response_valid(page) for page in pages):
+            return None
+        # windows are ordered from the oldest one, candles in page from the newest one
+        klines = [candle for page in reversed(pages) for candle in page["data"]]
+        return parse_candles(klines, as_series)
+
+    @coalesce
+    async def get_last_candles(  # pylint: disable=too-many-arguments
+            self, coin: str, quote: str, interval: str, amount: int, as_series: bool = False
+    ) -> Optional[Union[tuple, CandleSeries]]:
+        if amount > 100:
+            print("ERROR: Max number of last candles is 100")
+            return None
+        candles = await self.get_candles(coin, quote, interval, as_series=as_series)
+        return candles[-amount:] if candles is not None else None
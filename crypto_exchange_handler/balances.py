@@ -0,0 +1,69 @@
+"""
+Module contains Balances - account balances downloaded once and looked up
+per coin in constant time, updated in place with changes pushed by exchange.
+"""
+
+import threading
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+
+def format_balance(total: float) -> str:
+    """
+    :return: balance in format returned by exchange clients
+    """
+    return f"{total:.10f}"
+
+
+class Balances:
+    """
+    Thread-safe balances of account. Exchanges keep separate balance of every
+    account type (i.e. Kucoin main and trade accounts), so balances are stored
+    per account and their sum is kept for every coin.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, Union[str, float]]] = ()):
+        """
+        :param entries: (account id, coin, total balance) tuples
+        """
+        self._accounts: Dict[str, Dict[str, float]] = {}
+        self._totals: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        for account, coin, total in entries:
+            self._accounts.setdefault(coin.upper(), {})[account] = float(total)
+        for coin in self._accounts:
+            self._sum(coin)
+
+    def _sum(self, coin: str):
+        self._totals[coin] = format_balance(sum(self._accounts[coin].values()))
+
+    def get(self, coin: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        :param coin: coin abbreviation
+        :param default: value returned for coin missing on account
+        :return: total balance of the coin on all accounts
+        """
+        return self._totals.get(coin.upper(), default)
+
+    def update(self, account: str, coin: str, total: Union[str, float]):
+        """
+        Replaces balance of the coin on single account.
+
+        :param account: account id
+        :param coin: coin abbreviation
+        :param total: new total balance of the account
+        """
+        coin = coin.upper()
+        with self._lock:
+            self._accounts.setdefault(coin, {})[account] = float(total)
+            self._sum(coin)
+
+    def to_dict(self, non_zero: bool = False) -> Dict[str, str]:
+        """
+        :param non_zero: skip coins with zero balance
+        :return: dictionary with coin - balance pair
+        """
+        with self._lock:
+            totals = dict(self._totals)
+        if non_zero:
+            return {coin: total for coin, total in totals.items() if float(total) != 0}
+        return totals
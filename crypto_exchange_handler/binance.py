@@ -4,14 +4,298 @@ Exhange address:   https://www.binance.com/
 Api documentation: https://binance-docs.github.io/apidocs/spot/en/
 """
 
-import time
-from typing import Optional, Tuple, Dict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from typing import Callable, Mapping, List, Optional, Tuple, Dict, Iterable, Union
 
 from binance.exceptions import BinanceRequestException, BinanceAPIException
 from binance.client import Client
+from requests import RequestException, Response
 
 from . import exchange_template
-from .exchange_template import MarketSide
+from .balances import Balances
+from .candles import CandleSeries
+from .exchange_template import MarketSide, to_quotes
+from .intervals import PAGE_LIMITS, exchange_interval, to_timestamp
+from .numeric_book import NumericOrderBook
+from .orders import OrderRequest, OrderResult
+from .pair import Pair, as_pair
+from .rate_limit import TokenBucket, WeightScheduler
+from .retry import CircuitOpenError, RetryPolicy, is_retryable_status, is_transient
+from .singleflight import coalesce
+from .snapshot import Snapshot
+from .symbols import SymbolIndex, SymbolInfo, binance_symbol_index
+
+DEFAULT_TICKER_TTL = 1.0
+ORDER_BOOK_SNAPSHOT_LIMIT = 1000
+KLINES_LIMIT = PAGE_LIMITS["binance"]
+CANDLES_WORKERS = 4
+
+WEIGHT_LIMIT_PER_MINUTE = 6000
+ORDERS_LIMIT_PER_10S = 100
+SAPI_WEIGHT_LIMIT_PER_MINUTE = 180000
+
+
+def depth_weight(params: dict) -> int:
+    """
+    :param params: params of depth request
+    :return: request weight depending on requested number of levels
+    """
+    limit = int(params.get("limit", 100))
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 25
+    if limit <= 1000:
+        return 50
+    return 250
+
+
+def ticker_weight(params: dict) -> int:
+    """
+    :param params: params of ticker request
+    :return: request weight, lower for single symbol than for all tickers
+    """
+    return 2 if params.get("symbol") else 4
+
+
+request_weights = {
+    "api/v3/ping": ("weight", 1),
+    "api/v3/exchangeInfo": ("weight", 20),
+    "api/v3/ticker/price": ("weight", ticker_weight),
+    "api/v3/ticker/bookTicker": ("weight", ticker_weight),
+    "api/v3/depth": ("weight", depth_weight),
+    "api/v3/klines": ("weight", 2),
+    "api/v3/account": ("weight", 20),
+    "api/v3/order": ("orders", 1),
+    "sapi/v1/capital/withdraw/apply": ("sapi", 600),
+}
+
+
+def parse_limit_headers(  # pylint: disable=unused-argument
+    headers: Mapping[str, str], pool: str
+) -> Dict[str, float]:
+    """
+    Reads limit usage reported by Binance in response headers.
+
+    :param headers: response headers
+    :param pool: pool of the request, Binance reports all pools in every response
+    :return: dictionary with pool - remaining weight pair
+    """
+    remaining = {}
+    used_weight = headers.get("x-mbx-used-weight-1m")
+    if used_weight is not None:
+        remaining["weight"] = WEIGHT_LIMIT_PER_MINUTE - float(used_weight)
+    order_count = headers.get("x-mbx-order-count-10s")
+    if order_count is not None:
+        remaining["orders"] = ORDERS_LIMIT_PER_10S - float(order_count)
+    return remaining
+
+
+def create_scheduler() -> WeightScheduler:
+    """
+    :return: scheduler keeping requests within Binance IP and order limits
+    """
+    return WeightScheduler(
+        pools={
+            "weight": TokenBucket(WEIGHT_LIMIT_PER_MINUTE, WEIGHT_LIMIT_PER_MINUTE / 60),
+            "orders": TokenBucket(ORDERS_LIMIT_PER_10S, ORDERS_LIMIT_PER_10S / 10),
+            "sapi": TokenBucket(SAPI_WEIGHT_LIMIT_PER_MINUTE, SAPI_WEIGHT_LIMIT_PER_MINUTE / 60),
+        },
+        weights=request_weights,
+        default=("weight", 1),
+        headers_parser=parse_limit_headers,
+    )
+
+
+def is_retryable(exception: BaseException) -> bool:
+    """
+    :param exception: exception raised by python-binance client
+    :return: True if request can be repeated
+    """
+    if isinstance(exception, BinanceAPIException):
+        method = exception.request.method if exception.request is not None else "GET"
+        return is_retryable_status(exception.status_code, method)
+    return is_transient(exception)
+
+
+def create_retry_policy() -> RetryPolicy:
+    """
+    :return: retry policy repeating rate limited, failed and timed out requests
+    """
+    return RetryPolicy(is_retryable=is_retryable)
+
+
+def account_balances(account: dict) -> Balances:
+    """
+    :param account: account information returned by API
+    :return: Balances of spot account
+    """
+    return Balances(
+        ("spot", asset["asset"], float(asset["free"]) + float(asset["locked"]))
+        for asset in account["balances"]
+    )
+
+
+def order_params(order: OrderRequest) -> dict:
+    """
+    :param order: validated order
+    :return: keyword arguments of python-binance create_order
+    """
+    params = {
+        "symbol": order.pair.binance,
+        "side": order.side.upper(),
+        "type": order.order_type.upper(),
+    }
+    if order.price is not None:
+        params["timeInForce"] = "GTC"
+        params["price"] = order.price
+    if order.size is not None:
+        params["quantity"] = order.size
+    if order.amount is not None:
+        params["quoteOrderQty"] = order.amount
+    if order.client_oid is not None:
+        params["newClientOrderId"] = order.client_oid
+    return params
+
+
+def index_tickers(tickers: list) -> Dict[str, dict]:
+    """
+    :param tickers: tickers returned by API
+    :return: dictionary with symbol - ticker pair
+    """
+    return {ticker["symbol"]: ticker for ticker in tickers}
+
+
+def parse_ticker_price(
+    tickers: Dict[str, dict], pair: str, price_type: MarketSide
+) -> Optional[str]:
+    """
+    Picks price of given pair from order book tickers.
+
+    :param tickers: order book tickers indexed by symbol
+    :param pair: market symbol i.e. ADABTC
+    :param price_type: type of price to return
+    :return: price as a string
+    """
+    ticker = tickers.get(pair)
+    if ticker is not None:
+        if price_type == MarketSide.ASK:
+            return ticker["askPrice"]
+        if price_type == MarketSide.BID:
+            return ticker["bidPrice"]
+
+    print(
+        f"ERROR: Pair: {pair} not found in available tickers. Use get_available_markets"
+        f" to check if pair is available"
+    )
+    return None
+
+
+def find_markets(
+    index: SymbolIndex, coins: Iterable[str], quotes: Iterable[str]
+) -> Tuple[SymbolInfo, ...]:
+    """
+    Resolves requested coins and quotes into listed markets.
+
+    :param index: index of listed markets
+    :param coins: base currencies
+    :param quotes: quote currencies
+    :return: listed markets, pairs not listed on exchange are skipped
+    """
+    quotes = tuple(quotes)
+    markets = (index.find(coin, quote) for coin in coins for quote in quotes)
+    return tuple(market for market in markets if market is not None)
+
+
+def parse_coins_prices(
+    tickers: Dict[str, dict], markets: Iterable[SymbolInfo], price_type: MarketSide
+) -> Dict[str, str]:
+    """
+    Picks prices of given markets from tickers indexed by symbol.
+
+    :param tickers: order book tickers, or price tickers for MarketSide.LATEST
+    :param markets: markets to pick
+    :param price_type: type of price to return
+    :return: dictionary with Pair - price pair
+    """
+    key = {MarketSide.ASK: "askPrice", MarketSide.BID: "bidPrice"}.get(price_type, "price")
+    prices: Dict[Pair, str] = {}
+    for market in markets:
+        item = tickers.get(market.symbol)
+        if item is not None:
+            prices[market.pair] = item[key]
+    return prices
+
+
+def parse_order_book(order_book: dict) -> dict:
+    """
+    Converts order book returned by API into MarketSide keyed dictionary.
+
+    :param order_book: order book returned by API
+    :return: dictionary with asks and bids lists
+    """
+    return {
+        MarketSide.ASK: order_book[MarketSide.ASK.value],
+        MarketSide.BID: order_book[MarketSide.BID.value],
+    }
+
+
+def parse_klines(klines: list, as_series: bool = False) -> Union[tuple, CandleSeries]:
+    """
+    Converts klines returned by API into candle dictionaries.
+    Millisecond open time of kline is converted into seconds.
+
+    :param klines: klines returned by API
+    :param as_series: return CandleSeries instead of tuple of dictionaries
+    :return: tuple of kline dictionaries
+    """
+    if as_series:
+        return CandleSeries.from_klines(klines, ts_divisor=1000)
+    return tuple(
+        {
+            "ts": int(candle[0] / 1000),
+            "open": float(candle[1]),
+            "high": float(candle[2]),
+            "low": float(candle[3]),
+            "close": float(candle[4]),
+        }
+        for candle in klines
+    )
+
+
+def klines_params(  # pylint: disable=too-many-arguments
+    coin: str,
+    quote: str,
+    interval: str,
+    start: Optional[Union[str, int]] = None,
+    end: Optional[Union[str, int]] = None,
+) -> Optional[Tuple[dict, ...]]:
+    """
+    Validates arguments and builds query params for api/v3/klines endpoint.
+    Range with start is split into windows which fit into single response page.
+
+    :return: tuple of query params, one per page, or None if interval is invalid
+    """
+    candle_interval = exchange_interval(interval, "binance")
+    if candle_interval is None:
+        return None
+
+    params = {
+        "symbol": as_pair(coin, quote).binance,
+        "interval": candle_interval.binance,
+        "limit": KLINES_LIMIT,
+    }
+
+    if start is None:
+        if end is not None:
+            params["endTime"] = to_timestamp(end) * 1000
+        return (params,)
+
+    return tuple(
+        {**params, "startTime": window_start * 1000, "endTime": window_end * 1000}
+        for window_start, window_end in candle_interval.windows(start, end, KLINES_LIMIT)
+    )
 
 
 class Binance(exchange_template.ExchangeAPI):
@@ -19,9 +303,64 @@ class Binance(exchange_template.ExchangeAPI):
     Class handles connection ot the Binance crypto exchange API.
     """
 
-    def __init__(self, access_key: str, secret_key: str):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        access_key: str,
+        secret_key: str,
+        ticker_ttl: float = DEFAULT_TICKER_TTL,
+        scheduler: Optional[WeightScheduler] = None,
+        retry: Optional[RetryPolicy] = None,
+        balance_ttl: float = exchange_template.DEFAULT_BALANCE_TTL,
+    ):
+        """
+        :param ticker_ttl: time in seconds for which downloaded tickers are reused
+        :param scheduler: rate limiter, pass the same instance to clients sharing IP or account
+        :param retry: policy repeating failed requests
+        :param balance_ttl: time in seconds for which downloaded balances are reused
+        """
         super().__init__("binance", access_key, secret_key)
+        self.balances.ttl = balance_ttl
+        self.scheduler = scheduler if scheduler is not None else create_scheduler()
+        self.retry = retry if retry is not None else create_retry_policy()
         self.client = Client(self.access_key, self.secret_key)
+        self.client.session.hooks["response"].append(self._on_response)
+        self.book_tickers = Snapshot(
+            lambda: index_tickers(
+                self._call("api/v3/ticker/bookTicker", self.client.get_orderbook_tickers)
+            ),
+            ticker_ttl,
+        )
+        self.price_tickers = Snapshot(
+            lambda: index_tickers(
+                self._call("api/v3/ticker/price", self.client.get_symbol_ticker)
+            ),
+            ticker_ttl,
+        )
+
+    def _call(self, path: str, method: Callable, **params):
+        """
+        Calls python-binance client method within rate limits of the exchange,
+        repeating it according to retry policy.
+
+        :param path: endpoint path used to find request weight, i.e. api/v3/depth
+        :param method: client method sending the request
+        :param params: keyword arguments of the method
+        :return: result of the method
+        """
+        return self.retry.call(path, self._send, path, method, params)
+
+    def _send(self, path: str, method: Callable, params: dict):
+        self.scheduler.acquire(path, params)
+        return method(**params)
+
+    def _on_response(self, response: Response, *args, **kwargs):  # pylint: disable=unused-argument
+        """
+        Response hook of the client session. It runs in the thread which sent the request
+        and receives its own response, unlike shared client.response attribute which
+        can belong to request of other thread.
+        """
+        path = urlparse(response.url).path.lstrip("/")
+        self.scheduler.update_from_headers(path, response.headers)
 
     def get_balance(self, coin: str) -> Optional[str]:
         """
@@ -30,167 +369,185 @@ class Binance(exchange_template.ExchangeAPI):
         :return: String representing float value of balance on account
         :rtype: str if there is such currency listed, otherwise None
         """
-        info = self.client.get_account()
-        for asset in info["balances"]:
-            if asset["asset"] == coin.upper():
-                total = float(asset["free"]) + float(asset["locked"])
-                return f"{total:.10f}"
-        return None
+        balances = self.balances.get()
+        return balances.get(coin) if balances is not None else None
 
     def get_all_balances(self) -> Optional[Dict[str, str]]:
-        info = self.client.get_account()
-        result = {}
-        for asset in info["balances"]:
-            total = float(asset["free"]) + float(asset["locked"])
-            if total != 0:
-                result[asset["asset"]] = f"{total:.10f}"
-        return result
+        balances = self.balances.get()
+        return balances.to_dict(non_zero=True) if balances is not None else None
+
+    def _load_balances(self) -> Optional[Balances]:
+        return account_balances(self._call("api/v3/account", self.client.get_account))
 
     def withdraw_asset(self, asset, target_addr, amount):
-        result = self.client.withdraw(asset=asset, address=target_addr, amount=amount)
+        try:
+            result = self._call(
+                "sapi/v1/capital/withdraw/apply",
+                self.client.withdraw,
+                asset=asset,
+                address=target_addr,
+                amount=amount,
+            )
+        finally:
+            self.balances.invalidate()
         return result
 
-    def get_available_markets(self) -> Tuple[str, ...]:
-        markets = [item["symbol"] for item in self.client.get_symbol_ticker()]
-        return tuple(markets)
-
-    def get_listed_coins(self):
-        """
-        :return: list of all coins available on exchange
-        """
-        listed_coins = []
-        ticker = self.client.get_symbol_ticker()
+    def _load_symbols(self) -> Optional[SymbolIndex]:
+        try:
+            exchange_info = self._call("api/v3/exchangeInfo", self.client.get_exchange_info)
+        except (BinanceAPIException, BinanceRequestException, RequestException,
+                CircuitOpenError) as exception:
+            print(f"ERROR: Could not get exchange info: {exception}")
+            return None
+        return binance_symbol_index(exchange_info)
 
-        for item in ticker:
-            index = item["symbol"].find("BTC")
-            if index != -1:
-                if item["symbol"][:index] != "":
-                    listed_coins.append(item["symbol"][:index])
-        return listed_coins
+    def get_available_markets(self) -> Optional[Tuple[Pair, ...]]:
+        index = self.get_symbol_index()
+        if index is None:
+            return None
+        return index.pairs()
 
-    def get_symbol_info(self, symbol: str) -> Optional[dict]:
+    def get_listed_coins(self) -> Optional[List[str]]:
         """
-        Gets symbol info from API
-        :param symbol: cryptocurrency symbol as a string
-        :return:
+        :return: list of all coins available on exchange, None in case of error
         """
-        return self.get_symbol_info(symbol)
+        index = self.get_symbol_index()
+        if index is None:
+            return None
+        return [market.base for market in index.with_quote("BTC")]
 
     def get_symbol_ticker(self) -> dict:
         """
         Gets actual ticker from API.
         :return: dict
         """
-        return {symbol["symbol"]: symbol["price"] for symbol in self.client.get_symbol_ticker()}
+        return {symbol: item["price"] for symbol, item in self.price_tickers.get().items()}
 
+    @coalesce
     def get_coins_prices(
-        self, coins: Tuple, quote: str = "BTC", price_type: MarketSide = MarketSide.ASK
+        self,
+        coins: Iterable[str],
+        quote: Union[str, Iterable[str]] = "BTC",
+        price_type: MarketSide = MarketSide.ASK,
     ) -> Optional[dict]:
-        ticker = None
-        for i in range(4):
-            ticker = self.client.get_orderbook_tickers()
-            if ticker is None:
-                time.sleep(1)
-                print("Try again: " + str(i) + "/4")
-            else:
-                break
-
-        if ticker is None:
+        tickers = self.price_tickers if price_type == MarketSide.LATEST else self.book_tickers
+        index = self.get_symbol_index()
+        if index is None:
             return None
+        try:
+            ticker = tickers.get()
+        except (BinanceAPIException, BinanceRequestException, RequestException,
+                CircuitOpenError) as exception:
+            print(f"ERROR: Could not get tickers: {exception}")
+            return None
+        markets = find_markets(index, coins, to_quotes(quote))
+        return parse_coins_prices(ticker, markets, price_type)
 
-        coins = {}
-        for item in ticker:
-            index = item["symbol"].find("BTC")
-            if index != -1:
-                if item["symbol"][:index] != "":
-                    if price_type == MarketSide.ASK:
-                        coins[item["symbol"][:index]] = item["askPrice"]
-                    elif price_type == MarketSide.BID:
-                        coins[item["symbol"][:index]] = item["bidPrice"]
-        return coins
-
+    @coalesce
     def get_coin_price(
         self, coin: str, quote: str = "BTC", price_type: MarketSide = MarketSide.ASK
     ) -> Optional[str]:
+        index = self.get_symbol_index()
+        if index is None:
+            return None
         try:
-            tickers = self.client.get_orderbook_tickers()
-            print(tickers)
-        except BinanceRequestException:
-            print("ERROR: Could not get ticker")
+            tickers = self.book_tickers.get()
+        except (BinanceAPIException, BinanceRequestException, RequestException,
+                CircuitOpenError) as exception:
+            print(f"ERROR: Could not get ticker: {exception}")
             return None
-        pair = coin.upper() + quote.upper()
-        for ticker in tickers:
-            if ticker["symbol"] == pair:
-                if price_type == MarketSide.ASK:
-                    return ticker["askPrice"]
-                if price_type == MarketSide.BID:
-                    return ticker["bidPrice"]
-
-        print(
-            f"ERROR: Pair: {pair} not found in available tickers. Use get_available_markets"
-            f" to check if pair is available"
-        )
-        return None
+        market = index.find(coin, quote)
+        pair = market.symbol if market is not None else as_pair(coin, quote).binance
+        return parse_ticker_price(tickers, pair, price_type)
 
-    def get_order_book(self, coin: str, quote: str) -> Optional[dict]:
+    @coalesce
+    def get_order_book(
+        self, coin: str, quote: str, numeric: bool = False
+    ) -> Optional[Union[dict, NumericOrderBook]]:
         try:
-            order_book = self.client.get_order_book(symbol=f"{coin.upper()}{quote.upper()}")
+            order_book = self._call(
+                "api/v3/depth", self.client.get_order_book, symbol=as_pair(coin, quote).binance
+            )
+        except (BinanceAPIException, BinanceRequestException, RequestException,
+                CircuitOpenError) as exception:
+            print(f"ERROR: {exception}")
+            return None
+        if numeric:
+            return NumericOrderBook.from_dict(parse_order_book(order_book))
+        return parse_order_book(order_book)
 
-            return {
-                MarketSide.ASK: order_book[MarketSide.ASK.value],
-                MarketSide.BID: order_book[MarketSide.BID.value],
-            }
-        except BinanceAPIException as exception:
+    @coalesce
+    def get_order_book_snapshot(self, coin: str, quote: str) -> Optional[dict]:
+        try:
+            order_book = self._call(
+                "api/v3/depth",
+                self.client.get_order_book,
+                symbol=as_pair(coin, quote).binance,
+                limit=ORDER_BOOK_SNAPSHOT_LIMIT,
+            )
+        except (BinanceAPIException, BinanceRequestException, RequestException,
+                CircuitOpenError) as exception:
             print(f"ERROR: {exception}")
             return None
+        return dict(parse_order_book(order_book), sequence=order_book["lastUpdateId"])
 
     def get_candles(  # pylint: disable=too-many-arguments
         self,
         coin: str,
         quote: str,
         interval: str,
-        start: Optional[str] = None,
-        end: Optional[str] = None,
-    ) -> Optional[tuple]:
-        klines = self.client.get_historical_klines(
-            symbol=f"{coin.upper()}{quote.upper()}",
-            interval=interval,
-            start_str=start,
-            end_str=end,
-        )
-        candles = [
-            {
-                "ts": int(candle[0] / 1000),
-                "open": float(candle[1]),
-                "high": float(candle[2]),
-                "low": float(candle[3]),
-                "close": float(candle[4]),
-            }
-            for candle in klines
-        ]
-
-        return tuple(candles)
-
-    def get_last_candles(
-        self, coin: str, quote: str, interval: str, amount: int
-    ) -> Optional[tuple]:
-        klines = self.client.get_klines(
-            symbol=f"{coin.upper()}{quote.upper()}",
-            interval=interval,
+        start: Optional[Union[str, int]] = None,
+        end: Optional[Union[str, int]] = None,
+        as_series: bool = False,
+    ) -> Optional[Union[tuple, CandleSeries]]:
+        """
+        Ranges longer than single response page (1000 candles) are split into pages
+        fetched concurrently and merged from the oldest candle.
+        """
+        pages_params = klines_params(coin, quote, interval, start, end)
+        if pages_params is None:
+            return None
+
+        if len(pages_params) == 1:
+            klines = self._get_klines(pages_params[0])
+        else:
+            with ThreadPoolExecutor(max_workers=CANDLES_WORKERS) as executor:
+                pages = executor.map(self._get_klines, pages_params)
+                klines = [kline for page in pages for kline in page]
+        return parse_klines(klines, as_series=as_series)
+
+    def _get_klines(self, params: dict) -> list:
+        return self._call("api/v3/klines", self.client.get_klines, **params)
+
+    @coalesce
+    def get_last_candles(  # pylint: disable=too-many-arguments
+        self, coin: str, quote: str, interval: str, amount: int, as_series: bool = False
+    ) -> Optional[Union[tuple, CandleSeries]]:
+        candle_interval = exchange_interval(interval, "binance")
+        if candle_interval is None:
+            return None
+        klines = self._call(
+            "api/v3/klines",
+            self.client.get_klines,
+            symbol=as_pair(coin, quote).binance,
+            interval=candle_interval.binance,
             limit=amount,
         )
-        candles = [
-            {
-                "ts": int(candle[0]),
-                "open": float(candle[1]),
-                "high": float(candle[2]),
-                "low": float(candle[3]),
-                "close": float(candle[4]),
-            }
-            for candle in klines
-        ]
-
-        return tuple(candles)
-
-    def create_order(self, market, side, price, amount):
-        print(f"ERROR: {self.name} client - Not implemented")
+        return parse_klines(klines, as_series=as_series)
+
+    def _send_orders(self, batch: Tuple[OrderRequest, ...]) -> List[OrderResult]:
+        """
+        Binance spot API has no batch order endpoint, every order is sent separately.
+        """
+        results = []
+        for order in batch:
+            try:
+                response = self._call(
+                    "api/v3/order", self.client.create_order, **order_params(order)
+                )
+            except (BinanceAPIException, BinanceRequestException,
+                    RequestException, CircuitOpenError) as error:
+                results.append(OrderResult(order, error=str(error)))
+                continue
+            results.append(OrderResult(order, order_id=str(response["orderId"])))
+        return results
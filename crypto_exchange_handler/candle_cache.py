@@ -0,0 +1,165 @@
+"""
+Module contains persistent SQLite cache placed in front of ExchangeAPI.get_candles.
+Cache remembers which time ranges have already been downloaded for given
+exchange, pair and interval, and requests only missing gaps from the exchange.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple, Union
+
+from .candles import CandleSeries, FIELDS
+from .exchange_template import ExchangeAPI
+from .intervals import Interval, parse_interval, to_timestamp
+from .pair import as_pair
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS candles (
+        exchange TEXT, pair TEXT, interval TEXT, ts INTEGER,
+        open REAL, high REAL, low REAL, close REAL,
+        PRIMARY KEY (exchange, pair, interval, ts)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS coverage (
+        exchange TEXT, pair TEXT, interval TEXT, start INTEGER, end INTEGER
+    )""",
+    """CREATE INDEX IF NOT EXISTS coverage_key ON coverage (exchange, pair, interval, start)""",
+)
+
+
+class CandleCache:
+    """
+    Transparent cache of exchange candles stored in SQLite database.
+    Every attribute not defined by cache is taken from wrapped exchange,
+    so the cache can be used in place of exchange instance.
+
+    Attributes
+    ----------
+    exchange : ExchangeAPI
+        exchange used to download missing candles
+    hits : int
+        number of get_candles calls served only from the cache
+    misses : int
+        number of gaps downloaded from the exchange
+    """
+
+    def __init__(self, exchange: ExchangeAPI, path: str = "candles.sqlite"):
+        """
+        :param exchange: exchange used to download missing candles
+        :param path: path of SQLite database file
+        """
+        self.exchange = exchange
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+
+    def __getattr__(self, name):
+        return getattr(self.exchange, name)
+
+    def close(self):
+        """
+        Closes database connection.
+        """
+        self._db.close()
+
+    def missing_ranges(
+        self, pair: str, interval: Union[str, Interval], start: int, end: int
+    ) -> List[Tuple[int, int]]:
+        """
+        :param interval: candle interval in any format accepted by parse_interval
+        :return: list of (start, end) time ranges not covered by the cache
+        """
+        rows = self._db.execute(
+            "SELECT start, end FROM coverage WHERE exchange = ? AND pair = ? AND interval = ?"
+            " AND end >= ? AND start <= ? ORDER BY start",
+            (self.exchange.name, pair, parse_interval(interval).name, start, end),
+        ).fetchall()
+
+        gaps = []
+        position = start
+        for covered_start, covered_end in rows:
+            if covered_start > position:
+                gaps.append((position, covered_start - 1))
+            position = max(position, covered_end + 1)
+        if position <= end:
+            gaps.append((position, end))
+        return gaps
+
+    def _store(self, pair: str, interval: Interval, candles, covered: Tuple[int, int]):
+        key = (self.exchange.name, pair, interval.name)
+        start, end = covered
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key + tuple(candle[field] for field in FIELDS) for candle in candles),
+            )
+            if start > end:
+                return
+            overlapping = self._db.execute(
+                "SELECT start, end FROM coverage WHERE exchange = ? AND pair = ? AND interval = ?"
+                " AND end >= ? AND start <= ?",
+                key + (start - 1, end + 1),
+            ).fetchall()
+            for covered_start, covered_end in overlapping:
+                start, end = min(start, covered_start), max(end, covered_end)
+            self._db.execute(
+                "DELETE FROM coverage WHERE exchange = ? AND pair = ? AND interval = ?"
+                " AND end >= ? AND start <= ?",
+                key + (start - 1, end + 1),
+            )
+            self._db.execute("INSERT INTO coverage VALUES (?, ?, ?, ?, ?)", key + (start, end))
+
+    def get_candles(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        coin: str,
+        quote: str,
+        interval: str,
+        start: Optional[Union[str, int]] = None,
+        end: Optional[Union[str, int]] = None,
+        as_series: bool = False,
+    ) -> Optional[Union[tuple, CandleSeries]]:
+        """
+        Same as ExchangeAPI.get_candles, but downloads only ranges missing in the cache.
+        Candles are returned from the oldest one. Only closed candles are marked as
+        covered, so still open candle is downloaded again on the next call. Rows are
+        keyed by interval name, so spellings of both exchanges share the cache.
+
+        :param start: start time for data in format %Y-%m-%d or epoch timestamp in seconds
+        :param end: end time for data in format %Y-%m-%d or epoch timestamp in seconds
+        """
+        if start is None:
+            print("ERROR: Cached candles require start")
+            return None
+
+        pair = as_pair(coin, quote)
+        start_ts = to_timestamp(start)
+        end_ts = to_timestamp(end) if end is not None else int(time.time())
+        candle_interval = parse_interval(interval)
+        closed_until = int(time.time()) - candle_interval.seconds
+
+        with self._lock:
+            gaps = self.missing_ranges(pair, candle_interval, start_ts, end_ts)
+            if not gaps:
+                self.hits += 1
+            for gap_start, gap_end in gaps:
+                self.misses += 1
+                candles = self.exchange.get_candles(coin, quote, interval, gap_start, gap_end)
+                if candles is None:
+                    return None
+                self._store(
+                    pair, candle_interval, candles, (gap_start, min(gap_end, closed_until))
+                )
+
+            rows = self._db.execute(
+                "SELECT ts, open, high, low, close FROM candles WHERE exchange = ? AND pair = ?"
+                " AND interval = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+                (self.exchange.name, pair, candle_interval.name, start_ts, end_ts),
+            ).fetchall()
+
+        if as_series:
+            return CandleSeries.from_klines(rows)
+        return tuple(dict(zip(FIELDS, row)) for row in rows)
@@ -0,0 +1,416 @@
+"""
+Module contains fixed-width binary candle file format.
+
+File starts with 64 bytes header (magic, version, exchange, pair, interval, count)
+followed by records of five little-endian float64 values: ts, open, high, low, close.
+Records are sorted by ts, so file opened through mmap can be searched by timestamp
+without reading it whole.
+"""
+
+import csv
+import io
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from .candles import CandleSeries, FIELDS
+from .intervals import parse_interval
+
+CANDLE_FILE_EXTENSION = ".candles"
+MAGIC = b"CEHCANDL"
+VERSION = 1
+
+# magic, version, exchange, pair, interval, count
+HEADER = struct.Struct("<8sH6x16s16s8sQ")
+COUNT_OFFSET = HEADER.size - 8
+RECORD = struct.Struct("<5d")
+
+
+def _text(value: bytes) -> str:
+    return value.rstrip(b"\0").decode("ascii")
+
+
+def is_candle_file(file: str) -> bool:
+    """
+    :param file: path of the file
+    :return: True if file name has binary candle file extension
+    """
+    return file.endswith(CANDLE_FILE_EXTENSION)
+
+
+def _sorted_rows(candles: Union[Iterable[dict], CandleSeries]) -> list:
+    rows = [tuple(candle[field] for field in FIELDS) for candle in candles]
+    rows.sort(key=lambda row: row[0])
+    return rows
+
+
+def pack_records(candles: Union[Iterable[dict], CandleSeries]) -> bytes:
+    """
+    Serializes candles into records sorted by timestamp.
+
+    :param candles: candle dictionaries or CandleSeries
+    :return: bytes with packed records
+    """
+    return b"".join(RECORD.pack(*row) for row in _sorted_rows(candles))
+
+
+def write_candle_file(
+    file: str,
+    candles: Union[Iterable[dict], CandleSeries],
+    exchange: str,
+    pair: str,
+    interval: str,
+) -> int:
+    """
+    Creates binary candle file.
+
+    :param file: path of the file
+    :param candles: candle dictionaries or CandleSeries
+    :param exchange: name of exchange candles come from
+    :param pair: market symbol i.e. BTC-USDT
+    :param interval: candle interval
+    :return: number of written candles
+    """
+    records = pack_records(candles)
+    count = len(records) // RECORD.size
+    header = HEADER.pack(
+        MAGIC, VERSION, exchange.encode("ascii"), pair.encode("ascii"),
+        interval.encode("ascii"), count,
+    )
+    with open(file, "wb") as candle_file:
+        candle_file.write(header)
+        candle_file.write(records)
+    return count
+
+
+class CandleFile:
+    """
+    Read-only view of binary candle file mapped into memory.
+    Opening file reads only its header, candles are read on access.
+
+    Attributes
+    ----------
+    exchange : str
+        name of exchange candles come from
+    pair : str
+        market symbol
+    interval : str
+        candle interval
+    """
+
+    def __init__(self, file: str):
+        """
+        :param file: path of file created by write_candle_file
+        """
+        self.file = file
+        with open(file, "rb") as candle_file:
+            self._mmap = mmap.mmap(candle_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, exchange, pair, interval, count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{file} is not a candle file")
+        self.exchange = _text(exchange)
+        self.pair = _text(pair)
+        self.interval = _text(interval)
+        self._count = count
+
+    def close(self):
+        """
+        Unmaps the file.
+        """
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> dict:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("candle index out of range")
+        values = RECORD.unpack_from(self._mmap, HEADER.size + index * RECORD.size)
+        row = dict(zip(FIELDS, values))
+        row["ts"] = int(row["ts"])
+        return row
+
+    def __iter__(self) -> Iterator[dict]:
+        for index in range(self._count):
+            yield self[index]
+
+    def timestamp(self, index: int) -> float:
+        """
+        :param index: position of candle in file
+        :return: timestamp of candle, reads only 8 bytes
+        """
+        return struct.unpack_from("<d", self._mmap, HEADER.size + index * RECORD.size)[0]
+
+    def bisect(self, ts: float) -> int:
+        """
+        :param ts: timestamp to look for
+        :return: index of first candle with timestamp not lower than ts
+        """
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamp(middle) < ts:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def series(self, first: int = 0, last: Optional[int] = None) -> CandleSeries:
+        """
+        Loads range of candles into CandleSeries reading only requested records.
+
+        :param first: index of first candle
+        :param last: index after last candle, defaults to end of file
+        :return: CandleSeries
+        """
+        last = self._count if last is None else min(last, self._count)
+        raw = array("d")
+        offset = HEADER.size + first * RECORD.size
+        raw.frombytes(self._mmap[offset:offset + max(last - first, 0) * RECORD.size])
+        if sys.byteorder == "big":
+            raw.byteswap()
+
+        series = CandleSeries()
+        for position, field in enumerate(FIELDS):
+            setattr(series, field, raw[position::len(FIELDS)])
+        return series
+
+    def slice_by_time(self, start: Optional[float] = None, end: Optional[float] = None):
+        """
+        Loads candles with start <= ts < end.
+
+        :param start: lowest timestamp, defaults to first candle
+        :param end: timestamp after last returned candle, defaults to end of file
+        :return: CandleSeries
+        """
+        first = 0 if start is None else self.bisect(start)
+        last = self._count if end is None else self.bisect(end)
+        return self.series(first, last)
+
+
+def csv_to_candle_file(  # pylint: disable=too-many-arguments
+    csv_file: str, candle_file: str, exchange: str, pair: str, interval: str
+) -> int:
+    """
+    Converts .csv file created by dump_market_data_to_file into binary candle file.
+    Columns are matched by names from the header row.
+
+    :return: number of converted candles
+    """
+    with open(csv_file, encoding="utf-8") as source:
+        reader = csv.DictReader(source, delimiter=",")
+        candles = [{field: float(row[field]) for field in FIELDS} for row in reader]
+    return write_candle_file(candle_file, candles, exchange, pair, interval)
+
+
+def candle_file_to_csv(candle_file: str, csv_file: str) -> int:
+    """
+    Converts binary candle file into .csv file readable by load_market_data_file.
+
+    :return: number of converted candles
+    """
+    with CandleFile(candle_file) as source:
+        with open(csv_file, "w", newline="", encoding="utf-8") as target:
+            writer = csv.writer(target, delimiter=",", quotechar="|", quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(FIELDS)
+            for candle in source:
+                writer.writerow(candle.values())
+        return len(source)
+
+
+def _csv_tail(file: str) -> Tuple[List[str], Optional[dict], int, int, bool]:
+    """
+    Reads header, the last row and byte offset of the last row of .csv file
+    without reading the whole file. Row without line end, left by interrupted
+    append, is not counted as stored and is overwritten by the next append.
+
+    :return: header, last row as dictionary (None if there are no candles),
+             offsets of the last row and of its end,
+             True if rows are sorted from the oldest candle
+    """
+    with open(file, "rb") as csv_file:
+        header_line = csv_file.readline()
+        first_line = csv_file.readline()
+        size = os.fstat(csv_file.fileno()).st_size
+        chunk_start = max(len(header_line), size - 4096)
+        csv_file.seek(chunk_start)
+        lines = csv_file.read().splitlines(keepends=True)
+
+    header = next(csv.reader([header_line.decode("utf-8")]))
+    end = size
+    while lines and (not lines[-1].endswith(b"\n") or not lines[-1].strip()):
+        end -= len(lines.pop())
+    if not lines:
+        return header, None, end, end, True
+
+    last = dict(zip(header, next(csv.reader([lines[-1].decode("utf-8")]))))
+    first = dict(zip(header, next(csv.reader([first_line.decode("utf-8")]))))
+    ascending = float(first["ts"]) <= float(last["ts"])
+    return header, last, end - len(lines[-1]), end, ascending
+
+
+def last_timestamp(file: str) -> Optional[float]:
+    """
+    Gets timestamp of the newest candle stored in .csv or binary candle file.
+
+    :param file: path of the file
+    :return: timestamp or None if file has no candles
+    """
+    if is_candle_file(file):
+        with CandleFile(file) as candle_file:
+            return candle_file.timestamp(len(candle_file) - 1) if len(candle_file) else None
+
+    _, last, _, _, ascending = _csv_tail(file)
+    if last is None:
+        return None
+    if ascending:
+        return float(last["ts"])
+    with open(file, encoding="utf-8") as csv_file:
+        return max(float(row["ts"]) for row in csv.DictReader(csv_file))
+
+
+def _newer_rows(candles: Union[Iterable[dict], CandleSeries], since: Optional[float]) -> list:
+    rows = _sorted_rows(candles)
+    return [row for row in rows if since is None or row[0] >= since]
+
+
+def _append_candle_file(file: str, candles: Union[Iterable[dict], CandleSeries]) -> int:
+    with CandleFile(file) as candle_file:
+        count = len(candle_file)
+        last = candle_file.timestamp(count - 1) if count else None
+
+    rows = _newer_rows(candles, last)
+    if not rows:
+        return 0
+    replaced = rows[0][0] == last
+    added = rows[1:] if replaced else rows
+
+    with open(file, "r+b") as target:
+        # new records are written behind the count, readers do not see them yet
+        target.seek(HEADER.size + count * RECORD.size)
+        target.write(b"".join(RECORD.pack(*row) for row in added))
+        if replaced:
+            # rewrite keeps the timestamp, interrupted one is repeated by the next append
+            target.seek(HEADER.size + (count - 1) * RECORD.size)
+            target.write(RECORD.pack(*rows[0]))
+        target.flush()
+        os.fsync(target.fileno())
+        # candles are visible to readers only after the count is updated
+        target.seek(COUNT_OFFSET)
+        target.write(struct.pack("<Q", count + len(added)))
+        target.flush()
+        os.fsync(target.fileno())
+    return len(added)
+
+
+def _rewrite_csv_file(file: str, header: List[str], rows: list):
+    with open(file, encoding="utf-8") as csv_file:
+        stored = {float(row["ts"]): row for row in csv.DictReader(csv_file)}
+    for row in rows:
+        stored[row[0]] = dict(zip(FIELDS, row))
+
+    temp_file = f"{file}.tmp"
+    with open(temp_file, "w", newline="", encoding="utf-8") as target:
+        writer = csv.writer(target, delimiter=",", quotechar="|", quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(header)
+        for ts in sorted(stored):
+            writer.writerow([stored[ts][field] for field in header])
+    os.replace(temp_file, file)
+
+
+def _append_csv_file(file: str, candles: Union[Iterable[dict], CandleSeries]) -> int:
+    header, last, last_offset, end, ascending = _csv_tail(file)
+    last_ts = float(last["ts"]) if last is not None else None
+    rows = _newer_rows(candles, last_ts)
+    if not rows:
+        return 0
+    if not ascending:
+        _rewrite_csv_file(file, header, rows)
+        return len(rows) - (rows[0][0] == last_ts)
+
+    lines = io.StringIO()
+    writer = csv.writer(lines, delimiter=",", quotechar="|", quoting=csv.QUOTE_MINIMAL)
+    for row in rows:
+        candle = dict(zip(FIELDS, row))
+        writer.writerow([candle[field] for field in header])
+    data = lines.getvalue().encode("utf-8")
+
+    with open(file, "r+b") as target:
+        # the stored last row is replaced by new row with the same timestamp,
+        # if the append is interrupted it is downloaded again by the next sync
+        target.truncate(last_offset if rows[0][0] == last_ts else end)
+        target.seek(0, os.SEEK_END)
+        target.write(data)
+        target.flush()
+        os.fsync(target.fileno())
+    return len(rows) - (rows[0][0] == last_ts)
+
+
+def check_series(file: str, pair: str, interval: str, exchange: Optional[str] = None):
+    """
+    Verifies that candles of given series can be appended to the file.
+    Binary file has to store the same pair, interval and exchange in its header.
+    .csv file does not store the series, so its columns have to match candle fields
+    and the last candle has to start at interval boundary.
+
+    :param file: path of .csv or binary candle file
+    :param pair: market symbol i.e. BTC-USDT
+    :param interval: candle interval in any spelling accepted by parse_interval
+    :param exchange: name of exchange candles come from, not checked if None
+    :raises ValueError: if file holds candles of other series
+    """
+    expected = parse_interval(interval)
+    if is_candle_file(file):
+        with CandleFile(file) as candle_file:
+            stored = (candle_file.exchange, candle_file.pair, candle_file.interval)
+            last = candle_file.timestamp(len(candle_file) - 1) if len(candle_file) else None
+        matches = (
+            stored[1] == str(pair),
+            parse_interval(stored[2]).seconds == expected.seconds,
+            exchange is None or stored[0] == exchange,
+        )
+        if not all(matches):
+            raise ValueError(f"{file} holds {' '.join(stored)} candles")
+    else:
+        header, row, _, _, _ = _csv_tail(file)
+        if sorted(header) != sorted(FIELDS):
+            raise ValueError(f"{file} has columns {header} instead of {list(FIELDS)}")
+        last = float(row["ts"]) if row is not None else None
+
+    if last is not None and expected.floor(int(last)) != last:
+        raise ValueError(f"{file} holds candles of interval other than {interval}")
+
+
+def append_candles(file: str, candles: Union[Iterable[dict], CandleSeries]) -> int:
+    """
+    Appends candles newer than the last stored one to .csv or binary candle file.
+    Stored last candle, which could be still open when it was saved, is replaced by
+    the candle with the same timestamp. Only new rows are written, the rest of the
+    file is not copied. Use check_series to verify that candles belong to the file.
+
+    Interrupted append does not leave visible partial candles. Binary file count
+    in header is updated after records are written, incomplete .csv row is ignored.
+    Interrupted rewrite of the replaced last candle can leave it with mixed old and
+    new prices in binary file, or remove it from .csv file. In both cases the next
+    sync downloads it again and replaces it.
+
+    :param file: path of the file
+    :param candles: candle dictionaries or CandleSeries
+    :return: number of candles added to the file
+    """
+    if is_candle_file(file):
+        return _append_candle_file(file, candles)
+    return _append_csv_file(file, candles)
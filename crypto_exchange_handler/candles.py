@@ -0,0 +1,164 @@
+"""
+Module contains CandleSeries - compact columnar container for market candles.
+Every column is kept in array('d'), so million candles take 40MB instead of
+million dictionaries with boxed floats.
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+FIELDS = ("ts", "open", "high", "low", "close")
+
+
+class CandleSeries:
+    """
+    Columnar candle container. Rows are exposed as dictionaries with the same keys
+    as candles returned by ExchangeAPI.get_candles.
+
+    Attributes
+    ----------
+    ts : array
+        open time of candles
+    open : array
+        open prices
+    high : array
+        highest prices
+    low : array
+        lowest prices
+    close : array
+        close prices
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, columns: Optional[Dict[str, Iterable[float]]] = None):
+        """
+        :param columns: optional dictionary with values for every column from FIELDS
+        """
+        columns = columns or {}
+        self.ts = array("d", columns.get("ts", ()))
+        self.open = array("d", columns.get("open", ()))
+        self.high = array("d", columns.get("high", ()))
+        self.low = array("d", columns.get("low", ()))
+        self.close = array("d", columns.get("close", ()))
+        if len({len(self.column(field)) for field in FIELDS}) != 1:
+            raise ValueError("All candle columns must have the same length")
+
+    @classmethod
+    def from_dicts(cls, candles: Iterable[dict]) -> "CandleSeries":
+        """
+        Creates series from candle dictionaries.
+
+        :param candles: iterable of dictionaries with keys ts/open/high/low/close
+        :return: CandleSeries
+        """
+        series = cls()
+        for candle in candles:
+            series.append(
+                candle["ts"], candle["open"], candle["high"], candle["low"], candle["close"]
+            )
+        return series
+
+    @classmethod
+    def from_klines(
+        cls,
+        klines: Sequence[Sequence],
+        columns: Tuple[int, int, int, int, int] = (0, 1, 2, 3, 4),
+        ts_divisor: int = 1,
+    ) -> "CandleSeries":
+        """
+        Creates series directly from raw klines returned by exchange API,
+        without creating intermediate dictionaries.
+
+        :param klines: list of klines, every kline is a list of values
+        :param columns: index of ts, open, high, low and close value in kline
+        :param ts_divisor: divisor applied to timestamp i.e. 1000 for milliseconds
+        :return: CandleSeries
+        """
+        series = cls()
+        ts_index = columns[0]
+        series.ts = array("d", (int(float(kline[ts_index]) / ts_divisor) for kline in klines))
+        for field, index in zip(FIELDS[1:], columns[1:]):
+            setattr(series, field, array("d", (float(kline[index]) for kline in klines)))
+        return series
+
+    def append(  # pylint: disable=too-many-arguments
+        self, ts: float, open_: float, high: float, low: float, close: float
+    ):
+        """
+        Appends single candle at the end of series.
+        """
+        self.ts.append(ts)
+        self.open.append(open_)
+        self.high.append(high)
+        self.low.append(low)
+        self.close.append(close)
+
+    def extend(self, other: "CandleSeries"):
+        """
+        Appends all candles of other series at the end of series.
+        """
+        for field in FIELDS:
+            self.column(field).extend(other.column(field))
+
+    def column(self, field: str) -> array:
+        """
+        :param field: one of FIELDS
+        :return: array with values of given column
+        """
+        return getattr(self, field)
+
+    def row(self, index: int) -> dict:
+        """
+        :param index: position of candle in series
+        :return: candle dictionary in format returned by ExchangeAPI.get_candles
+        """
+        return {
+            "ts": int(self.ts[index]),
+            "open": self.open[index],
+            "high": self.high[index],
+            "low": self.low[index],
+            "close": self.close[index],
+        }
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            series = CandleSeries()
+            for field in FIELDS:
+                setattr(series, field, self.column(field)[key])
+            return series
+        return self.row(key)
+
+    def __iter__(self) -> Iterator[dict]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def __repr__(self) -> str:
+        return f"CandleSeries(len={len(self)})"
+
+    def to_dicts(self) -> tuple:
+        """
+        :return: tuple of candle dictionaries, same as ExchangeAPI.get_candles output
+        """
+        return tuple(self)
+
+    def to_numpy(self) -> dict:
+        """
+        Exposes columns as NumPy arrays sharing memory with the series (no copy).
+        Series cannot be extended while returned arrays are alive.
+
+        :return: dictionary with float64 ndarray per column
+        """
+        if np is None:
+            raise ImportError("NumPy is required for CandleSeries.to_numpy")
+        return {
+            field: np.frombuffer(self.column(field), dtype=np.float64) for field in FIELDS
+        }
@@ -4,8 +4,39 @@ exchange class should derive to keep common output of methods.
 """
 
 import csv
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from enum import Enum
-from typing import Optional, Tuple, Dict
+from typing import Iterable, Iterator, List, Optional, Tuple, Dict, Union
+
+from .balances import Balances
+from .candle_store import (
+    CandleFile,
+    append_candles,
+    check_series,
+    is_candle_file,
+    last_timestamp,
+    write_candle_file,
+)
+from .candles import CandleSeries, FIELDS
+from .order_id import ORDER_IDS
+from .orders import ORDER_WORKERS, OrderRequest, OrderResult, validate_order
+from .pair import Pair, as_pair
+from .singleflight import SingleFlight
+from .snapshot import Snapshot
+from .symbols import SymbolIndex, SymbolInfo
+
+DEFAULT_BALANCE_TTL = 5.0
+
+
+def to_quotes(quote: Union[str, Iterable[str]]) -> Tuple[str, ...]:
+    """
+    :param quote: single quote currency or iterable of quote currencies
+    :return: tuple of upper case quote currencies
+    """
+    if isinstance(quote, str):
+        return (quote.upper(),)
+    return tuple(item.upper() for item in quote)
 
 
 class MarketSide(Enum):
@@ -17,10 +48,13 @@ class MarketSide(Enum):
     LATEST = "latest"
 
 
-class ExchangeAPI:
+# attributes are the public, replaceable components of every client (see docstring),
+# grouping them would only add indirection to clients and tests swapping them
+class ExchangeAPI:  # pylint: disable=too-many-instance-attributes
     """
     A base class for every exchange specific class.
     Defines common methods and contains common parameters.
+    Methods taking coin and quote accept Pair in place of coin, quote is then ignored.
 
     Attributes
     ----------
@@ -32,6 +66,13 @@ class ExchangeAPI:
         private API key
     api_passphrase : str optional
         oassphrase required by some exchanges
+    flights : SingleFlight
+        coalescing of concurrent identical public data requests, freshness window
+        of every method can be set in its `windows` attribute
+    balances : Snapshot
+        balances of account reused for `ttl` seconds, invalidated after orders and withdrawals
+    order_ids : OrderIdGenerator
+        source of client order ids, shared by all clients of the process by default
 
     Methods
     -------
@@ -58,6 +99,66 @@ class ExchangeAPI:
         self.access_key = access_key
         self.secret_key = secret_key
         self.api_passphrase = api_passphrase
+        self.symbols = Snapshot(self._load_symbols, ttl=float("inf"))
+        self.flights = SingleFlight()
+        self.balances = Snapshot(self._load_balances, ttl=DEFAULT_BALANCE_TTL)
+        self.order_ids = ORDER_IDS
+
+    def _load_symbols(self) -> Optional[SymbolIndex]:
+        """
+        Downloads metadata of all markets listed on exchange.
+
+        :return: SymbolIndex or None in case of error
+        """
+        raise NotImplementedError
+
+    def get_symbol_index(self) -> Optional[SymbolIndex]:
+        """
+        Gets index of listed markets. Index is downloaded once and reused until refresh_symbols.
+
+        :return: SymbolIndex or None in case of error
+        """
+        return self.symbols.get()
+
+    def refresh_symbols(self) -> Optional[SymbolIndex]:
+        """
+        Downloads index of listed markets again, i.e. after new listing.
+
+        :return: SymbolIndex or None in case of error
+        """
+        self.symbols.invalidate()
+        return self.symbols.get()
+
+    def get_symbol_info(self, symbol: str) -> Optional[SymbolInfo]:
+        """
+        Gets metadata of market.
+
+        :param symbol: market symbol in exchange format
+        :return: SymbolInfo or None if market is not listed
+        """
+        index = self.get_symbol_index()
+        return index.get(symbol) if index is not None else None
+
+    def _load_balances(self) -> Optional[Balances]:
+        """
+        Downloads balances of all coins on account.
+
+        :return: Balances or None in case of error
+        """
+        raise NotImplementedError
+
+    def update_balance(
+        self, coin: str, total: Union[str, float], account: str = "spot"
+    ) -> bool:
+        """
+        Applies balance change pushed by exchange to cached balances.
+
+        :param coin: coin abbreviation
+        :param total: new total balance of the coin on the account
+        :param account: account id, exchanges like Kucoin keep balance per account
+        :return: False if balances have not been downloaded yet
+        """
+        return self.balances.update(lambda balances: balances.update(account, coin, total))
 
     def get_all_balances(self) -> Optional[Dict[str, str]]:
         """
@@ -76,10 +177,10 @@ class ExchangeAPI:
         """
         raise NotImplementedError
 
-    def get_available_markets(self) -> Optional[Tuple[str, ...]]:
+    def get_available_markets(self) -> Optional[Tuple[Pair, ...]]:
         """
         Gets tuple of markets available on target exchange.
-        :return: Tuple of available market.
+        :return: Tuple of available markets as normalized pairs, i.e. Pair("ADA", "BTC")
         """
         raise NotImplementedError
 
@@ -95,18 +196,37 @@ class ExchangeAPI:
         raise NotImplementedError
 
     def get_coins_prices(
-        self, coins: Tuple, quote: str = "BTC", price_type: MarketSide = MarketSide.ASK
+        self,
+        coins: Iterable[str],
+        quote: Union[str, Iterable[str]] = "BTC",
+        price_type: MarketSide = MarketSide.ASK,
     ) -> Optional[dict]:
         """
-        :return:
+        Gets prices of many markets with a single ticker request.
+
+        :param coins: currencies to get prices for
+        :param quote: quote currency or iterable of quote currencies
+        :param price_type: type of price to return
+        :return: dictionary with Pair - price pair, only listed pairs included
         """
         raise NotImplementedError
 
-    def get_order_book(self, coin: str, quote: str) -> Optional[dict]:
+    def get_order_book(self, coin: str, quote: str, numeric: bool = False):
         """
         :param coin: currency to trade
         :param quote: quote currency
-        :return:
+        :param numeric: return NumericOrderBook instead of lists of [price, size] strings
+        :return: dictionary with MarketSide keyed levels or NumericOrderBook
+        """
+        raise NotImplementedError
+
+    def get_order_book_snapshot(self, coin: str, quote: str) -> Optional[dict]:
+        """
+        Gets full order book with sequence number used to apply diff updates from stream.
+
+        :param coin: currency to trade
+        :param quote: quote currency
+        :return: dictionary with sequence and MarketSide keyed [price, size] levels
         """
         raise NotImplementedError
 
@@ -121,14 +241,92 @@ class ExchangeAPI:
         """
         raise NotImplementedError
 
-    def create_order(self, market, side, price, amount):
+    def create_order(
+        self, market: Union[str, Pair], side: str, price: str, amount: str
+    ) -> Optional[OrderResult]:
         """
-        Send request to create order on target exchange
-        :param market:
-        :param side:
-        :param price:
-        :param amount:
-        :return:
+        Send request to create limit order on target exchange
+        :param market: Pair or pair with separator, i.e. ADA-BTC
+        :param side: buy or sell
+        :param price: limit price in quote currency
+        :param amount: amount of base currency
+        :return: OrderResult or None if order has been rejected
+        """
+        order = OrderRequest(as_pair(market), side, size=amount, price=price)
+        result = next(self.create_orders((order,)))
+        if not result.ok:
+            print(f"ERROR: {self.name} client - {result.error}")
+            return None
+        return result
+
+    def create_orders(
+        self, orders: Iterable[OrderRequest], workers: int = ORDER_WORKERS
+    ) -> Iterator[OrderResult]:
+        """
+        Places many orders at once. Every order is validated against its market
+        before the first request is sent, rejected orders are reported without
+        being sent. Accepted orders are grouped into batches placed with single
+        request where exchange allows it, batches are sent concurrently within
+        rate limits of the client. Orders without client_oid get one before sending,
+        retries of the order reuse it, so exchange rejects duplicates.
+
+        :param orders: orders to place
+        :param workers: maximal number of requests in flight
+        :return: iterator of OrderResult in order of completion, rejected orders first
+        """
+        index = self.get_symbol_index()
+        rejected: List[OrderResult] = []
+        accepted: List[OrderRequest] = []
+        for order in orders:
+            if index is None:
+                error = "market metadata not available"
+            else:
+                error = validate_order(order, index.find(order.pair))
+            if error is None:
+                if order.client_oid is None:
+                    order = order._replace(client_oid=self.order_ids.next_id())
+                accepted.append(order)
+            else:
+                rejected.append(OrderResult(order, error=error))
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{self.name}-orders")
+        futures = [
+            executor.submit(self._place_orders, batch) for batch in self._order_batches(accepted)
+        ]
+        executor.shutdown(wait=False)
+        return self._order_results(rejected, futures)
+
+    @staticmethod
+    def _order_results(
+        rejected: List[OrderResult], futures: List[Future]
+    ) -> Iterator[OrderResult]:
+        yield from rejected
+        for future in as_completed(futures):
+            yield from future.result()
+
+    def _place_orders(self, batch: Tuple[OrderRequest, ...]) -> List[OrderResult]:
+        try:
+            return self._send_orders(batch)
+        finally:
+            self.balances.invalidate()
+
+    def _order_batches(
+        self, orders: List[OrderRequest]
+    ) -> Iterable[Tuple[OrderRequest, ...]]:
+        """
+        Splits validated orders into batches placed with single request.
+
+        :param orders: validated orders
+        :return: batches of orders, one order per batch by default
+        """
+        return ((order,) for order in orders)
+
+    def _send_orders(self, batch: Tuple[OrderRequest, ...]) -> List[OrderResult]:
+        """
+        Places batch of orders created by _order_batches.
+
+        :param batch: orders to place
+        :return: result of every order in the batch
         """
         raise NotImplementedError
 
@@ -155,16 +353,18 @@ class ExchangeAPI:
         coin: str,
         quote: str,
         interval: str,
-        start: Optional[str] = None,
-        end: Optional[str] = None,
-    ) -> Optional[tuple]:
+        start: Optional[Union[str, int]] = None,
+        end: Optional[Union[str, int]] = None,
+        as_series: bool = False,
+    ) -> Optional[Union[tuple, CandleSeries]]:
         """
         Gets market historical data in form of candles represented by dictionary
         :param coin:
         :param quote:
-        :param interval:
-        :param start: start time for data in format %Y-%m-%d
-        :param end: end time for data in format %Y-%m-%d
+        :param interval: interval in Binance (1m, 1h) or Kucoin (1min, 1hour) spelling
+        :param start: start time for data in format %Y-%m-%d (UTC) or epoch timestamp in seconds
+        :param end: end time for data in format %Y-%m-%d (UTC) or epoch timestamp in seconds
+        :param as_series: return candles as columnar CandleSeries
         :return: tuple of kline dictionaries in format:
                 {
                     "ts": int,
@@ -176,15 +376,16 @@ class ExchangeAPI:
         """
         raise NotImplementedError
 
-    def get_last_candles(
-        self, coin: str, quote: str, interval: str, amount: int
-    ) -> Optional[tuple]:
+    def get_last_candles(  # pylint: disable=too-many-arguments
+        self, coin: str, quote: str, interval: str, amount: int, as_series: bool = False
+    ) -> Optional[Union[tuple, CandleSeries]]:
         """
 
         :param coin:
         :param quote:
         :param interval:
         :param amount:
+        :param as_series: return candles as columnar CandleSeries
         :return:
         """
         raise NotImplementedError
@@ -201,6 +402,8 @@ class ExchangeAPI:
     ):
         """
         Creates .csv file with market data gathered from exchange API.
+        If file name ends with .candles, binary candle file is created instead.
+        Candles are stored from the oldest one.
 
         :param coin:
         :param quote:
@@ -221,41 +424,85 @@ class ExchangeAPI:
                 print("ERROR: Wrong paramaters. Provide amount or start")
                 return
 
+        if is_candle_file(file):
+            write_candle_file(file, candles, self.name, as_pair(coin, quote), interval)
+            return
+
         with open(file, "w", newline="", encoding="utf-8") as csvfile:
             writer = csv.writer(csvfile, delimiter=",", quotechar="|", quoting=csv.QUOTE_MINIMAL)
             writer.writerow(list(candles[0].keys()))
-            for line in candles:
+            for line in sorted(candles, key=lambda candle: candle["ts"]):
                 writer.writerow(list(line.values()))
 
+    def sync_market_data_file(  # pylint: disable=too-many-arguments
+        self,
+        coin: str,
+        quote: str,
+        interval: str = "30m",
+        file: str = "data.csv",
+        start: str = None,
+    ) -> Optional[int]:
+        """
+        Incrementally updates file created by dump_market_data_to_file.
+        Only candles newer than the last stored one are downloaded and appended.
+        The last stored candle, which could be still open during previous run,
+        is replaced. File holding other pair or interval is rejected.
+        If file does not exist it is created with candles since start.
+
+        :param coin:
+        :param quote:
+        :param interval:
+        :param file: .csv or .candles file
+        :param start: start time used when file does not exist yet
+        :return: number of candles added to the file
+        """
+        since = last_timestamp(file) if os.path.exists(file) else None
+        if since is None:
+            if start is None:
+                print("ERROR: File has no candles. Provide start")
+                return None
+            self.dump_market_data_to_file(coin, quote, interval, file, start=start)
+            return len(self.load_market_data_file(file, as_series=True))
+
+        try:
+            check_series(file, as_pair(coin, quote), interval, self.name)
+        except ValueError as exception:
+            print(f"ERROR: {exception}")
+            return None
+        candles = self.get_candles(coin, quote, interval, int(since))
+        if candles is None:
+            return None
+        return append_candles(file, candles)
+
     @staticmethod
-    def load_market_data_file(file) -> Optional[tuple]:
+    def load_market_data_file(
+        file, as_series: bool = False
+    ) -> Optional[Union[tuple, CandleSeries]]:
         """
         Parse and load existing file created using dump_market_data_to_file method.
 
         :param file: path to file to be parsed
+        :param as_series: return candles as columnar CandleSeries
         :return: tuple with candles data loaded from file
         """
+        if is_candle_file(file):
+            with CandleFile(file) as candle_file:
+                series = candle_file.series()
+            return series if as_series else series.to_dicts()
+
         if file.find(".csv") == -1:
-            print("ERROR: Please provide .csv file")
+            print("ERROR: Please provide .csv or .candles file")
             return None
 
-        candles = []
-
         with open(file, encoding="utf-8") as csv_file:
             csv_reader = csv.reader(csv_file, delimiter=",")
-            line_count = 0
-
-            for row in csv_reader:
-                if line_count != 0:
-                    temp = {
-                        "ts": float(row[0]),
-                        "open": float(row[1]),
-                        "high": float(row[2]),
-                        "low": float(row[3]),
-                        "close": float(row[4]),
-                    }
-                    candles.append(temp)
-                    line_count += 1
-                else:
-                    line_count += 1
+            header = next(csv_reader, FIELDS)
+            columns = tuple(header.index(field) for field in FIELDS)
+            if as_series:
+                return CandleSeries.from_klines(list(csv_reader), columns=columns)
+
+            candles = [
+                {field: float(row[column]) for field, column in zip(FIELDS, columns)}
+                for row in csv_reader
+            ]
         return tuple(candles)
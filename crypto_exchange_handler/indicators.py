@@ -0,0 +1,358 @@
+"""
+Module contains technical indicators computed on columns of candles.
+Vectorized functions process whole history at once with NumPy, rolling
+indicators are updated in constant time with every new candle, i.e. from
+ExchangeAPI.get_last_candles, and give the same values as vectorized ones.
+Values are ordered from the oldest candle, first period - 1 values are NaN.
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .candles import FIELDS, CandleSeries
+
+# recursive smoothing is vectorized in blocks, decay ** -block has to fit in float64
+MAX_BLOCK = 1024
+MAX_BLOCK_SCALE = 1e300
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is required for vectorized indicators")
+
+
+def candle_columns(candles: Union[CandleSeries, Iterable[dict]]) -> Dict[str, "np.ndarray"]:
+    """
+    Creates columnar view of candles ordered from the oldest one. Candles returned
+    by get_candles start from the newest one, file candles from the oldest one.
+
+    :param candles: CandleSeries or candle dictionaries
+    :return: dictionary with float64 ndarray per column of FIELDS
+    """
+    _require_numpy()
+    if isinstance(candles, CandleSeries):
+        columns = candles.to_numpy()
+    else:
+        candles = tuple(candles)
+        columns = {
+            field: np.fromiter((candle[field] for candle in candles), np.float64, len(candles))
+            for field in FIELDS
+        }
+    if len(columns["ts"]) > 1 and columns["ts"][0] > columns["ts"][-1]:
+        columns = {field: values[::-1] for field, values in columns.items()}
+    return columns
+
+
+def sma(values: "np.ndarray", period: int) -> "np.ndarray":
+    """
+    :param values: series ordered from the oldest value
+    :param period: number of averaged values
+    :return: simple moving average
+    """
+    _require_numpy()
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(len(values), np.nan)
+    if len(values) < period:
+        return result
+    sums = np.cumsum(values)
+    result[period - 1] = sums[period - 1]
+    result[period:] = sums[period:] - sums[:-period]
+    result[period - 1:] /= period
+    return result
+
+
+def smooth(values: "np.ndarray", alpha: float, period: int) -> "np.ndarray":
+    """
+    Exponential smoothing y = alpha * x + (1 - alpha) * y_prev seeded with simple
+    average of the first period values. The recursion is solved in blocks of
+    values with cumulative sums, so there is no Python loop per value.
+
+    :param values: series ordered from the oldest value
+    :param alpha: weight of the newest value
+    :param period: number of values averaged into the first result
+    :return: smoothed series
+    """
+    _require_numpy()
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(len(values), np.nan)
+    if len(values) < period:
+        return result
+    previous = values[:period].mean()
+    result[period - 1] = previous
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        result[period:] = values[period:]
+        return result
+
+    block = MAX_BLOCK if decay == 1.0 else min(
+        MAX_BLOCK, max(1, int(math.log(MAX_BLOCK_SCALE) / -math.log(decay)))
+    )
+    powers = decay ** np.arange(1, block + 1)
+    for start in range(period, len(values), block):
+        chunk = values[start:start + block]
+        scale = powers[:len(chunk)]
+        smoothed = scale * (previous + alpha * np.cumsum(chunk / scale))
+        result[start:start + len(chunk)] = smoothed
+        previous = smoothed[-1]
+    return result
+
+
+def ema(values: "np.ndarray", period: int) -> "np.ndarray":
+    """
+    :param values: series ordered from the oldest value
+    :param period: span of the average, weight of the newest value is 2 / (period + 1)
+    :return: exponential moving average seeded with simple average
+    """
+    return smooth(values, 2.0 / (period + 1), period)
+
+
+def true_range(high: "np.ndarray", low: "np.ndarray", close: "np.ndarray") -> "np.ndarray":
+    """
+    :return: true range, range of the first candle is high - low
+    """
+    _require_numpy()
+    high, low, close = (np.asarray(column, dtype=np.float64) for column in (high, low, close))
+    ranges = high - low
+    if len(ranges) > 1:
+        previous = close[:-1]
+        ranges[1:] = np.maximum(
+            ranges[1:], np.maximum(np.abs(high[1:] - previous), np.abs(low[1:] - previous))
+        )
+    return ranges
+
+
+def atr(
+    high: "np.ndarray", low: "np.ndarray", close: "np.ndarray", period: int = 14
+) -> "np.ndarray":
+    """
+    :return: average true range with Wilder smoothing
+    """
+    return smooth(true_range(high, low, close), 1.0 / period, period)
+
+
+def rsi(close: "np.ndarray", period: int = 14) -> "np.ndarray":
+    """
+    :param close: close prices ordered from the oldest candle
+    :param period: number of price changes averaged with Wilder smoothing
+    :return: relative strength index in range 0 - 100, first period values are NaN
+    """
+    _require_numpy()
+    close = np.asarray(close, dtype=np.float64)
+    result = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return result
+    changes = np.diff(close)
+    gains = smooth(np.maximum(changes, 0.0), 1.0 / period, period)
+    losses = smooth(np.maximum(-changes, 0.0), 1.0 / period, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result[1:] = np.where(losses == 0.0, 100.0, 100.0 - 100.0 / (1.0 + gains / losses))
+    return result
+
+
+class Smoother:
+    """
+    Incremental counterpart of smooth function.
+    """
+
+    def __init__(self, alpha: float, period: int):
+        self.alpha = alpha
+        self.period = period
+        self.count = 0
+        self.value = math.nan
+        self._total = 0.0
+
+    def state(self) -> Tuple[int, float, float]:
+        """
+        :return: state restored by restore
+        """
+        return self.count, self.value, self._total
+
+    def restore(self, state: Tuple[int, float, float]):
+        """
+        :param state: state returned by state
+        """
+        self.count, self.value, self._total = state
+
+    def update(self, value: float) -> float:
+        """
+        :param value: next value of the series
+        :return: smoothed value, NaN until period values are received
+        """
+        self.count += 1
+        if self.count < self.period:
+            self._total += value
+        elif self.count == self.period:
+            self.value = (self._total + value) / self.period
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class RollingIndicator:
+    """
+    Base of indicators updated with candles in constant time. Candle with the same
+    ts as the previous one, i.e. still open candle polled again, replaces it,
+    older candles are ignored.
+
+    Attributes
+    ----------
+    value : float
+        indicator value of the newest candle, NaN until enough candles are received
+    """
+
+    def __init__(self):
+        self.value = math.nan
+        self._ts: Optional[float] = None
+        self._previous = None
+
+    def update(self, candle: dict) -> float:
+        """
+        :param candle: candle dictionary in format returned by get_candles
+        :return: indicator value including the candle
+        """
+        if self._ts is not None and candle["ts"] < self._ts:
+            return self.value
+        if candle["ts"] == self._ts:
+            self._restore(self._previous)
+        else:
+            self._previous = self._state()
+        self._ts = candle["ts"]
+        self.value = self._step(candle)
+        return self.value
+
+    def update_many(self, candles: Iterable[dict]) -> float:
+        """
+        :param candles: candles in any order, i.e. result of get_last_candles
+        :return: indicator value of the newest candle
+        """
+        for candle in sorted(candles, key=lambda candle: candle["ts"]):
+            self.update(candle)
+        return self.value
+
+    def _state(self):
+        raise NotImplementedError
+
+    def _restore(self, state):
+        raise NotImplementedError
+
+    def _step(self, candle: dict) -> float:
+        raise NotImplementedError
+
+
+class RollingSMA(RollingIndicator):
+    """
+    Simple moving average of candle field.
+    """
+
+    def __init__(self, period: int, field: str = "close"):
+        super().__init__()
+        self.period = period
+        self.field = field
+        self._window: Deque[float] = deque()
+        self._sum = 0.0
+
+    def _state(self) -> tuple:
+        dropped = self._window[0] if len(self._window) == self.period else None
+        return self._sum, dropped, self.value
+
+    def _restore(self, state: tuple):
+        self._sum, dropped, self.value = state
+        self._window.pop()
+        if dropped is not None:
+            self._window.appendleft(dropped)
+
+    def _step(self, candle: dict) -> float:
+        value = candle[self.field]
+        self._window.append(value)
+        self._sum += value
+        if len(self._window) > self.period:
+            self._sum -= self._window.popleft()
+        if len(self._window) < self.period:
+            return math.nan
+        return self._sum / self.period
+
+
+class RollingEMA(RollingIndicator):
+    """
+    Exponential moving average of candle field, the same as ema function.
+    """
+
+    def __init__(self, period: int, field: str = "close"):
+        super().__init__()
+        self.field = field
+        self._smoother = Smoother(2.0 / (period + 1), period)
+
+    def _state(self) -> tuple:
+        return self._smoother.state()
+
+    def _restore(self, state: tuple):
+        self._smoother.restore(state)
+
+    def _step(self, candle: dict) -> float:
+        return self._smoother.update(candle[self.field])
+
+
+class RollingATR(RollingIndicator):
+    """
+    Average true range, the same as atr function.
+    """
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self._smoother = Smoother(1.0 / period, period)
+        self._close: Optional[float] = None
+
+    def _state(self) -> tuple:
+        return self._smoother.state(), self._close
+
+    def _restore(self, state: tuple):
+        smoother, self._close = state
+        self._smoother.restore(smoother)
+
+    def _step(self, candle: dict) -> float:
+        high, low = candle["high"], candle["low"]
+        value = high - low
+        if self._close is not None:
+            value = max(value, abs(high - self._close), abs(low - self._close))
+        self._close = candle["close"]
+        return self._smoother.update(value)
+
+
+class RollingRSI(RollingIndicator):
+    """
+    Relative strength index, the same as rsi function.
+    """
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self._gains = Smoother(1.0 / period, period)
+        self._losses = Smoother(1.0 / period, period)
+        self._close: Optional[float] = None
+
+    def _state(self) -> tuple:
+        return self._gains.state(), self._losses.state(), self._close
+
+    def _restore(self, state: tuple):
+        gains, losses, self._close = state
+        self._gains.restore(gains)
+        self._losses.restore(losses)
+
+    def _step(self, candle: dict) -> float:
+        close = candle["close"]
+        previous, self._close = self._close, close
+        if previous is None:
+            return math.nan
+        change = close - previous
+        gain = self._gains.update(max(change, 0.0))
+        loss = self._losses.update(max(-change, 0.0))
+        if math.isnan(loss):
+            return math.nan
+        if loss == 0.0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + gain / loss)
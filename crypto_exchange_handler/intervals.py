@@ -0,0 +1,240 @@
+"""
+Module contains candle intervals supported by exchanges. Interval knows its
+length in seconds and spelling used by every exchange API, and splits date
+range into request windows with UTC epoch arithmetic (calendar months for monthly
+candles), so long backfills are planned into full pages before the first request is sent.
+"""
+
+import datetime
+import functools
+import re
+import time
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+WEEK = 604800
+# length of the longest month, monthly candles have no fixed length
+MONTH = 2678400
+# weeks start on Monday like on exchanges, 1970-01-05 00:00 UTC
+WEEK_ORIGIN = 345600
+
+# maximal number of candles returned by single klines request
+PAGE_LIMITS = {"binance": 1000, "kucoin": 1500}
+
+_UNITS = {
+    "s": 1, "m": MINUTE, "min": MINUTE, "h": HOUR, "hour": HOUR,
+    "d": DAY, "day": DAY, "w": WEEK, "week": WEEK,
+}
+
+
+def to_timestamp(value: Union[str, int]) -> int:
+    """
+    :param value: UTC date in format %Y-%m-%d, ISO datetime (UTC unless offset is given)
+        or epoch timestamp in seconds
+    :return: epoch timestamp in seconds
+    """
+    if not isinstance(value, str):
+        return int(value)
+    try:
+        moment = datetime.datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        moment = datetime.datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return int(moment.timestamp())
+
+
+def _month_index(timestamp: int) -> int:
+    """
+    :return: number of calendar months between January 1970 and month containing timestamp
+    """
+    moment = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+    return (moment.year - 1970) * 12 + moment.month - 1
+
+
+def _month_start(index: int) -> int:
+    """
+    :param index: number of calendar months since January 1970
+    :return: timestamp of the first day of the month
+    """
+    year, month = divmod(index, 12)
+    moment = datetime.datetime(1970 + year, month + 1, 1, tzinfo=datetime.timezone.utc)
+    return int(moment.timestamp())
+
+
+class Interval(NamedTuple):
+    """
+    Candle interval.
+
+    Attributes
+    ----------
+    name : str
+        short name, i.e. 1m, 4h, 1w
+    seconds : int
+        length of the interval, the longest month for monthly intervals
+    binance : str
+        spelling used by Binance API, None if Binance has no such candles
+    kucoin : str
+        spelling used by Kucoin API, None if Kucoin has no such candles
+    months : int
+        number of calendar months of monthly interval, 0 for intervals of fixed length
+    """
+
+    name: str
+    seconds: int
+    binance: Optional[str] = None
+    kucoin: Optional[str] = None
+    months: int = 0
+
+    @property
+    def origin(self) -> int:
+        """
+        :return: timestamp of any candle start, Monday for weekly intervals, epoch otherwise
+        """
+        return WEEK_ORIGIN if self.seconds % WEEK == 0 else 0
+
+    def native(self, exchange: str) -> Optional[str]:
+        """
+        :param exchange: exchange name, i.e. kucoin
+        :return: interval spelling used by exchange API or None if it is not supported
+        """
+        if exchange == "binance":
+            return self.binance
+        if exchange == "kucoin":
+            return self.kucoin
+        return None
+
+    def floor(self, timestamp: int) -> int:
+        """
+        :return: start of candle containing timestamp
+        """
+        if self.months:
+            return _month_start(_month_index(timestamp) // self.months * self.months)
+        return timestamp - (timestamp - self.origin) % self.seconds
+
+    def ceil(self, timestamp: int) -> int:
+        """
+        :return: start of the first candle starting at timestamp or later
+        """
+        if self.months:
+            start = self.floor(timestamp)
+            return start if start == timestamp else _month_start(_month_index(start) + self.months)
+        return timestamp + (self.origin - timestamp) % self.seconds
+
+    def windows(
+        self,
+        start: Union[str, int],
+        end: Optional[Union[str, int]] = None,
+        limit: int = PAGE_LIMITS["binance"],
+    ) -> Tuple[Tuple[int, int], ...]:
+        """
+        Splits range into windows of at most limit candles. Bounds of window are start
+        times of its first and last candle, both inclusive as in exchange klines queries,
+        so windows do not overlap and only the last one can be shorter than limit.
+
+        :param start: start time in format accepted by to_timestamp
+        :param end: end time in format accepted by to_timestamp, now if None
+        :param limit: maximal number of candles in window, see PAGE_LIMITS
+        :return: tuple of (first candle start, last candle start) in epoch seconds
+        """
+        first = self.ceil(to_timestamp(start))
+        last = self.floor(to_timestamp(end) if end is not None else int(time.time()))
+        if self.months:
+            step = self.months * limit
+            return tuple(
+                (_month_start(index), min(_month_start(index + step - self.months), last))
+                for index in range(_month_index(first), _month_index(last) + 1, step)
+            )
+        step = self.seconds * limit
+        return tuple(
+            (window, min(window + step - self.seconds, last))
+            for window in range(first, last + 1, step)
+        )
+
+
+INTERVALS = (
+    Interval("1s", 1, binance="1s"),
+    Interval("1m", MINUTE, binance="1m", kucoin="1min"),
+    Interval("3m", 3 * MINUTE, binance="3m", kucoin="3min"),
+    Interval("5m", 5 * MINUTE, binance="5m", kucoin="5min"),
+    Interval("15m", 15 * MINUTE, binance="15m", kucoin="15min"),
+    Interval("30m", 30 * MINUTE, binance="30m", kucoin="30min"),
+    Interval("1h", HOUR, binance="1h", kucoin="1hour"),
+    Interval("2h", 2 * HOUR, binance="2h", kucoin="2hour"),
+    Interval("4h", 4 * HOUR, binance="4h", kucoin="4hour"),
+    Interval("6h", 6 * HOUR, binance="6h", kucoin="6hour"),
+    Interval("8h", 8 * HOUR, binance="8h", kucoin="8hour"),
+    Interval("12h", 12 * HOUR, binance="12h", kucoin="12hour"),
+    Interval("1d", DAY, binance="1d", kucoin="1day"),
+    Interval("3d", 3 * DAY, binance="3d"),
+    Interval("1w", WEEK, binance="1w", kucoin="1week"),
+    Interval("1M", MONTH, binance="1M", months=1),
+)
+
+_BY_SPELLING: Dict[str, Interval] = {
+    spelling: interval
+    for interval in INTERVALS
+    for spelling in (interval.name, interval.binance, interval.kucoin)
+    if spelling is not None
+}
+_BY_SECONDS = {interval.seconds: interval for interval in INTERVALS if not interval.months}
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_name(name: str) -> Interval:
+    match = re.fullmatch(r"(\d+)([a-z]+)", name)
+    if match is None or match.group(2) not in _UNITS or not int(match.group(1)):
+        raise ValueError(f"Unsupported interval: {name}")
+    return parse_interval(int(match.group(1)) * _UNITS[match.group(2)])
+
+
+def parse_interval(value: Union[str, int, Interval]) -> Interval:
+    """
+    Intervals not offered by any exchange, i.e. 7min, are returned without native
+    spellings, they can still be used to resample candles.
+
+    :param value: interval in Binance (1m, 4h, 1M) or Kucoin (1min, 4hour) spelling,
+        or its length in seconds
+    :return: Interval
+    :raises ValueError: if value is not valid interval
+    """
+    if isinstance(value, Interval):
+        return value
+    if isinstance(value, str):
+        interval = _BY_SPELLING.get(value)
+        return interval if interval is not None else _parse_name(value)
+    if value <= 0:
+        raise ValueError(f"Unsupported interval: {value}")
+    interval = _BY_SECONDS.get(value)
+    return interval if interval is not None else Interval(f"{value}s", int(value))
+
+
+def supported_intervals(exchange: str) -> Tuple[str, ...]:
+    """
+    :param exchange: exchange name, i.e. kucoin
+    :return: interval spellings accepted by exchange API
+    """
+    return tuple(
+        interval.native(exchange) for interval in INTERVALS if interval.native(exchange)
+    )
+
+
+def exchange_interval(value: Union[str, int, Interval], exchange: str) -> Optional[Interval]:
+    """
+    Validates interval of candles requested from exchange.
+
+    :param value: interval in any format accepted by parse_interval
+    :param exchange: exchange name, i.e. kucoin
+    :return: Interval or None if exchange does not offer such candles
+    """
+    try:
+        interval = parse_interval(value)
+    except ValueError:
+        interval = None
+    if interval is None or interval.native(exchange) is None:
+        print(f"ERROR: Invalid interval {value}. "
+              f"Valid intervals are: {supported_intervals(exchange)}")
+        return None
+    return interval
@@ -4,14 +4,32 @@ Exhange address:  https://www.kucoin.com/
 Api documentation: https://docs.kucoin.com/
 """
 import json
-from typing import Optional, Dict, Tuple
+from urllib.parse import urlencode
+from typing import Iterable, List, Mapping, Optional, Dict, Tuple, Union
 import time
 import hmac
 import base64
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
-from .exchange_template import ExchangeAPI, MarketSide
+from .balances import Balances, format_balance
+from .candles import CandleSeries
+from .exchange_template import (
+    DEFAULT_BALANCE_TTL, ExchangeAPI, MarketSide, to_quotes
+)
+from .intervals import PAGE_LIMITS, exchange_interval, to_timestamp
+from .numeric_book import NumericOrderBook
+from .orders import OrderRequest, OrderResult, chunks
+from .pair import Pair, as_pair
+from .rate_limit import TokenBucket, WeightScheduler
+from .retry import (
+    CircuitOpenError, RetryableError, RetryPolicy, is_retryable_status, parse_retry_after
+)
+from .singleflight import coalesce
+from .symbols import SymbolIndex, kucoin_symbol_index
+from .transport import create_session, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT, Timeout
 
 
 # fmt: off
@@ -51,16 +69,33 @@ SYSTEM_codes = {
     "400700": "Transaction restricted, there's a risk problem in your account",
     "400800": "Leverage order failed",
     "411100": "User are frozen",
+    "429000": "Too Many Requests -- Request rate limit of the resource pool exceeded",
     "500000": "Internal Server Error",
     "900001": "symbol not exists",
 }
 
-valid_intervals = (
-    "1min", "3min", "5min", "15min", "30min",
-    "1hour", "2hour", "4hour", "6hour", "8hour",
-    "12hour", "1day", "1week"
-)
-# fmt: off
+CANDLES_PAGE_LIMIT = PAGE_LIMITS["kucoin"]
+CANDLES_WORKERS = 4
+# limit orders of single market placed with one request
+ORDERS_BATCH_SIZE = 5
+# public market data is polled more often than private endpoints
+PUBLIC_POOL_SIZE = 32
+
+# quota of every resource pool per 30 seconds
+POOL_LIMITS = {"public": 2000, "spot": 4000, "management": 2000}
+POOL_WINDOW = 30
+
+request_weights = {
+    "symbols": ("public", 4),
+    "market/orderbook/level1": ("public", 2),
+    "market/allTickers": ("public", 15),
+    "market/orderbook/level2_100": ("public", 4),
+    "market/candles": ("public", 3),
+    "bullet-public": ("public", 10),
+    "accounts": ("management", 5),
+    "orders": ("spot", 2),
+    "orders/multi": ("spot", 3),
+}
 
 kucoin_codes = {
     **HTTP_error_codes,
@@ -68,28 +103,360 @@ kucoin_codes = {
 }
 
 
-def is_response_valid(response: dict) -> bool:
+def is_response_valid(response: Optional[dict]) -> bool:
     """
     Checks if data received from exchange is correct.
 
     :param response: response data from API
     :return: Boolean value representing validity of response
     """
+    if response is None:
+        return False
     if response["code"] != "200000":
         print(f'ERROR: code: {response["code"]}, msg: {kucoin_codes[response["code"]]}')
         return False
     return True
 
 
-class Kucoin(ExchangeAPI):
+def parse_limit_headers(headers: Mapping[str, str], pool: str) -> Dict[str, float]:
     """
-    Class handles connection ot the KuCoin crypto exchange API.
+    Reads quota of resource pool reported by Kucoin in response headers.
+
+    :param headers: response headers
+    :param pool: resource pool of the request, Kucoin reports only this pool
+    :return: dictionary with pool - remaining quota pair
+    """
+    remaining = headers.get("gw-ratelimit-remaining")
+    if remaining is None:
+        return {}
+    return {pool: float(remaining)}
+
+
+def create_scheduler() -> WeightScheduler:
+    """
+    :return: scheduler keeping requests within quotas of Kucoin resource pools
+    """
+    return WeightScheduler(
+        pools={
+            pool: TokenBucket(limit, limit / POOL_WINDOW) for pool, limit in POOL_LIMITS.items()
+        },
+        weights=request_weights,
+        default=("public", 5),
+        headers_parser=parse_limit_headers,
+    )
+
+
+def create_retry_policy() -> RetryPolicy:
+    """
+    :return: retry policy repeating rate limited, failed and timed out requests
+    """
+    return RetryPolicy()
+
+
+def response_data(response: requests.Response, req_type: str) -> Optional[dict]:
+    """
+    Decodes response body, raising RetryableError for responses worth repeating.
+
+    :param response: response of the API
+    :param req_type: method of the request [post, get]
+    :return: json data with response
+    """
+    if is_retryable_status(response.status_code, req_type):
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        raise RetryableError(
+            f"status: {response.status_code}, response: {data}",
+            retry_after=parse_retry_after(response.headers),
+            result=data,
+        )
+    return response.json()
+
+
+class RequestSigner:  # pylint: disable=too-few-public-methods
+    """
+    Creates authentication headers for private API requests. HMAC key is
+    prepared once per client, signing request copies the keyed hash instead
+    of building it from the secret again. Single public method is intended,
+    the class only keeps the prepared key between requests.
     """
-    order_id_num: int = 0
 
     def __init__(self, access_key: str, secret_key: str, api_passphrase: str):
+        """
+        :param access_key: public API key
+        :param secret_key: private API key
+        :param api_passphrase: API passphrase
+        """
+        self._hmac = hmac.new(secret_key.encode("utf-8"), digestmod=hashlib.sha256)
+        self._headers = {
+            "KC-API-KEY": access_key,
+            "KC-API-PASSPHRASE": api_passphrase,
+            "Content-Type": "application/json",
+        }
+
+    def headers(self, req_type: str, addr: str, json_data: str) -> dict:
+        """
+        :param req_type: method of the request [post, get]
+        :param addr: endpoint for request
+        :param json_data: serialized body of the request
+        :return: dictionary with request headers
+        """
+        now = str(int(time.time() * 1000))
+        signature = self._hmac.copy()
+        signature.update(f"{now}{req_type.upper()}/api/v1/{addr}{json_data}".encode("utf-8"))
+        return {
+            "KC-API-SIGN": base64.b64encode(signature.digest()).decode("utf-8"),
+            "KC-API-TIMESTAMP": now,
+            **self._headers,
+        }
+
+
+def accounts_balances(accounts: list) -> Balances:
+    """
+    :param accounts: data of accounts endpoint
+    :return: Balances of all accounts
+    """
+    return Balances((item["id"], item["currency"], item["balance"]) for item in accounts)
+
+
+def parse_level1_price(data: Optional[dict], pair: str, price_type: MarketSide) -> Optional[str]:
+    """
+    Extracts requested price from level1 order book data.
+
+    :param data: data of market/orderbook/level1 endpoint
+    :param pair: market symbol, used for error message
+    :param price_type: type of price to return
+    :return: price as a string
+    """
+    if data:
+        if price_type == MarketSide.ASK:
+            return data["bestAsk"]
+        if price_type == MarketSide.BID:
+            return data["bestBid"]
+        if price_type == MarketSide.LATEST:
+            return data["price"]
+    else:
+        print(
+            f"ERROR: Coin: {pair} not found in available tickers. "
+            f"Use get_available_markets to check if pair is available"
+        )
+        return None
+
+    print(f"ERROR: Wrong price type: {price_type}\nAvailable values: [ask, bid, latest]")
+    return None
+
+
+def coins_symbols(coins: Iterable[str], quote: Union[str, Iterable[str]]) -> Dict[str, Pair]:
+    """
+    :param coins: base currencies
+    :param quote: quote currency or iterable of quote currencies
+    :return: dictionary with market symbol in format ADA-BTC - Pair pair
+    """
+    quotes = to_quotes(quote)
+    pairs = (Pair.of(coin, item) for coin in coins for item in quotes)
+    return {pair.kucoin: pair for pair in pairs}
+
+
+def parse_tickers_prices(tickers: list, symbols: Mapping[str, str],
+                         price_type: MarketSide) -> Dict[str, str]:
+    """
+    Picks prices of requested symbols from all tickers data.
+
+    :param tickers: ticker list of market/allTickers endpoint
+    :param symbols: dictionary with market symbol to pick - result key pair
+    :param price_type: type of price to return
+    :return: dictionary with result key - price pair
+    """
+    key = {MarketSide.ASK: "sell", MarketSide.BID: "buy", MarketSide.LATEST: "last"}[price_type]
+    result = {}
+    for ticker in tickers:
+        pair = symbols.get(ticker["symbol"])
+        if pair is not None:
+            result[pair] = ticker[key]
+    return result
+
+
+def candles_params(  # pylint: disable=too-many-arguments
+        coin: str,
+        quote: str,
+        interval: str,
+        start: Optional[Union[str, int]] = None,
+        end: Optional[Union[str, int]] = None,
+) -> Optional[Tuple[dict, ...]]:
+    """
+    Validates arguments and builds query params for market/candles endpoint.
+    Range with start is split into windows which fit into single response page.
+
+    :return: tuple of query params, one per page, or None if interval is invalid
+    """
+    candle_interval = exchange_interval(interval, "kucoin")
+    if candle_interval is None:
+        return None
+
+    params = {
+        "symbol": as_pair(coin, quote).kucoin,
+        "type": candle_interval.kucoin,
+    }
+
+    if start is None:
+        if end is not None:
+            params["endAt"] = str(to_timestamp(end))
+        return (params,)
+
+    return tuple(
+        {**params, "startAt": str(window_start), "endAt": str(window_end)}
+        for window_start, window_end in candle_interval.windows(start, end, CANDLES_PAGE_LIMIT)
+    )
+
+
+def parse_candles(klines: list, as_series: bool = False) -> Union[tuple, CandleSeries]:
+    """
+    Converts klines from market/candles endpoint into candle dictionaries.
+
+    :param klines: data of market/candles endpoint
+    :param as_series: return CandleSeries instead of tuple of dictionaries
+    :return: tuple of kline dictionaries
+    """
+    if as_series:
+        return CandleSeries.from_klines(klines, columns=(0, 1, 3, 4, 2))
+    return tuple(
+        {
+            "ts": int(candle[0]),
+            "open": float(candle[1]),
+            "close": float(candle[2]),
+            "high": float(candle[3]),
+            "low": float(candle[4]),
+        }
+        for candle in klines
+    )
+
+
+def order_params(order: OrderRequest) -> dict:
+    """
+    :param order: validated order with client order id
+    :return: dictionary with order params
+    """
+    params = {
+        "clientOid": order.client_oid,
+        "side": order.side,
+        "symbol": order.pair.kucoin,
+        "type": order.order_type,
+    }
+    if order.price is not None:
+        params["price"] = order.price
+    if order.size is not None:
+        params["size"] = order.size
+    if order.amount is not None:
+        params["funds"] = order.amount
+    return params
+
+
+def response_error(response: Optional[dict]) -> str:
+    """
+    :param response: invalid response of the API
+    :return: description of the error
+    """
+    if response is None:
+        return "no response"
+    return f'code: {response.get("code")}, msg: {response.get("msg")}'
+
+
+def multi_order_results(batch: Tuple[OrderRequest, ...], items: list) -> List[OrderResult]:
+    """
+    :param batch: orders sent to orders/multi endpoint
+    :param items: data of the response, one item per order
+    :return: result of every order in the batch
+    """
+    by_oid = {item.get("clientOid"): item for item in items}
+    results = []
+    for order in batch:
+        item = by_oid.get(order.client_oid)
+        if item is None:
+            results.append(OrderResult(order, error="order missing in response"))
+        elif item.get("status") == "success":
+            results.append(OrderResult(order, order_id=item["id"]))
+        else:
+            results.append(OrderResult(order, error=item.get("failMsg") or "rejected"))
+    return results
+
+
+def market_order_params(  # pylint: disable=too-many-arguments
+        client_oid: str, side: str, coin: str, quote: str,
+        size: Optional[str] = None, amount: Optional[str] = None
+) -> Optional[dict]:
+    """
+    Validates arguments and builds body of market order request.
+
+    :return: dictionary with order params or None if arguments are invalid
+    """
+    if size is not None and amount is not None:
+        print("ERROR: Choose only one of the params.")
+        return None
+
+    if size is None and amount is None:
+        print("ERROR: Fill size or amount.")
+        return None
+
+    if side not in ("buy", "sell"):
+        print("ERROR: Parameter side can only by 'buy' or 'sell'")
+        return None
+
+    params = {
+        "clientOid": client_oid,
+        "side": side,
+        "symbol": as_pair(coin, quote).kucoin,
+        "type": "market",
+    }
+
+    if size:
+        params["size"] = size
+
+    if amount:
+        params["amount"] = amount
+    return params
+
+
+class Kucoin(ExchangeAPI):  # pylint: disable=too-many-instance-attributes
+    """
+    Class handles connection ot the KuCoin crypto exchange API.
+    """
+    def __init__(  # pylint: disable=too-many-arguments
+            self, access_key: str, secret_key: str, api_passphrase: str,
+            pool_size: int = DEFAULT_POOL_SIZE,
+            public_pool_size: int = PUBLIC_POOL_SIZE,
+            keep_alive: bool = True,
+            timeout: Timeout = DEFAULT_TIMEOUT,
+            scheduler: Optional[WeightScheduler] = None,
+            retry: Optional[RetryPolicy] = None,
+            balance_ttl: float = DEFAULT_BALANCE_TTL,
+    ):
+        """
+        :param pool_size: number of pooled connections kept open for private requests
+        :param public_pool_size: number of pooled connections kept open for public market data
+        :param keep_alive: reuse connections between requests
+        :param timeout: connect/read timeout in seconds, single value or (connect, read) tuple
+        :param scheduler: rate limiter, pass the same instance to clients sharing account
+        :param retry: policy repeating failed requests
+        :param balance_ttl: time in seconds for which downloaded balances are reused
+        """
         super().__init__("kucoin", access_key, secret_key, api_passphrase)
+        self.balances.ttl = balance_ttl
         self.api_addr = "https://api.kucoin.com"
+        self.timeout = timeout
+        self.session = create_session(pool_size, keep_alive)
+        self.public_session = create_session(public_pool_size, keep_alive)
+        self.signer = RequestSigner(access_key, secret_key, api_passphrase)
+        self.candles_workers = CANDLES_WORKERS
+        self.scheduler = scheduler if scheduler is not None else create_scheduler()
+        self.retry = retry if retry is not None else create_retry_policy()
+
+    def close(self):
+        """
+        Closes all pooled connections of the client.
+        """
+        self.session.close()
+        self.public_session.close()
 
     def send_priv_request(self, addr: str,
                           data: Optional[dict] = None,
@@ -101,133 +468,152 @@ class Kucoin(ExchangeAPI):
         :param data: data for request
         :return: json data with response
         """
+        if req_type not in ("get", "post"):
+            print(
+                f"ERROR: Invalid request type: {req_type}. Use only ['post', 'get']"
+            )
+            return None
 
-        json_data = json.dumps(data) if data else ""
-        now = int(time.time() * 1000)
-        str_to_sign = str(now) + req_type.upper() + "/api/v1/" + addr + json_data
-        signature = base64.b64encode(
-            hmac.new(
-                self.secret_key.encode('utf-8'),
-                str_to_sign.encode('utf-8'),
-                hashlib.sha256,
-            ).digest()
-        )
+        return self._request(addr, data, req_type, signed=True)
 
-        headers = {
-            "KC-API-SIGN": signature,
-            "KC-API-TIMESTAMP": str(now),
-            "KC-API-KEY": self.access_key,
-            "KC-API-PASSPHRASE": self.api_passphrase,
-            "Content-Type": "application/json",
-        }
+    def send_pub_request(self, addr: str, data: Optional[dict] = None) -> Optional[dict]:
+        """
+        Sends unsigned GET request for public market data, i.e. tickers or candles.
+        Requests are not authenticated, so they do not count against limits of API key.
+        :param addr: endpoint for request
+        :param data: query parameters
+        :return: json data with response
+        """
+        return self._request(addr, data, "get", signed=False)
 
+    def _request(
+            self, addr: str, data: Optional[dict], req_type: str, signed: bool
+    ) -> Optional[dict]:
+        try:
+            return self.retry.call(addr, self._send, addr, data, req_type, signed)
+        except RetryableError as error:
+            print(f"ERROR: {error}")
+            return error.result
+        except CircuitOpenError as error:
+            print(f"ERROR: {error}")
+            return None
+
+    def _send(
+            self, addr: str, data: Optional[dict], req_type: str, signed: bool = True
+    ) -> Optional[dict]:
         endpoint_addr = f'{self.api_addr}/api/v1/{addr}'
-        if req_type == "get":
-            response = requests.get(endpoint_addr, headers=headers, params=data)
-        elif req_type == "post":
-            response = requests.post(endpoint_addr, headers=headers, data=json_data)
+        self.scheduler.acquire(addr, data)
+        if not signed:
+            response = self.public_session.get(endpoint_addr, params=data, timeout=self.timeout)
+        elif req_type == "get":
+            query = f"?{urlencode(data)}" if data else ""
+            response = self.session.get(
+                endpoint_addr + query,
+                headers=self.signer.headers(req_type, addr + query, ""),
+                timeout=self.timeout,
+            )
         else:
-            print(
-                f"ERROR: Invalid request type: {req_type}. Use only ['post', 'get']"
+            json_data = json.dumps(data) if data else ""
+            response = self.session.post(
+                endpoint_addr,
+                headers=self.signer.headers(req_type, addr, json_data),
+                data=json_data,
+                timeout=self.timeout,
             )
-            return None
 
-        return response.json()
+        self.scheduler.update_from_headers(addr, response.headers)
+        return response_data(response, req_type)
 
-    def get_all_balances(self) -> Optional[Dict[str, str]]:
+    def _load_balances(self) -> Optional[Balances]:
         data = self.send_priv_request("accounts")
         if not is_response_valid(data):
             return None
 
-        result = {}
-        for item in data["data"]:
-            if item["currency"] in result:
-                coin_balance = float(item["balance"]) + float(result[item["currency"]])
-                result[item["currency"]] = f"{coin_balance:.10f}"
-            else:
-                result[item["currency"]] = f"{float(item['balance']):.10f}"
-        return result
+        return accounts_balances(data["data"])
+
+    def get_all_balances(self) -> Optional[Dict[str, str]]:
+        balances = self.balances.get()
+        return balances.to_dict() if balances is not None else None
 
     def get_balance(self, coin: str) -> Optional[str]:
-        data = self.send_priv_request("accounts")
-        if not is_response_valid(data):
+        balances = self.balances.get()
+        if balances is None:
             return None
 
-        result = 0
-        for item in data["data"]:
-            if item["currency"] == coin:
-                result += float(item["balance"])
-        return f"{result:.10f}"
+        return balances.get(coin, format_balance(0.0))
 
-    def get_available_markets(self) -> Optional[Tuple[str, ...]]:
-        data = self.send_priv_request("symbols")
+    def _load_symbols(self) -> Optional[SymbolIndex]:
+        data = self.send_pub_request("symbols")
         if not is_response_valid(data):
             return None
-        return tuple((pair["symbol"].replace("-", "") for pair in data["data"]))
+        return kucoin_symbol_index(data["data"])
 
+    def get_available_markets(self) -> Optional[Tuple[Pair, ...]]:
+        index = self.get_symbol_index()
+        if index is None:
+            return None
+        return index.pairs()
+
+    @coalesce
     def get_coin_price(self, coin: str,
                        quote: str = "BTC",
                        price_type: MarketSide = MarketSide.ASK) -> Optional[str]:
 
-        pair = f"{coin.upper()}-{quote.upper()}"
+        pair = as_pair(coin, quote).kucoin
 
-        data = self.send_priv_request(
+        data = self.send_pub_request(
             "market/orderbook/level1",
             {
-                "symbol": f"{pair}"
+                "symbol": pair
             }
         )
 
         if not is_response_valid(data):
             return None
 
-        if data["data"]:
-            if price_type == MarketSide.ASK:
-                return data["data"]["bestAsk"]
-            if price_type == MarketSide.BID:
-                return data["data"]["bestBid"]
-            if price_type == MarketSide.LATEST:
-                return data["data"]["price"]
-        else:
-            print(
-                f"ERROR: Coin: {pair} not found in available tickers. "
-                f"Use get_available_markets to check if pair is available"
-            )
-            return None
-
-        print(f"ERROR: Wrong price type: {price_type}\nAvailable values: [ask, bid, latest]")
-        return None
+        return parse_level1_price(data["data"], pair, price_type)
 
+    @coalesce
     def get_coins_prices(
-            self, coins: Tuple, quote: str = "BTC", price_type: MarketSide = MarketSide.ASK
+            self,
+            coins: Iterable[str],
+            quote: Union[str, Iterable[str]] = "BTC",
+            price_type: MarketSide = MarketSide.ASK,
     ) -> Optional[dict]:
-        data = self.send_priv_request("market/allTickers")
+        data = self.send_pub_request("market/allTickers")
 
         if not is_response_valid(data):
             return None
 
-        symbols_list = [f"{coin.upper()}-{quote.upper()}" for coin in coins]
-        result = {}
+        return parse_tickers_prices(
+            data["data"]["ticker"], coins_symbols(coins, quote), price_type
+        )
 
-        for ticker in data["data"]["ticker"]:
-            if ticker["symbol"] in symbols_list:
-                if price_type == MarketSide.ASK:
-                    result[ticker["symbol"]] = ticker["sell"]
-                if price_type == MarketSide.BID:
-                    result[ticker["symbol"]] = ticker["buy"]
-                if price_type == MarketSide.LATEST:
-                    result[ticker["symbol"]] = ticker["last"]
-        return result
+    @coalesce
+    def get_order_book(
+            self, coin: str, quote: str, numeric: bool = False
+    ) -> Optional[Union[dict, NumericOrderBook]]:
+        snapshot = self.get_order_book_snapshot(coin, quote)
+        if snapshot is None:
+            return None
+
+        order_book = {
+            MarketSide.ASK: snapshot[MarketSide.ASK],
+            MarketSide.BID: snapshot[MarketSide.BID]
+        }
+        return NumericOrderBook.from_dict(order_book) if numeric else order_book
 
-    def get_order_book(self, coin: str, quote: str) -> Optional[dict]:
-        data = self.send_priv_request("market/orderbook/level2_100",
-                                      {"symbol": f"{coin.upper()}-{quote.upper()}"}
-                                      )
+    @coalesce
+    def get_order_book_snapshot(self, coin: str, quote: str) -> Optional[dict]:
+        data = self.send_pub_request(
+            "market/orderbook/level2_100", {"symbol": as_pair(coin, quote).kucoin}
+        )
 
         if not is_response_valid(data):
             return None
 
         return {
+            "sequence": int(data["data"]["sequence"]),
             MarketSide.ASK: data["data"][MarketSide.ASK.value],
             MarketSide.BID: data["data"][MarketSide.BID.value]
         }
@@ -235,40 +621,58 @@ class Kucoin(ExchangeAPI):
     def withdraw_asset(self, asset: str, target_addr: str, amount: str):
         print(f"ERROR: {self.name} client - Not implemented")
 
-    def create_order(self, market: str, side: str, price: str, amount: str):
-        print(f"ERROR: {self.name} client - Not implemented")
+    def _order_batches(
+            self, orders: List[OrderRequest]
+    ) -> Iterable[Tuple[OrderRequest, ...]]:
+        """
+        Limit orders of the same market are placed together with orders/multi endpoint,
+        market orders are placed separately.
+        """
+        limit_orders: Dict[Pair, List[OrderRequest]] = {}
+        for order in orders:
+            if order.order_type == "limit":
+                limit_orders.setdefault(order.pair, []).append(order)
+            else:
+                yield (order,)
+        for pair_orders in limit_orders.values():
+            yield from chunks(pair_orders, ORDERS_BATCH_SIZE)
+
+    def _send_orders(self, batch: Tuple[OrderRequest, ...]) -> List[OrderResult]:
+        try:
+            if len(batch) == 1:
+                response = self.send_priv_request(
+                    "orders", data=order_params(batch[0]), req_type="post"
+                )
+            else:
+                response = self.send_priv_request(
+                    "orders/multi",
+                    data={
+                        "symbol": batch[0].pair.kucoin,
+                        "orderList": [order_params(order) for order in batch],
+                    },
+                    req_type="post",
+                )
+        except requests.RequestException as error:
+            return [OrderResult(order, error=str(error)) for order in batch]
+
+        if not is_response_valid(response):
+            return [OrderResult(order, error=response_error(response)) for order in batch]
+        if len(batch) == 1:
+            return [OrderResult(batch[0], order_id=response["data"]["orderId"])]
+        return multi_order_results(batch, response["data"]["data"])
 
     def create_market_order(  # pylint: disable=too-many-arguments
             self, side: str, coin: str, quote: str,
             size: Optional[str] = None, amount: Optional[str] = None
     ):
-        if size is not None and amount is not None:
-            print("ERROR: Choose only one of the params.")
-            return None
-
-        if size is None and amount is None:
-            print("ERROR: Fill size or amount.")
-            return None
-
-        if side not in ("buy", "sell"):
-            print("ERROR: Parameter side can only by 'buy' or 'sell'")
+        params = market_order_params(
+            self.order_ids.next_id(), side, coin, quote, size, amount
+        )
+        if params is None:
             return None
 
-        params = {
-            "clientOid": f"handler_{str(self.order_id_num)}",
-            "side": side,
-            "symbol": f"{coin.upper()}-{quote.upper()}",
-            "type": "market",
-        }
-
-        if size:
-            params["size"] = size
-
-        if amount:
-            params["amount"] = amount
-
-        self.order_id_num += 1
         response = self.send_priv_request("orders", data=params, req_type="post")
+        self.balances.invalidate()
         if not is_response_valid(response):
             return None
         return response
@@ -278,46 +682,52 @@ class Kucoin(ExchangeAPI):
             coin: str,
             quote: str,
             interval: str,
-            start: Optional[str] = None,
-            end: Optional[str] = None,
-    ) -> Optional[tuple]:
-        if interval not in valid_intervals:
-            print(f"ERROR: Invalid interval. Valid intervals are: {valid_intervals}")
+            start: Optional[Union[str, int]] = None,
+            end: Optional[Union[str, int]] = None,
+            as_series: bool = False,
+    ) -> Optional[Union[tuple, CandleSeries]]:
+        """
+        Ranges longer than single response page (1500 candles) are split into pages
+        fetched concurrently, then merged and sorted from the newest candle.
+        """
+        pages_params = candles_params(coin, quote, interval, start, end)
+        if pages_params is None:
             return None
 
-        params = {
-            "symbol": f"{coin.upper()}-{quote.upper()}",
-            "type": f"{interval}",
-        }
+        if len(pages_params) != 1:
+            return self._get_candles_pages(pages_params, as_series)
 
-        if start:
-            time_start = time.strptime(start, "%Y-%m-%d")
-            params["startAt"] = str(int(time.mktime(time_start)))
+        data = self.send_pub_request("market/candles", data=pages_params[0])
+        if not is_response_valid(data):
+            return None
 
-        if end:
-            time_end = time.strptime(end, "%Y-%m-%d")
-            params["endAt"] = str(int(time.mktime(time_end)))
+        return parse_candles(data["data"], as_series)
 
-        data = self.send_priv_request("market/candles", data=params)
+    def _get_candles_page(self, params: dict) -> Optional[list]:
+        data = self.send_pub_request("market/candles", data=params)
         if not is_response_valid(data):
             return None
+        return data["data"]
 
-        klines = [
-            {
-                "ts": int(candle[0]),
-                "open": float(candle[1]),
-                "close": float(candle[2]),
-                "high": float(candle[3]),
-                "low": float(candle[4]),
-            }
-            for candle in data["data"]]
+    def _get_candles_pages(
+            self, pages_params: Tuple[dict, ...], as_series: bool
+    ) -> Optional[Union[tuple, CandleSeries]]:
+        with ThreadPoolExecutor(max_workers=self.candles_workers) as executor:
+            pages = list(executor.map(self._get_candles_page, pages_params))
+
+        if any(page is None for page in pages):
+            return None
 
-        return tuple(klines)
+        klines = {candle[0]: candle for page in pages for candle in page}
+        klines = sorted(klines.values(), key=lambda kline: int(kline[0]), reverse=True)
+        return parse_candles(klines, as_series)
 
-    def get_last_candles(
-            self, coin: str, quote: str, interval: str, amount: int
-    ) -> Optional[tuple]:
+    @coalesce
+    def get_last_candles(  # pylint: disable=too-many-arguments
+            self, coin: str, quote: str, interval: str, amount: int, as_series: bool = False
+    ) -> Optional[Union[tuple, CandleSeries]]:
         if amount > 100:
             print("ERROR: Max number of last candles is 100")
             return None
-        return self.get_candles(coin, quote, interval)[-amount:]
+        candles = self.get_candles(coin, quote, interval, as_series=as_series)
+        return candles[-amount:] if candles is not None else None
@@ -0,0 +1,137 @@
+"""
+Module contains NumericOrderBook - order book kept in parallel float64 arrays.
+Levels received as strings are converted in a single vectorized pass, so
+consumers do not parse prices with float() or Decimal() on every read.
+"""
+
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .exchange_template import MarketSide
+
+
+def levels_to_arrays(levels: list) -> tuple:
+    """
+    Converts [price, size] levels into price and size arrays.
+
+    :param levels: list of [price, size] pairs as strings or numbers
+    :return: tuple of float64 price and size arrays
+    """
+    if np is None:
+        raise ImportError("NumPy is required for NumericOrderBook")
+    if not levels:
+        return np.empty(0), np.empty(0)
+    table = np.array(levels, dtype=np.float64)
+    return table[:, 0].copy(), table[:, 1].copy()
+
+
+class NumericOrderBook:
+    """
+    Order book with prices and sizes of every side in parallel NumPy arrays.
+    Asks are sorted from the lowest price, bids from the highest one.
+
+    Attributes
+    ----------
+    prices : dict
+        MarketSide keyed float64 arrays of prices
+    sizes : dict
+        MarketSide keyed float64 arrays of sizes
+    """
+
+    def __init__(self, ask_prices, ask_sizes, bid_prices, bid_sizes):
+        """
+        :param ask_prices: ask prices sorted from the lowest one
+        :param ask_sizes: sizes of ask levels
+        :param bid_prices: bid prices sorted from the highest one
+        :param bid_sizes: sizes of bid levels
+        """
+        self.prices = {MarketSide.ASK: ask_prices, MarketSide.BID: bid_prices}
+        self.sizes = {MarketSide.ASK: ask_sizes, MarketSide.BID: bid_sizes}
+
+    @classmethod
+    def from_dict(cls, order_book: dict) -> "NumericOrderBook":
+        """
+        :param order_book: order book in format of ExchangeAPI.get_order_book
+        :return: NumericOrderBook with levels sorted from the best one
+        """
+        ask_prices, ask_sizes = levels_to_arrays(order_book[MarketSide.ASK])
+        bid_prices, bid_sizes = levels_to_arrays(order_book[MarketSide.BID])
+        if np.any(np.diff(ask_prices) < 0):
+            order = np.argsort(ask_prices, kind="stable")
+            ask_prices, ask_sizes = ask_prices[order], ask_sizes[order]
+        if np.any(np.diff(bid_prices) > 0):
+            order = np.argsort(-bid_prices, kind="stable")
+            bid_prices, bid_sizes = bid_prices[order], bid_sizes[order]
+        return cls(ask_prices, ask_sizes, bid_prices, bid_sizes)
+
+    def __len__(self) -> int:
+        return len(self.prices[MarketSide.ASK]) + len(self.prices[MarketSide.BID])
+
+    def best(self, side: MarketSide) -> Optional[float]:
+        """
+        :return: the best price of given side or None if side is empty
+        """
+        prices = self.prices[side]
+        return float(prices[0]) if len(prices) else None
+
+    def spread(self) -> Optional[float]:
+        """
+        :return: difference between the lowest ask and the highest bid
+        """
+        ask, bid = self.best(MarketSide.ASK), self.best(MarketSide.BID)
+        if ask is None or bid is None:
+            return None
+        return ask - bid
+
+    def mid(self) -> Optional[float]:
+        """
+        :return: average of the lowest ask and the highest bid
+        """
+        ask, bid = self.best(MarketSide.ASK), self.best(MarketSide.BID)
+        if ask is None or bid is None:
+            return None
+        return (ask + bid) / 2
+
+    def cumulative_depth(self, side: MarketSide):
+        """
+        :return: array with total size available up to every level
+        """
+        return np.cumsum(self.sizes[side])
+
+    def cumulative_notional(self, side: MarketSide):
+        """
+        :return: array with total value in quote currency up to every level
+        """
+        return np.cumsum(self.prices[side] * self.sizes[side])
+
+    def vwap(self, side: MarketSide, size: float) -> Optional[float]:
+        """
+        Calculates average price of market order filled by levels of given side,
+        i.e. MarketSide.ASK for buying.
+
+        :param side: side consumed by the order
+        :param size: order size in base currency
+        :return: volume weighted average price or None if the book is too shallow
+        """
+        if size <= 0:
+            return self.best(side)
+        depth = self.cumulative_depth(side)
+        level = int(np.searchsorted(depth, size))
+        if level >= len(depth):
+            return None
+        notional = self.cumulative_notional(side)
+        filled = depth[level - 1] if level else 0.0
+        cost = (notional[level - 1] if level else 0.0) + (size - filled) * self.prices[side][level]
+        return float(cost / size)
+
+    def ticks(self, side: MarketSide, tick_size: float):
+        """
+        :param side: side of the book
+        :param tick_size: minimal price change of the market
+        :return: int64 array of prices expressed in ticks
+        """
+        return np.rint(self.prices[side] / tick_size).astype(np.int64)
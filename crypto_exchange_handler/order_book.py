@@ -0,0 +1,231 @@
+"""
+Module contains local order book kept in sync with exchange by applying
+sequenced diff updates from stream on top of REST snapshot.
+"""
+
+import heapq
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from .exchange_template import MarketSide
+
+MAX_BUFFERED_UPDATES = 1000
+RESYNC_DELAY = 1.0
+_COMPACT_MIN = 64
+
+
+class BookSide:
+    """
+    Price levels of one side of order book. Levels are stored in dictionary
+    keyed by price and the best price is kept on top of a heap. Removed levels
+    are deleted from the heap lazily, when they reach its top.
+    """
+
+    def __init__(self, descending: bool):
+        """
+        :param descending: True for bids, where the best price is the highest one
+        """
+        self._sign = -1.0 if descending else 1.0
+        self._levels: Dict[float, List[str]] = {}
+        self._heap: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def clear(self):
+        """
+        Removes all price levels.
+        """
+        self._levels.clear()
+        self._heap.clear()
+
+    def set(self, price: str, size: str):
+        """
+        Sets size of price level, level with zero size is removed.
+
+        :param price: price as received from exchange
+        :param size: size as received from exchange
+        """
+        key = float(price)
+        if float(size) == 0:
+            self._levels.pop(key, None)
+            return
+        if key not in self._levels:
+            if len(self._heap) > 2 * len(self._levels) + _COMPACT_MIN:
+                self._heap = [self._sign * level for level in self._levels]
+                heapq.heapify(self._heap)
+            heapq.heappush(self._heap, self._sign * key)
+        self._levels[key] = [price, size]
+
+    def best(self) -> Optional[List[str]]:
+        """
+        :return: [price, size] of the best level or None if side is empty
+        """
+        heap = self._heap
+        while heap:
+            level = self._levels.get(self._sign * heap[0])
+            if level is not None:
+                return list(level)
+            heapq.heappop(heap)
+        return None
+
+    def levels(self, depth: Optional[int] = None) -> List[List[str]]:
+        """
+        :param depth: number of the best levels to return, all levels if None
+        :return: list of [price, size] levels from the best one
+        """
+        if depth is None:
+            prices = sorted(self._levels, key=lambda price: self._sign * price)
+        else:
+            prices = heapq.nsmallest(depth, self._levels, key=lambda price: self._sign * price)
+        return [list(self._levels[price]) for price in prices]
+
+
+class OrderBook:  # pylint: disable=too-many-instance-attributes
+    """
+    Local order book of single market. Book is initialized with snapshot returned
+    by loader and updated with diffs carrying sequence numbers. Update which does
+    not continue the sequence marks the book out of sync, updates are buffered
+    and the book is loaded again.
+
+    Attributes
+    ----------
+    sequence : int
+        sequence number of the last applied update
+    synced : bool
+        False when the book waits for snapshot
+    resyncs : int
+        number of loaded snapshots
+    """
+
+    def __init__(
+        self,
+        loader: Optional[Callable[[], Optional[dict]]] = None,
+        resync_delay: float = RESYNC_DELAY,
+        max_buffer: int = MAX_BUFFERED_UPDATES,
+    ):
+        """
+        :param loader: function returning snapshot in format of ExchangeAPI.get_order_book_snapshot
+        :param resync_delay: minimal time in seconds between snapshot requests
+        :param max_buffer: maximal number of updates buffered while waiting for snapshot
+        """
+        self.asks = BookSide(descending=False)
+        self.bids = BookSide(descending=True)
+        self.sequence = 0
+        self.synced = False
+        self.resyncs = 0
+        self.resync_delay = resync_delay
+        self._loader = loader
+        self._last_resync = float("-inf")
+        self._loading = False
+        self._buffer: deque = deque(maxlen=max_buffer)
+
+    def apply_snapshot(self, snapshot: dict):
+        """
+        Replaces content of the book with snapshot.
+
+        :param snapshot: dictionary with sequence and MarketSide keyed levels
+        """
+        self.asks.clear()
+        self.bids.clear()
+        for price, size, *_ in snapshot[MarketSide.ASK]:
+            self.asks.set(price, size)
+        for price, size, *_ in snapshot[MarketSide.BID]:
+            self.bids.set(price, size)
+        self.sequence = int(snapshot["sequence"])
+        self.synced = True
+
+    def _apply(self, first: int, last: int, bids: list, asks: list) -> bool:
+        if last <= self.sequence:
+            return True
+        if first > self.sequence + 1:
+            return False
+        for side, levels in ((self.asks, asks), (self.bids, bids)):
+            for level in levels:
+                if len(level) < 3 or int(level[2]) > self.sequence:
+                    side.set(level[0], level[1])
+        self.sequence = last
+        return True
+
+    def update(self, first: int, last: int, bids: list, asks: list) -> bool:
+        """
+        Applies diff update. Updates older than the book are ignored.
+
+        :param first: sequence number of the first change in update
+        :param last: sequence number of the last change in update
+        :param bids: list of [price, size] bid changes, zero size removes level
+        :param asks: list of [price, size] ask changes, zero size removes level
+        :return: True if the book is in sync after the update
+        """
+        if self.synced and self._apply(first, last, bids, asks):
+            return True
+        self.synced = False
+        self._buffer.append((first, last, bids, asks))
+        return self.resync()
+
+    def resync(self) -> bool:
+        """
+        Loads snapshot with loader and applies buffered updates newer than the snapshot.
+
+        :return: True if the book is in sync
+        """
+        if self._loader is None or not self.start_resync():
+            return False
+        return self.finish_resync(self._loader())
+
+    def start_resync(self) -> bool:
+        """
+        Marks snapshot as requested, so it can be loaded outside of the book, i.e.
+        in executor of asyncio loop. Updates received meanwhile are buffered.
+
+        :return: True if snapshot should be loaded now, False if other snapshot
+            is being loaded or resync delay has not passed yet
+        """
+        now = time.monotonic()
+        if self._loading or now - self._last_resync < self.resync_delay:
+            return False
+        self._last_resync = now
+        self._loading = True
+        return True
+
+    def finish_resync(self, snapshot: Optional[dict]) -> bool:
+        """
+        Applies snapshot requested by start_resync and buffered updates newer than it.
+
+        :param snapshot: loaded snapshot or None if loading failed
+        :return: True if the book is in sync
+        """
+        self._loading = False
+        if snapshot is None:
+            return False
+        self.resyncs += 1
+        self.apply_snapshot(snapshot)
+
+        buffered = list(self._buffer)
+        self._buffer.clear()
+        for position, update in enumerate(buffered):
+            if not self._apply(*update):
+                self.synced = False
+                self._buffer.extend(buffered[position:])
+                return False
+        return True
+
+    def best_ask(self) -> Optional[List[str]]:
+        """
+        :return: [price, size] of the lowest ask
+        """
+        return self.asks.best()
+
+    def best_bid(self) -> Optional[List[str]]:
+        """
+        :return: [price, size] of the highest bid
+        """
+        return self.bids.best()
+
+    def to_dict(self, depth: Optional[int] = None) -> dict:
+        """
+        :param depth: number of levels returned for every side, all levels if None
+        :return: order book in format of ExchangeAPI.get_order_book
+        """
+        return {MarketSide.ASK: self.asks.levels(depth), MarketSide.BID: self.bids.levels(depth)}
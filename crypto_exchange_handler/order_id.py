@@ -0,0 +1,62 @@
+"""
+Module contains generator of client order ids. Ids are prefixed with start time
+of the generator and random nonce, so they do not repeat after restart or in
+other processes, and end with 8 hex digits of a counter, so ids of single
+generator are increasing.
+Id is assigned to order once and sent again with every retry of the order,
+which lets exchange reject duplicates of already placed order.
+"""
+
+import itertools
+import os
+import secrets
+import time
+from typing import Callable
+
+DEFAULT_PREFIX = "handler"
+# start time in milliseconds in 11 hex digits lasts until year 2527
+TIME_DIGITS = 11
+NONCE_DIGITS = 6
+
+
+class OrderIdGenerator:
+    """
+    Thread and asyncio safe generator of unique client order ids, i.e.
+    handler_18b9d3f52a1c3e9f04_0000002a (34 characters, within Binance limit of 36).
+    Counter is advanced with itertools.count, which is atomic, so no lock is taken.
+    """
+
+    def __init__(self, prefix: str = DEFAULT_PREFIX, clock: Callable[[], float] = time.time):
+        """
+        :param prefix: text starting every id
+        :param clock: source of time in seconds used for id prefix
+        """
+        self.prefix = prefix
+        self._clock = clock
+        self._head = ""
+        self._counter = itertools.count()
+        self.reseed()
+
+    def reseed(self):
+        """
+        Starts new sequence of ids with current time and fresh nonce.
+        Called automatically in child process after fork.
+        """
+        start = int(self._clock() * 1000)
+        nonce = secrets.randbits(NONCE_DIGITS * 4)
+        self._head = f"{self.prefix}_{start:0{TIME_DIGITS}x}{nonce:0{NONCE_DIGITS}x}_"
+        self._counter = itertools.count()
+
+    def next_id(self) -> str:
+        """
+        :return: new client order id
+        """
+        return f"{self._head}{next(self._counter):08x}"
+
+    __call__ = next_id
+
+
+ORDER_IDS = OrderIdGenerator()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=ORDER_IDS.reseed)
@@ -0,0 +1,139 @@
+"""
+Module contains order requests shared by exchange clients. Orders are validated
+against market metadata before sending, so invalid orders never reach the API.
+"""
+
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .pair import Pair
+from .symbols import SymbolInfo
+
+ORDER_SIDES = ("buy", "sell")
+ORDER_WORKERS = 8
+
+
+class OrderRequest(NamedTuple):
+    """
+    Order to be placed on exchange, limit order if price is set, market order otherwise.
+    Market order is sized either in base currency (size) or in quote currency (amount).
+    """
+    pair: Pair
+    side: str
+    size: Optional[str] = None
+    price: Optional[str] = None
+    amount: Optional[str] = None
+    client_oid: Optional[str] = None
+
+    @property
+    def order_type(self) -> str:
+        """
+        :return: limit or market
+        """
+        return "limit" if self.price is not None else "market"
+
+
+class OrderResult(NamedTuple):
+    """
+    Outcome of single order, order_id is set if exchange accepted the order.
+    """
+    request: OrderRequest
+    order_id: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:  # pylint: disable=invalid-name
+        """
+        :return: True if order has been placed
+        """
+        return self.error is None
+
+
+def _is_multiple(value: Decimal, step: Optional[str]) -> bool:
+    return not step or Decimal(step) == 0 or value % Decimal(step) == 0
+
+
+def _check_market(order: OrderRequest, info: Optional[SymbolInfo]) -> Optional[str]:
+    if info is None:
+        return f"market {order.pair} is not listed"
+    if not info.trading:
+        return f"market {order.pair} is not trading"
+    return None
+
+
+def _check_fields(order: OrderRequest) -> Optional[str]:
+    if order.side not in ORDER_SIDES:
+        return f"invalid side {order.side!r}, use 'buy' or 'sell'"
+    if (order.size is None) == (order.amount is None):
+        return "fill exactly one of size or amount"
+    if order.price is not None and order.size is None:
+        return "limit order requires size"
+    return None
+
+
+def _to_decimal(value: Optional[str]) -> Optional[Decimal]:
+    return Decimal(value) if value is not None else None
+
+
+def _check_size(order: OrderRequest, size: Optional[Decimal], info: SymbolInfo) -> Optional[str]:
+    """
+    Minimum size and lot step filter.
+    """
+    if size is None:
+        return None
+    if info.min_size and size < Decimal(info.min_size):
+        return f"size {order.size} is below minimum {info.min_size}"
+    if not _is_multiple(size, info.lot_size):
+        return f"size {order.size} is not a multiple of {info.lot_size}"
+    return None
+
+
+def _check_price(order: OrderRequest, price: Optional[Decimal], info: SymbolInfo) -> Optional[str]:
+    """
+    Tick size filter.
+    """
+    if price is not None and not _is_multiple(price, info.tick_size):
+        return f"price {order.price} is not a multiple of {info.tick_size}"
+    return None
+
+
+def validate_order(order: OrderRequest, info: Optional[SymbolInfo]) -> Optional[str]:
+    """
+    Checks order against rules of its market.
+
+    :param order: order to check
+    :param info: metadata of the market, None if market is not listed
+    :return: reason of rejection or None if order is valid
+    """
+    error = _check_market(order, info) or _check_fields(order)
+    if error is not None:
+        return error
+
+    try:
+        size, price, amount = (
+            _to_decimal(value) for value in (order.size, order.price, order.amount)
+        )
+        if any(value is not None and not value.is_finite() for value in (size, price, amount)):
+            raise InvalidOperation
+    except InvalidOperation:
+        return "size, price and amount have to be decimal numbers"
+
+    if any(value is not None and value <= 0 for value in (size, price, amount)):
+        return "size, price and amount have to be positive"
+    return _check_size(order, size, info) or _check_price(order, price, info)
+
+
+def chunks(orders: Iterable[OrderRequest], size: int) -> Iterator[Tuple[OrderRequest, ...]]:
+    """
+    :param orders: orders to split
+    :param size: maximal number of orders in a chunk
+    :return: iterator of tuples with at most size orders
+    """
+    chunk: List[OrderRequest] = []
+    for order in orders:
+        chunk.append(order)
+        if len(chunk) == size:
+            yield tuple(chunk)
+            chunk = []
+    if chunk:
+        yield tuple(chunk)
@@ -0,0 +1,111 @@
+"""
+Module contains Pair - normalized market key shared by all exchange clients.
+Pairs are interned, so the same market is always represented by the same
+object carrying precomputed exchange-native spellings of its symbol.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+SEPARATORS = ("-", "/", "_")
+PARSE_CACHE_SIZE = 4096
+
+
+class Pair(str):
+    """
+    Market pair equal to its canonical spelling BASE-QUOTE, i.e. "ADA-BTC".
+    Being a string, Pair can be used as dictionary key interchangeably with
+    canonical spelling. Use Pair.of or Pair.parse instead of the constructor.
+
+    Attributes
+    ----------
+    base : str
+        base currency
+    quote : str
+        quote currency
+    binance : str
+        Binance symbol, i.e. ADABTC
+    kucoin : str
+        Kucoin symbol, i.e. ADA-BTC
+    """
+
+    base: str
+    quote: str
+    binance: str
+    kucoin: str
+
+    _interned: Dict[Tuple[str, str], "Pair"] = {}
+    _parsed: Dict[str, "Pair"] = {}
+    _lock = threading.Lock()
+
+    def __new__(cls, base: str, quote: str):
+        base, quote = base.upper(), quote.upper()
+        pair = super().__new__(cls, f"{base}-{quote}")
+        pair.base = base
+        pair.quote = quote
+        pair.binance = base + quote
+        pair.kucoin = str(pair)
+        return pair
+
+    def __reduce__(self):
+        return Pair.of, (self.base, self.quote)
+
+    def __repr__(self) -> str:
+        return f"Pair({self.base!r}, {self.quote!r})"
+
+    @classmethod
+    def of(cls, base: str, quote: str) -> "Pair":
+        """
+        :param base: base currency in any case
+        :param quote: quote currency in any case
+        :return: interned pair, repeated calls with the same currencies allocate nothing
+        """
+        pair = cls._interned.get((base, quote))
+        if pair is not None:
+            return pair
+        with cls._lock:
+            canonical = cls._interned.get((base.upper(), quote.upper()))
+            if canonical is None:
+                canonical = cls(base, quote)
+                cls._interned[(canonical.base, canonical.quote)] = canonical
+            cls._interned[(base, quote)] = canonical
+        return canonical
+
+    @classmethod
+    def parse(cls, text: str) -> "Pair":
+        """
+        :param text: pair with currencies separated by "-", "/" or "_", i.e. ada/btc
+        :return: interned pair
+        :raises ValueError: if text has no separator, i.e. Binance symbol
+        """
+        if isinstance(text, Pair):
+            return text
+        pair = cls._parsed.get(text)
+        if pair is not None:
+            return pair
+        for separator in SEPARATORS:
+            base, found, quote = text.partition(separator)
+            if found and base and quote:
+                pair = cls.of(base, quote)
+                break
+        else:
+            raise ValueError(f"Can not split {text!r} into base and quote currency")
+        if len(cls._parsed) < PARSE_CACHE_SIZE:
+            cls._parsed[text] = pair
+        return pair
+
+
+def as_pair(coin: Union[str, Pair], quote: Optional[str] = None) -> Pair:
+    """
+    Resolves arguments of client methods, which accept either coin and quote
+    currency or Pair in place of the coin.
+
+    :param coin: base currency or Pair, in which case quote is ignored
+    :param quote: quote currency
+    :return: interned pair
+    """
+    if isinstance(coin, Pair):
+        return coin
+    if quote is None:
+        return Pair.parse(coin)
+    return Pair.of(coin, quote)
@@ -0,0 +1,226 @@
+"""
+Module contains client-side rate limiting primitives used to keep
+request rate of exchange clients below limits of the exchange.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional, Tuple, Union
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Tokens are refilled continuously with given rate
+    and every request consumes its weight in tokens, waiting if bucket is empty.
+
+    Attributes
+    ----------
+    capacity : float
+        maximum number of tokens, defines allowed burst
+    rate : float
+        number of tokens refilled per second
+    """
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Takes tokens from the bucket, allowing it to go into debt.
+
+        :param tokens: weight of the request
+        :return: time in seconds caller has to wait before sending request
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Blocks until requested amount of tokens is available.
+
+        :param tokens: weight of the request
+        :return: time in seconds spent waiting
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def available(self) -> float:
+        """
+        :return: number of tokens available now, negative when bucket is in debt
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def limit_available(self, tokens: float):
+        """
+        Lowers number of available tokens to value reported by the exchange.
+        Tokens are never raised, so local accounting stays on the safe side.
+
+        :param tokens: number of requests weight remaining according to the exchange
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, tokens)
+
+
+Weight = Union[float, Callable[[dict], float]]
+HeadersParser = Callable[[Mapping[str, str], str], Dict[str, float]]
+
+
+class WeightScheduler:  # pylint: disable=too-many-instance-attributes
+    """
+    Rate limiter of single exchange. Every endpoint belongs to a pool of limits
+    (i.e. request weight, orders) with its own token bucket and costs weight
+    published by the exchange. Requests exceeding the limit are delayed until
+    the bucket is refilled. Limit usage reported in response headers lowers
+    local buckets, so the scheduler corrects itself when other processes use
+    the same account.
+
+    Attributes
+    ----------
+    pools : dict
+        token bucket of every pool of limits
+    requests : int
+        number of scheduled requests
+    queued : int
+        number of requests waiting for tokens now
+    max_queued : int
+        the highest number of requests waiting at once
+    wait_time : float
+        total time in seconds spent by requests waiting for tokens
+    max_wait : float
+        the longest wait of single request in seconds
+    """
+
+    def __init__(
+        self,
+        pools: Dict[str, TokenBucket],
+        weights: Dict[str, Tuple[str, Weight]],
+        default: Tuple[str, Weight],
+        headers_parser: Optional[HeadersParser] = None,
+    ):
+        """
+        :param pools: token bucket of every pool of limits
+        :param weights: pool and weight of every endpoint, weight may depend on request params
+        :param default: pool and weight of endpoints missing in weights
+        :param headers_parser: function returning remaining weight of pools from response headers
+        """
+        self.pools = pools
+        self.weights = weights
+        self.default = default
+        self.headers_parser = headers_parser
+        self.requests = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self._lock = threading.Lock()
+
+    def cost(self, endpoint: str, params: Optional[dict] = None) -> Tuple[str, float]:
+        """
+        :param endpoint: endpoint path, i.e. api/v3/depth
+        :param params: request params
+        :return: pool and weight of the request
+        """
+        pool, weight = self.weights.get(endpoint, self.default)
+        if callable(weight):
+            weight = weight(params or {})
+        return pool, weight
+
+    def reserve(self, endpoint: str, params: Optional[dict] = None) -> float:
+        """
+        Takes weight of the request from its pool.
+
+        :return: time in seconds caller has to wait before sending request
+        """
+        pool, weight = self.cost(endpoint, params)
+        delay = self.pools[pool].reserve(weight)
+        with self._lock:
+            self.requests += 1
+            self.wait_time += delay
+            self.max_wait = max(self.max_wait, delay)
+        return delay
+
+    def _enter_queue(self):
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+    def _leave_queue(self):
+        with self._lock:
+            self.queued -= 1
+
+    def acquire(self, endpoint: str, params: Optional[dict] = None) -> float:
+        """
+        Blocks until request can be sent without exceeding the limit.
+
+        :return: time in seconds spent waiting
+        """
+        delay = self.reserve(endpoint, params)
+        if delay > 0:
+            self._enter_queue()
+            try:
+                time.sleep(delay)
+            finally:
+                self._leave_queue()
+        return delay
+
+    async def acquire_async(self, endpoint: str, params: Optional[dict] = None) -> float:
+        """
+        Same as acquire, but waits without blocking the event loop.
+
+        :return: time in seconds spent waiting
+        """
+        delay = self.reserve(endpoint, params)
+        if delay > 0:
+            self._enter_queue()
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._leave_queue()
+        return delay
+
+    def update_from_headers(self, endpoint: str, headers: Mapping[str, str]):
+        """
+        Corrects pools with limit usage reported by the exchange.
+
+        :param endpoint: endpoint path of the request
+        :param headers: response headers
+        """
+        if self.headers_parser is None:
+            return
+        pool, _ = self.cost(endpoint)
+        for name, remaining in self.headers_parser(headers, pool).items():
+            if name in self.pools:
+                self.pools[name].limit_available(remaining)
+
+    def metrics(self) -> dict:
+        """
+        :return: dictionary with request counters, wait times and available tokens of pools
+        """
+        with self._lock:
+            metrics = {
+                "requests": self.requests,
+                "queued": self.queued,
+                "max_queued": self.max_queued,
+                "wait_time": self.wait_time,
+                "max_wait": self.max_wait,
+            }
+        metrics["available"] = {name: bucket.available() for name, bucket in self.pools.items()}
+        return metrics
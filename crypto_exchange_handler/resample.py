@@ -0,0 +1,159 @@
+"""
+Module contains resampling of candles into coarser intervals, i.e. 1min candles
+into 7min, 2hour or 1week ones. Aggregation is vectorized over candle columns,
+files are processed in chunks, so only 1min data have to be downloaded and
+stored, other intervals are derived locally without API requests.
+"""
+
+import csv
+import itertools
+from array import array
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .candle_store import CandleFile, is_candle_file
+from .candles import FIELDS, CandleSeries
+from .indicators import candle_columns
+from .intervals import WEEK, WEEK_ORIGIN, parse_interval
+
+CHUNK_SIZE = 100_000
+
+
+def default_origin(width: int) -> int:
+    """
+    :param width: length of target interval in seconds
+    :return: timestamp of any interval start, Monday for weekly intervals, epoch otherwise
+    """
+    return WEEK_ORIGIN if width % WEEK == 0 else 0
+
+
+def _series(columns: Dict[str, "np.ndarray"]) -> CandleSeries:
+    series = CandleSeries()
+    for field in FIELDS:
+        values = array("d")
+        values.frombytes(np.ascontiguousarray(columns[field], dtype=np.float64).tobytes())
+        setattr(series, field, values)
+    return series
+
+
+def resample(
+    candles: Union[CandleSeries, Iterable[dict]],
+    interval: Union[str, int],
+    origin: Optional[int] = None,
+) -> CandleSeries:
+    """
+    Aggregates candles into candles of coarser interval. Every candle starting
+    in [start, start + interval) belongs to candle starting at start, intervals
+    start at origin + k * interval. The last candle can be still incomplete.
+
+    :param candles: CandleSeries or candle dictionaries in any order
+    :param interval: target interval, i.e. 7min, 2h, 1week or number of seconds
+    :param origin: timestamp of any interval start, see default_origin
+    :return: CandleSeries ordered from the oldest candle
+    :raises ValueError: for monthly interval, months have no fixed length
+    """
+    target = parse_interval(interval)
+    if target.months:
+        raise ValueError(f"Calendar interval {target.name} can not be resampled")
+    width = target.seconds
+    origin = default_origin(width) if origin is None else origin
+    columns = candle_columns(candles)
+    if columns["ts"].size == 0:
+        return CandleSeries()
+    if (np.diff(columns["ts"]) < 0).any():
+        order = np.argsort(columns["ts"], kind="stable")
+        columns = {field: values[order] for field, values in columns.items()}
+
+    buckets = (columns["ts"] - origin) // width
+    starts = np.flatnonzero(np.diff(buckets)) + 1
+    ends = np.append(starts, len(buckets)) - 1
+    starts = np.insert(starts, 0, 0)
+    return _series(
+        {
+            "ts": buckets[starts] * width + origin,
+            "open": columns["open"][starts],
+            "high": np.maximum.reduceat(columns["high"], starts),
+            "low": np.minimum.reduceat(columns["low"], starts),
+            "close": columns["close"][ends],
+        }
+    )
+
+
+def resample_chunks(
+    chunks: Iterable[CandleSeries], interval: Union[str, int], origin: Optional[int] = None
+) -> Iterator[CandleSeries]:
+    """
+    Resamples consecutive chunks of candles sorted from the oldest one. The last
+    aggregated candle of every chunk is held back and merged with the next chunk,
+    so candles spanning chunk boundary are aggregated correctly.
+
+    :param chunks: CandleSeries with consecutive candles
+    :param interval: target interval, i.e. 7min, 2h, 1week or number of seconds
+    :param origin: timestamp of any interval start, see default_origin
+    :return: iterator of resampled CandleSeries
+    """
+    carry: Optional[CandleSeries] = None
+    for chunk in chunks:
+        if not chunk:
+            continue
+        ts = np.frombuffer(chunk.ts, dtype=np.float64)
+        if (np.diff(ts) < 0).any() or (carry is not None and ts[0] < carry.ts[0]):
+            raise ValueError("Candles have to be sorted from the oldest one")
+        if carry is not None:
+            carry.extend(chunk)
+            chunk = carry
+        resampled = resample(chunk, interval, origin)
+        if len(resampled) > 1:
+            yield resampled[:-1]
+        carry = resampled[-1:]
+    if carry is not None:
+        yield carry
+
+
+def read_chunks(file: str, chunk_size: int = CHUNK_SIZE) -> Iterator[CandleSeries]:
+    """
+    Reads .candles or .csv file created by dump_market_data_to_file in chunks,
+    without loading the whole file.
+
+    :param file: path to the file
+    :param chunk_size: number of candles in a chunk
+    :return: iterator of CandleSeries
+    """
+    if is_candle_file(file):
+        with CandleFile(file) as candle_file:
+            for first in range(0, len(candle_file), chunk_size):
+                yield candle_file.series(first, first + chunk_size)
+        return
+
+    with open(file, encoding="utf-8") as csv_file:
+        reader = csv.reader(csv_file, delimiter=",")
+        header = next(reader, FIELDS)
+        columns = tuple(header.index(field) for field in FIELDS)
+        while True:
+            rows = list(itertools.islice(reader, chunk_size))
+            if not rows:
+                return
+            yield CandleSeries.from_klines(rows, columns=columns)
+
+
+def resample_file(
+    file: str,
+    interval: Union[str, int],
+    chunk_size: int = CHUNK_SIZE,
+    origin: Optional[int] = None,
+) -> Iterator[CandleSeries]:
+    """
+    Resamples candles stored in .candles or .csv file, holding in memory only
+    a chunk of source candles at once.
+
+    :param file: path to file with candles sorted from the oldest one
+    :param interval: target interval, i.e. 7min, 2h, 1week or number of seconds
+    :param chunk_size: number of source candles read at once
+    :param origin: timestamp of any interval start, see default_origin
+    :return: iterator of resampled CandleSeries
+    """
+    return resample_chunks(read_chunks(file, chunk_size), interval, origin)
@@ -0,0 +1,480 @@
+"""
+Module contains retry policy shared by exchange clients. Failed requests are
+repeated with exponential backoff and jitter, while circuit breakers of single
+endpoints and retry budget keep failing exchange from being flooded by retries.
+"""
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import requests
+
+RETRY_STATUS_CODES = frozenset((418, 429, 500, 502, 503, 504))
+# request was rejected before processing, so it is safe to repeat any method
+REJECTED_STATUS_CODES = frozenset((418, 429))
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 0.25
+DEFAULT_MAX_DELAY = 10.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+
+class RetryableError(Exception):
+    """
+    Transient failure raised by clients for responses worth repeating, i.e. 429 or 503.
+
+    Attributes
+    ----------
+    retry_after : float
+        delay in seconds requested by the exchange, None if not given
+    result : Any
+        decoded body of the failed response, returned when retries are exhausted
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, result: Any = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.result = result
+
+
+class TransportError(Exception):
+    """
+    Connection failure or timeout raised by asyncio clients in place of aiohttp
+    exceptions, so they are classified like requests exceptions.
+
+    Attributes
+    ----------
+    method : str
+        upper case method of the failed request
+    connect_failed : bool
+        True if connection was not established, so request was not sent
+    """
+
+    def __init__(self, method: str, error: BaseException, connect_failed: bool = False):
+        super().__init__(f"{method.upper()} request failed: {error!r}")
+        self.method = method.upper()
+        self.connect_failed = connect_failed
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending request to endpoint which keeps failing.
+    """
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit of {endpoint} is open, next try in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def is_retryable_status(status: int, method: str = "GET") -> bool:
+    """
+    Server errors are repeated only for GET requests, because other requests,
+    i.e. orders, may have been executed before the error was returned.
+
+    :param status: HTTP status code of the response
+    :param method: HTTP method of the request
+    :return: True if request can be repeated
+    """
+    if status in REJECTED_STATUS_CODES:
+        return True
+    return status in RETRY_STATUS_CODES and method.upper() == "GET"
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    :param headers: response headers
+    :return: delay in seconds from Retry-After header or None if it is missing
+    """
+    value = headers.get("Retry-After") if headers is not None else None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+def is_transient(exception: BaseException) -> bool:
+    """
+    Default classification of failures. Connection and read errors are repeated
+    only for GET requests, failed connection attempt for any request.
+
+    :param exception: exception raised by request
+    :return: True if request can be repeated
+    """
+    if isinstance(exception, RetryableError):
+        return True
+    if isinstance(exception, TransportError):
+        return exception.connect_failed or exception.method == "GET"
+    if isinstance(exception, requests.ConnectTimeout):
+        return True
+    if isinstance(exception, (requests.ConnectionError, requests.Timeout)):
+        request = exception.request
+        return request is not None and request.method == "GET"
+    return False
+
+
+def is_server_failure(exception: BaseException) -> bool:
+    """
+    Failures showing that endpoint does not work, counted by circuit breaker even when
+    request is not repeated, i.e. server error or timeout of POST request.
+
+    :param exception: exception raised by request
+    :return: True for server errors, connection failures and timeouts
+    """
+    if isinstance(exception, (RetryableError, TransportError)):
+        return True
+    if isinstance(exception, (requests.ConnectionError, requests.Timeout)):
+        return True
+    status = getattr(exception, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exception, "response", None), "status_code", None)
+    return isinstance(status, int) and status >= 500
+
+
+def retry_after_of(exception: BaseException) -> Optional[float]:
+    """
+    :param exception: exception raised by request
+    :return: delay requested by the exchange or None if not given
+    """
+    if isinstance(exception, RetryableError):
+        return exception.retry_after
+    response = getattr(exception, "response", None)
+    return parse_retry_after(getattr(response, "headers", None))
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker of single endpoint. After `failure_threshold`
+    consecutive failures the circuit opens and requests fail immediately.
+    When `reset_timeout` passes, single trial request is let through and its
+    result closes the circuit again or keeps it open for another period.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        :return: "closed", "open" or "half-open"
+        """
+        with self._lock:
+            if self._opened is None:
+                return "closed"
+            if self._trial or time.monotonic() - self._opened >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> float:
+        """
+        Admits request, starting the trial when circuit is ready for it.
+
+        :return: 0 if request can be sent, otherwise time in seconds until the next trial
+        """
+        with self._lock:
+            if self._opened is None:
+                return 0.0
+            remaining = self._opened + self.reset_timeout - time.monotonic()
+            if self._trial or remaining > 0:
+                return max(remaining, 0.0) or self.reset_timeout
+            self._trial = True
+            return 0.0
+
+    def record_success(self):
+        """
+        Closes the circuit.
+        """
+        with self._lock:
+            self.failures = 0
+            self._opened = None
+            self._trial = False
+
+    def release(self):
+        """
+        Ends trial which finished without result, i.e. cancelled call,
+        so the next request can try the endpoint again.
+        """
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self) -> bool:
+        """
+        Counts failure, opens the circuit on threshold or failed trial.
+
+        :return: True if the circuit is open
+        """
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self._opened = time.monotonic()
+                self._trial = False
+            return self._opened is not None
+
+
+def _release_interrupted(breaker: CircuitBreaker, exception: BaseException):
+    """
+    Cancelled or interrupted call, i.e. CancelledError or KeyboardInterrupt, says
+    nothing about the endpoint, but it must not keep the trial of breaker forever.
+    Exceptions raised by requests are already recorded by the retry loop.
+    """
+    if not isinstance(exception, Exception):
+        breaker.release()
+
+
+class RetryBudget:
+    """
+    Thread-safe limit of retries relative to the number of requests. Every
+    request deposits `ratio` token and every retry withdraws one, so during
+    an outage retries add at most `ratio` of regular traffic.
+    """
+
+    def __init__(self, ratio: float = 0.2, capacity: float = 10.0):
+        """
+        :param ratio: retries allowed per request
+        :param capacity: maximal number of saved retries, the budget starts full
+        """
+        self.ratio = ratio
+        self.capacity = capacity
+        self._tokens = capacity
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """
+        Registers request.
+        """
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        :return: True if retry fits into the budget
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def available(self) -> float:
+        """
+        :return: number of retries available now
+        """
+        with self._lock:
+            return self._tokens
+
+
+class RetryPolicy:  # pylint: disable=too-many-instance-attributes
+    """
+    Repeats failed requests with exponential backoff and full jitter, so clients
+    failing together do not retry in lockstep. Delay requested by the exchange
+    is honored, unless it is longer than `max_delay`, in which case the error
+    is raised at once instead of blocking the caller.
+
+    Attributes
+    ----------
+    calls : int
+        number of calls
+    retries : int
+        number of repeated requests
+    failures : int
+        number of calls which failed after retries
+    rejected : int
+        number of calls rejected by open circuit
+    retry_wait : float
+        total time in seconds spent waiting between attempts
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        is_retryable: Callable[[BaseException], bool] = is_transient,
+        retry_after: Callable[[BaseException], Optional[float]] = retry_after_of,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        budget: Optional[RetryBudget] = None,
+    ):
+        """
+        :param max_attempts: maximal number of attempts of single call
+        :param base_delay: delay in seconds before the first retry, doubled with every attempt
+        :param max_delay: maximal delay in seconds between attempts
+        :param is_retryable: function classifying exceptions worth repeating
+        :param retry_after: function returning delay requested by the exchange
+        :param failure_threshold: consecutive failures opening circuit of endpoint
+        :param reset_timeout: time in seconds after which open circuit lets trial request
+        :param budget: retry budget shared by all endpoints
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.is_retryable = is_retryable
+        self.retry_after = retry_after
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.budget = budget if budget is not None else RetryBudget()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+        self.retry_wait = 0.0
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """
+        :return: circuit breaker of endpoint, created on first use
+        """
+        with self._lock:
+            breaker = self.breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self.breakers[endpoint] = breaker
+            return breaker
+
+    def backoff(self, attempt: int) -> float:
+        """
+        :param attempt: number of failed attempts minus one
+        :return: random delay between 0 and exponentially growing cap
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def delay(self, attempt: int, exception: BaseException) -> Optional[float]:
+        """
+        :param attempt: number of failed attempts minus one
+        :param exception: exception raised by the last attempt
+        :return: delay before the next attempt or None if request should not be repeated
+        """
+        requested = self.retry_after(exception)
+        if requested is None:
+            return self.backoff(attempt)
+        if requested > self.max_delay:
+            return None
+        return requested
+
+    def _start(self, endpoint: str) -> CircuitBreaker:
+        breaker = self.breaker(endpoint)
+        retry_in = breaker.allow()
+        with self._lock:
+            if retry_in > 0:
+                self.rejected += 1
+                raise CircuitOpenError(endpoint, retry_in)
+            self.calls += 1
+        self.budget.deposit()
+        return breaker
+
+    def _on_error(
+        self, breaker: CircuitBreaker, attempt: int, exception: BaseException
+    ) -> Optional[float]:
+        if not self.is_retryable(exception):
+            if is_server_failure(exception):
+                breaker.record_failure()
+            else:
+                # exchange answered, the endpoint itself works
+                breaker.record_success()
+            return None
+
+        delay = None
+        if not breaker.record_failure() and attempt + 1 < self.max_attempts:
+            delay = self.delay(attempt, exception)
+            if delay is not None and not self.budget.withdraw():
+                delay = None
+
+        with self._lock:
+            if delay is None:
+                self.failures += 1
+            else:
+                self.retries += 1
+                self.retry_wait += delay
+        return delay
+
+    def call(self, endpoint: str, func: Callable, *args, **kwargs):
+        """
+        Calls function, repeating it while it raises retryable exceptions.
+
+        :param endpoint: name of endpoint, every endpoint has its own circuit breaker
+        :param func: function sending the request
+        :return: result of the function
+        :raises CircuitOpenError: if endpoint keeps failing
+        """
+        breaker = self._start(endpoint)
+        attempt = 0
+        try:
+            while True:
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as exception:  # pylint: disable=broad-except
+                    delay = self._on_error(breaker, attempt, exception)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                breaker.record_success()
+                return result
+        except BaseException as exception:
+            _release_interrupted(breaker, exception)
+            raise
+
+    async def call_async(self, endpoint: str, func: Callable, *args, **kwargs):
+        """
+        Same as call, but awaits coroutine function and waits without blocking the event loop.
+        """
+        breaker = self._start(endpoint)
+        attempt = 0
+        try:
+            while True:
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as exception:  # pylint: disable=broad-except
+                    delay = self._on_error(breaker, attempt, exception)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+                breaker.record_success()
+                return result
+        except BaseException as exception:
+            _release_interrupted(breaker, exception)
+            raise
+
+    def metrics(self) -> dict:
+        """
+        :return: dictionary with call counters, retry wait time, budget and open circuits
+        """
+        with self._lock:
+            metrics = {
+                "calls": self.calls,
+                "retries": self.retries,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "retry_wait": self.retry_wait,
+            }
+            breakers = dict(self.breakers)
+        metrics["budget"] = self.budget.available()
+        metrics["open"] = sorted(
+            endpoint for endpoint, breaker in breakers.items() if breaker.state != "closed"
+        )
+        return metrics
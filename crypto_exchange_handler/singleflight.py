@@ -0,0 +1,245 @@
+"""
+Module contains request coalescing of exchange clients. Concurrent identical
+calls of public data methods share a single request in flight and its result,
+which can be reused for a short freshness window configured per method.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def freeze(value: Any) -> Hashable:
+    """
+    Converts argument into hashable value, equal arguments give equal values.
+    Arguments which can not be compared, i.e. generators, give unique values.
+
+    :param value: argument of the call
+    :return: hashable representation of the argument
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    try:
+        hash(value)
+    except TypeError:
+        return object()
+    return value
+
+
+def call_key(args: tuple, kwargs: dict) -> Hashable:
+    """
+    :return: key identifying call with given arguments
+    """
+    return freeze(args), tuple(sorted((name, freeze(value)) for name, value in kwargs.items()))
+
+
+class _Flight:  # pylint: disable=too-few-public-methods
+    __slots__ = ("event", "result", "error", "done_at")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.done_at: Optional[float] = None
+
+
+class SingleFlight:
+    """
+    Thread-safe coalescing of identical calls. The first caller executes the
+    function, callers arriving while it runs wait for it and receive the same
+    result or exception. Results are shared, so callers must not modify them.
+    Expired results are evicted whenever a new call starts.
+
+    Attributes
+    ----------
+    windows : dict
+        method name - time in seconds for which completed result is reused,
+        methods missing in dictionary share only calls in flight
+    calls : int
+        number of calls
+    executions : int
+        number of calls which executed the function
+    """
+
+    def __init__(self, windows: Optional[Dict[str, float]] = None):
+        """
+        :param windows: freshness window in seconds of every method
+        """
+        self.windows = dict(windows or {})
+        self.calls = 0
+        self.executions = 0
+        self._flights: Dict[Tuple[str, Hashable], _Flight] = {}
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, method: str, flight: _Flight, now: float) -> bool:
+        if flight.done_at is None:
+            return True
+        return now - flight.done_at < self.windows.get(method, 0.0)
+
+    def _evict_expired(self, now: float):
+        """
+        Drops completed flights older than window of their method, so results of
+        calls which are never repeated do not stay in memory. Called with lock held
+        whenever a new flight starts.
+        """
+        expired = [
+            flight_key for flight_key, flight in self._flights.items()
+            if not self._is_fresh(flight_key[0], flight, now)
+        ]
+        for flight_key in expired:
+            del self._flights[flight_key]
+
+    def do(self, method: str, key: Hashable, func: Callable, *args, **kwargs):
+        """
+        Calls function or joins identical call in flight.
+
+        :param method: name of the method, selects freshness window
+        :param key: hashable identification of call arguments
+        :param func: function to call
+        :return: result of the function
+        """
+        flight_key = (method, key)
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(flight_key)
+            now = time.monotonic()
+            leader = flight is None or not self._is_fresh(method, flight, now)
+            if leader:
+                self._evict_expired(now)
+                self.executions += 1
+                flight = _Flight()
+                self._flights[flight_key] = flight
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func(*args, **kwargs)
+            return flight.result
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                flight.done_at = time.monotonic()
+                if flight.error is not None or flight.result is None or (
+                        self.windows.get(method, 0.0) <= 0):
+                    if self._flights.get(flight_key) is flight:
+                        del self._flights[flight_key]
+            flight.event.set()
+
+    def clear(self):
+        """
+        Forgets completed results, calls in flight are not affected.
+        """
+        with self._lock:
+            self._flights = {
+                key: flight for key, flight in self._flights.items() if flight.done_at is None
+            }
+
+
+class AsyncSingleFlight:
+    """
+    Coalescing of identical coroutine calls within event loop. The first caller
+    starts a task, others await the same task. Cancelling one of the waiting
+    callers does not cancel the shared task. Results are evicted when their window ends.
+
+    Attributes
+    ----------
+    windows : dict
+        method name - time in seconds for which completed result is reused
+    calls : int
+        number of calls
+    executions : int
+        number of calls which started the task
+    """
+
+    def __init__(self, windows: Optional[Dict[str, float]] = None):
+        """
+        :param windows: freshness window in seconds of every method
+        """
+        self.windows = dict(windows or {})
+        self.calls = 0
+        self.executions = 0
+        self._flights: Dict[Tuple[str, Hashable], Tuple[asyncio.Future, list]] = {}
+
+    def _evict(self, flight_key: Tuple[str, Hashable], task: asyncio.Future):
+        if self._flights.get(flight_key, (None,))[0] is task:
+            del self._flights[flight_key]
+
+    def _finish(self, flight_key: Tuple[str, Hashable], task: asyncio.Future, done_at: list):
+        done_at.append(time.monotonic())
+        window = self.windows.get(flight_key[0], 0.0)
+        failed = task.cancelled() or task.exception() is not None or task.result() is None
+        if failed or window <= 0:
+            self._evict(flight_key, task)
+        else:
+            # result expires with its window, drop it then unless a newer call replaced it
+            task.get_loop().call_later(window, self._evict, flight_key, task)
+
+    async def do(self, method: str, key: Hashable, func: Callable, *args, **kwargs):
+        """
+        Awaits coroutine function or joins identical call in flight.
+
+        :param method: name of the method, selects freshness window
+        :param key: hashable identification of call arguments
+        :param func: coroutine function to call
+        :return: result of the coroutine
+        """
+        self.calls += 1
+        flight_key = (method, key)
+        flight = self._flights.get(flight_key)
+        if flight is not None:
+            task, done_at = flight
+            if not done_at:
+                return await asyncio.shield(task)
+            if time.monotonic() - done_at[0] < self.windows.get(method, 0.0):
+                return task.result()
+
+        self.executions += 1
+        task = asyncio.ensure_future(func(*args, **kwargs))
+        done_at: list = []
+        self._flights[flight_key] = (task, done_at)
+        task.add_done_callback(lambda _: self._finish(flight_key, task, done_at))
+        return await asyncio.shield(task)
+
+    def clear(self):
+        """
+        Forgets completed results, calls in flight are not affected.
+        """
+        self._flights = {
+            key: flight for key, flight in self._flights.items() if not flight[0].done()
+        }
+
+
+def coalesce(method: Callable) -> Callable:
+    """
+    Decorator of client methods returning public market data. Concurrent calls
+    with equal arguments are coalesced by `flights` attribute of the client,
+    SingleFlight for regular methods and AsyncSingleFlight for coroutines.
+    """
+    name = method.__name__
+
+    if asyncio.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            key = call_key(args, kwargs)
+            return await self.flights.do(name, key, method, self, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self.flights.do(name, call_key(args, kwargs), method, self, *args, **kwargs)
+
+    return wrapper
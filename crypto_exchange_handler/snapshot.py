@@ -0,0 +1,118 @@
+"""
+Module contains Snapshot - thread-safe holder of data downloaded from exchange,
+reused until its time to live expires, and AsyncSnapshot loading it by coroutine.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Snapshot(Generic[T]):
+    """
+    Lazily loaded value with time to live. Concurrent callers of expired snapshot
+    wait for a single load instead of downloading the same data in parallel.
+
+    Attributes
+    ----------
+    ttl : float
+        time in seconds after which value is loaded again
+    loads : int
+        number of times loader has been called
+    """
+
+    def __init__(self, loader: Callable[[], Optional[T]], ttl: float):
+        """
+        :param loader: function downloading fresh value, None result is not cached
+        :param ttl: time in seconds after which value is loaded again
+        """
+        self.ttl = ttl
+        self.loads = 0
+        self._loader = loader
+        self._value: Optional[T] = None
+        self._updated = 0.0
+        self._lock = threading.RLock()
+
+    def is_fresh(self) -> bool:
+        """
+        :return: True if value is loaded and its time to live has not expired
+        """
+        return self._value is not None and time.monotonic() - self._updated < self.ttl
+
+    def get(self) -> Optional[T]:
+        """
+        :return: cached value, loaded again if it has expired, None if the load failed;
+            expired value is never returned, so failure is not hidden by stale data
+        """
+        with self._lock:
+            if self.is_fresh():
+                return self._value
+            self.loads += 1
+            value = self._loader()
+            if value is not None:
+                self.set(value)
+            return value
+
+    def set(self, value: T):
+        """
+        Replaces value with data received from other source i.e. websocket.
+        """
+        with self._lock:
+            self._value = value
+            self._updated = time.monotonic()
+
+    def update(self, func: Callable[[T], None]) -> bool:
+        """
+        Modifies loaded value in place, i.e. with change pushed by exchange,
+        and restarts its time to live.
+
+        :param func: function modifying the value
+        :return: False if value has not been loaded yet
+        """
+        with self._lock:
+            if self._value is None:
+                return False
+            func(self._value)
+            self._updated = time.monotonic()
+            return True
+
+    def invalidate(self):
+        """
+        Forces loading fresh value on the next get.
+        """
+        with self._lock:
+            self._updated = 0.0
+            self._value = None
+
+
+class AsyncSnapshot(Snapshot[T]):
+    """
+    Snapshot of asyncio clients, value is loaded by coroutine. Concurrent
+    coroutines getting expired snapshot await a single load.
+    """
+
+    def __init__(self, loader: Callable[[], Awaitable[Optional[T]]], ttl: float):
+        """
+        :param loader: coroutine function downloading fresh value, None result is not cached
+        :param ttl: time in seconds after which value is loaded again
+        """
+        super().__init__(loader, ttl)
+        self._load_lock: Optional[asyncio.Lock] = None
+
+    async def get(self) -> Optional[T]:  # pylint: disable=invalid-overridden-method
+        """
+        :return: cached value, loaded again if it has expired, None if the load failed
+        """
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if self.is_fresh():
+                return self._value
+            self.loads += 1
+            value = await self._loader()
+            if value is not None:
+                self.set(value)
+            return value
@@ -0,0 +1,674 @@
+"""
+Module contains WebSocket market data streams of Binance and Kucoin.
+Stream subscribes to ticker, order book and candle channels, keeps the latest
+state in memory and serves reads compatible with exchange clients, so prices
+are not polled with REST requests. Account streams push balance changes into
+balances cached by exchange clients.
+"""
+# pylint: disable=duplicate-code
+import asyncio
+import functools
+import json
+import threading
+import time
+import uuid
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import aiohttp
+import requests
+import websockets
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+
+from .binance import Binance, parse_klines
+from .candles import CandleSeries
+from .exchange_template import ExchangeAPI, MarketSide, to_quotes
+from .kucoin import Kucoin, is_response_valid, parse_candles
+from .numeric_book import NumericOrderBook
+from .order_book import OrderBook
+from .pair import Pair, as_pair
+
+BINANCE_STREAM_URL = "wss://stream.binance.com:9443"
+KUCOIN_API_URL = "https://api.kucoin.com"
+BINANCE_DEPTH_LEVELS = 20
+MAX_CANDLES = 1000
+RECONNECT_DELAY = 1.0
+LISTEN_KEY_KEEP_ALIVE = 1800.0
+
+
+class Channel(Enum):
+    """
+    Market data channels available in streams.
+    """
+    TICKER = "ticker"
+    DEPTH = "depth"
+    DIFF = "diff"
+    CANDLES = "candles"
+
+
+SnapshotLoader = Callable[[str, str], Optional[dict]]
+
+
+class MarketState:
+    """
+    Thread-safe latest market data received from stream.
+    Every market is keyed by pair in format ADA-BTC.
+
+    Attributes
+    ----------
+    updates : int
+        number of market data messages applied to the state
+    """
+
+    def __init__(self, max_candles: int = MAX_CANDLES):
+        """
+        :param max_candles: number of newest candles kept for every pair and interval
+        """
+        self.updates = 0
+        self.max_candles = max_candles
+        self._tickers: Dict[str, Dict[MarketSide, str]] = {}
+        self._order_books: Dict[str, dict] = {}
+        self._books: Dict[str, OrderBook] = {}
+        self._candles: Dict[Tuple[str, str], Dict[int, dict]] = {}
+        self._condition = threading.Condition()
+
+    def _updated(self):
+        self.updates += 1
+        self._condition.notify_all()
+
+    def record_update(self):
+        """
+        Counts update applied outside of the state, i.e. to account balances.
+        """
+        with self._condition:
+            self._updated()
+
+    def update_ticker(self, pair: str, ask: str, bid: str, latest: str):
+        """
+        Replaces best prices of the pair.
+        """
+        with self._condition:
+            self._tickers[pair] = {
+                MarketSide.ASK: ask, MarketSide.BID: bid, MarketSide.LATEST: latest
+            }
+            self._updated()
+
+    def update_order_book(self, pair: str, asks: list, bids: list):
+        """
+        Replaces order book of the pair with levels received from stream.
+        """
+        with self._condition:
+            self._order_books[pair] = {MarketSide.ASK: asks, MarketSide.BID: bids}
+            self._updated()
+
+    def update_order_book_diff(
+        self, pair: str, sequence: Tuple[int, int], bids: list, asks: list
+    ) -> bool:
+        """
+        Applies sequenced diff update to local order book of the pair. Updates which
+        do not continue the book are buffered until snapshot is applied.
+
+        :param sequence: sequence numbers of the first and the last change in update
+        :return: True if snapshot of the pair should be loaded and passed to
+            apply_order_book_snapshot
+        """
+        with self._condition:
+            book = self._books.get(pair)
+            if book is None:
+                book = self._books[pair] = OrderBook()
+            synced = book.update(sequence[0], sequence[1], bids, asks)
+            self._updated()
+            return not synced and book.start_resync()
+
+    def apply_order_book_snapshot(self, pair: str, snapshot: Optional[dict]) -> bool:
+        """
+        Applies snapshot requested by update_order_book_diff and replays buffered
+        updates newer than the snapshot.
+
+        :param snapshot: order book snapshot or None if loading failed
+        :return: True if the book is in sync
+        """
+        with self._condition:
+            synced = self._books[pair].finish_resync(snapshot)
+            self._updated()
+            return synced
+
+    def update_candle(self, pair: str, interval: str, candle: dict):
+        """
+        Adds new candle or replaces still open candle with the same open time.
+        """
+        with self._condition:
+            candles = self._candles.setdefault((pair, interval), {})
+            candles[candle["ts"]] = candle
+            while len(candles) > self.max_candles:
+                del candles[min(candles)]
+            self._updated()
+
+    def price(self, pair: str, price_type: MarketSide) -> Optional[str]:
+        """
+        :return: price of the pair or None if ticker has not been received yet
+        """
+        with self._condition:
+            ticker = self._tickers.get(pair)
+            return ticker[price_type] if ticker is not None else None
+
+    def order_book(self, pair: str) -> Optional[dict]:
+        """
+        :return: order book of the pair or None if it has not been received yet
+        """
+        with self._condition:
+            book = self._books.get(pair)
+            if book is not None:
+                return book.to_dict() if book.synced else None
+            return self._order_books.get(pair)
+
+    def candles(self, pair: str, interval: str) -> Tuple[dict, ...]:
+        """
+        :return: received candles of the pair, the newest one first
+        """
+        with self._condition:
+            candles = self._candles.get((pair, interval), {})
+            return tuple(candles[ts] for ts in sorted(candles, reverse=True))
+
+    def wait_for_updates(self, count: int, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until given number of updates has been applied.
+
+        :param count: expected total number of updates
+        :param timeout: maximum time of waiting in seconds
+        :return: True if updates arrived before timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self.updates >= count, timeout)
+
+
+class MarketStream:  # pylint: disable=too-many-instance-attributes
+    """
+    A base class for exchange market data streams. Stream runs on asyncio,
+    either awaited with run() or in a background thread with start() and stop().
+    Connection is reopened after it has been lost.
+
+    Attributes
+    ----------
+    state : MarketState
+        latest market data received from stream
+    connections : int
+        number of opened WebSocket connections
+    """
+
+    def __init__(
+        self,
+        name: str,
+        reconnect_delay: float = RECONNECT_DELAY,
+        snapshot_loader: Optional[SnapshotLoader] = None,
+    ):
+        """
+        :param name: exchange name used in error messages
+        :param reconnect_delay: time in seconds between connection attempts
+        :param snapshot_loader: function returning order book snapshot for coin and quote,
+            i.e. ExchangeAPI.get_order_book_snapshot, required by Channel.DIFF
+        """
+        self.name = name
+        self.reconnect_delay = reconnect_delay
+        self.snapshot_loader = snapshot_loader
+        self.state = MarketState()
+        self.connections = 0
+        self.subscriptions: List[Tuple[Channel, str, Optional[str]]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._started = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._snapshot_tasks: set = set()
+
+    def subscribe(
+        self, channel: Channel, coin: str, quote: str, interval: Optional[str] = None
+    ) -> "MarketStream":
+        """
+        Adds channel of the pair to subscriptions sent after connecting.
+
+        :param channel: market data channel
+        :param coin: currency to trade
+        :param quote: quote currency
+        :param interval: candle interval in exchange format, required by Channel.CANDLES
+        :return: stream itself, so subscriptions can be chained
+        """
+        if channel == Channel.CANDLES and interval is None:
+            print(f"ERROR: {self.name} stream - Candles channel requires interval")
+            return self
+        if channel == Channel.DIFF and self.snapshot_loader is None:
+            print(f"ERROR: {self.name} stream - Diff channel requires snapshot loader")
+            return self
+        self.subscriptions.append((channel, as_pair(coin, quote), interval))
+        return self
+
+    async def _connect_url(self) -> Optional[str]:
+        """
+        :return: address of WebSocket endpoint or None in case of error
+        """
+        raise NotImplementedError
+
+    def _subscribe_messages(self) -> List[dict]:
+        """
+        :return: messages sent right after connecting
+        """
+        return []
+
+    async def _keep_alive(self, websocket):
+        """
+        Keeps connection open until it is closed, exchanges expecting
+        application level pings send them here.
+        """
+        await websocket.wait_closed()
+
+    def _handle(self, message: dict):
+        """
+        Applies single stream message to the state.
+        """
+        raise NotImplementedError
+
+    def _update_diff(self, pair: str, sequence: Tuple[int, int], bids: list, asks: list):
+        """
+        Applies diff update, snapshot is loaded in background when the book is out of sync.
+        """
+        if self.state.update_order_book_diff(pair, sequence, bids, asks):
+            task = asyncio.ensure_future(self._load_snapshot(pair))
+            self._snapshot_tasks.add(task)
+            task.add_done_callback(self._snapshot_tasks.discard)
+
+    async def _load_snapshot(self, pair: str):
+        """
+        Loads order book snapshot in executor, so blocking REST request does not stop
+        receiving messages, and applies it to the state.
+        """
+        snapshot = None
+        try:
+            snapshot = await asyncio.get_running_loop().run_in_executor(
+                None, self.snapshot_loader, *pair.split("-")
+            )
+        finally:
+            self.state.apply_order_book_snapshot(pair, snapshot)
+
+    async def _receive(self, websocket):
+        async for raw_message in websocket:
+            try:
+                self._handle(json.loads(raw_message))
+            except (KeyError, IndexError, TypeError, ValueError) as error:
+                print(f"ERROR: {self.name} stream - Invalid message: {error!r}")
+
+    async def _listen(self, websocket):
+        for message in self._subscribe_messages():
+            await websocket.send(json.dumps(message))
+        tasks = [
+            asyncio.ensure_future(self._receive(websocket)),
+            asyncio.ensure_future(self._keep_alive(websocket)),
+            asyncio.ensure_future(self._stopped.wait()),
+        ]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()
+
+    async def run(self):
+        """
+        Receives market data until stop is called.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._started.set()
+        while not self._stopped.is_set():
+            try:
+                url = await self._connect_url()
+                if url is not None:
+                    async with websockets.connect(url) as websocket:
+                        self.connections += 1
+                        await self._listen(websocket)
+            except (OSError, asyncio.TimeoutError, aiohttp.ClientError,
+                    websockets.exceptions.WebSocketException) as error:
+                print(f"ERROR: {self.name} stream - Connection failed: {error!r}")
+            try:
+                await asyncio.wait_for(self._stopped.wait(), self.reconnect_delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """
+        Runs stream in a background thread.
+        """
+        if self._thread is not None:
+            return
+        self._started.clear()
+        self._thread = threading.Thread(target=asyncio.run, args=(self.run(),), daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Closes connection and stops stream.
+
+        :param timeout: maximum time in seconds spent waiting for background thread
+        """
+        if not self._started.wait(timeout):
+            return
+        self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_coin_price(
+        self, coin: str, quote: str = "BTC", price_type: MarketSide = MarketSide.ASK
+    ) -> Optional[str]:
+        """
+        Same as ExchangeAPI.get_coin_price, served from the stream state.
+        """
+        pair = as_pair(coin, quote)
+        price = self.state.price(pair, price_type)
+        if price is None:
+            print(f"ERROR: {self.name} stream - No ticker of {pair}")
+        return price
+
+    def get_coins_prices(
+        self,
+        coins: Iterable[str],
+        quote: Union[str, Iterable[str]] = "BTC",
+        price_type: MarketSide = MarketSide.ASK,
+    ) -> dict:
+        """
+        Same as ExchangeAPI.get_coins_prices, served from the stream state.
+        Pairs without received ticker are skipped.
+        """
+        prices = {}
+        for pair in (Pair.of(coin, item) for coin in coins for item in to_quotes(quote)):
+            price = self.state.price(pair, price_type)
+            if price is not None:
+                prices[pair] = price
+        return prices
+
+    def get_order_book(
+        self, coin: str, quote: str, numeric: bool = False
+    ) -> Optional[Union[dict, NumericOrderBook]]:
+        """
+        Same as ExchangeAPI.get_order_book, served from the stream state.
+        """
+        pair = as_pair(coin, quote)
+        order_book = self.state.order_book(pair)
+        if order_book is None:
+            print(f"ERROR: {self.name} stream - No order book of {pair}")
+            return None
+        return NumericOrderBook.from_dict(order_book) if numeric else order_book
+
+    def get_last_candles(  # pylint: disable=too-many-arguments
+        self, coin: str, quote: str, interval: str, count: int, as_series: bool = False
+    ) -> Union[tuple, CandleSeries]:
+        """
+        Same as ExchangeAPI.get_last_candles, served from the stream state.
+        Only candles received since subscribing are available.
+        """
+        candles = self.state.candles(as_pair(coin, quote), interval)[:count]
+        if as_series:
+            return CandleSeries.from_dicts(candles)
+        return candles
+
+
+class BinanceStream(MarketStream):
+    """
+    Binance market data received from combined streams.
+    """
+
+    def __init__(
+        self,
+        url: str = BINANCE_STREAM_URL,
+        reconnect_delay: float = RECONNECT_DELAY,
+        snapshot_loader: Optional[SnapshotLoader] = None,
+    ):
+        """
+        :param url: address of Binance WebSocket server
+        """
+        super().__init__("binance", reconnect_delay, snapshot_loader)
+        self.url = url
+        self._pairs: Dict[str, str] = {}
+
+    def stream_name(self, channel: Channel, pair: str, interval: Optional[str] = None) -> str:
+        """
+        :return: name of Binance stream of the pair
+        """
+        symbol = as_pair(pair).binance.lower()
+        self._pairs[symbol] = pair
+        if channel == Channel.TICKER:
+            return f"{symbol}@ticker"
+        if channel == Channel.DEPTH:
+            return f"{symbol}@depth{BINANCE_DEPTH_LEVELS}@100ms"
+        if channel == Channel.DIFF:
+            return f"{symbol}@depth@100ms"
+        return f"{symbol}@kline_{interval}"
+
+    async def _connect_url(self) -> Optional[str]:
+        streams = "/".join(self.stream_name(*subscription) for subscription in self.subscriptions)
+        return f"{self.url}/stream?streams={streams}"
+
+    def _handle(self, message: dict):
+        symbol, stream = message["stream"].split("@", 1)
+        pair = self._pairs[symbol]
+        data = message["data"]
+        if stream == "ticker":
+            self.state.update_ticker(pair, data["a"], data["b"], data["c"])
+        elif stream == "depth@100ms":
+            self._update_diff(pair, (data["U"], data["u"]), data["b"], data["a"])
+        elif stream.startswith("depth"):
+            self.state.update_order_book(pair, data["asks"], data["bids"])
+        elif stream.startswith("kline_"):
+            kline = data["k"]
+            candle = parse_klines([[kline["t"], kline["o"], kline["h"], kline["l"], kline["c"]]])
+            self.state.update_candle(pair, kline["i"], candle[0])
+
+
+class KucoinStream(MarketStream):
+    """
+    Kucoin market data received from public channels. Address of WebSocket
+    server and connection token are requested with bullet handshake.
+    """
+
+    def __init__(
+        self,
+        api_addr: str = KUCOIN_API_URL,
+        reconnect_delay: float = RECONNECT_DELAY,
+        snapshot_loader: Optional[SnapshotLoader] = None,
+    ):
+        """
+        :param api_addr: address of Kucoin REST API used for bullet handshake
+        """
+        super().__init__("kucoin", reconnect_delay, snapshot_loader)
+        self.api_addr = api_addr
+        self.ping_interval = 18.0
+        self._message_id = 0
+
+    def _next_id(self) -> str:
+        self._message_id += 1
+        return str(self._message_id)
+
+    async def _connect_url(self) -> Optional[str]:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(f"{self.api_addr}/api/v1/bullet-public") as response:
+                data = await response.json(content_type=None)
+
+        if not is_response_valid(data):
+            return None
+        return self._server_url(data["data"])
+
+    def _server_url(self, bullet: dict) -> str:
+        """
+        :param bullet: data of bullet handshake response
+        :return: address of WebSocket server with connection token
+        """
+        server = bullet["instanceServers"][0]
+        self.ping_interval = server["pingInterval"] / 1000
+        return f"{server['endpoint']}?token={bullet['token']}&connectId={uuid.uuid4().hex}"
+
+    def topic(self, channel: Channel, pair: str, interval: Optional[str] = None) -> str:
+        """
+        :return: Kucoin topic of the pair
+        """
+        if channel == Channel.TICKER:
+            return f"/market/ticker:{pair}"
+        if channel == Channel.DEPTH:
+            return f"/spotMarket/level2Depth50:{pair}"
+        if channel == Channel.DIFF:
+            return f"/market/level2:{pair}"
+        return f"/market/candles:{pair}_{interval}"
+
+    def _subscribe_messages(self) -> List[dict]:
+        return [
+            {
+                "id": self._next_id(),
+                "type": "subscribe",
+                "topic": self.topic(*subscription),
+                "privateChannel": False,
+                "response": True,
+            }
+            for subscription in self.subscriptions
+        ]
+
+    async def _keep_alive(self, websocket):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await websocket.send(json.dumps({"id": str(int(time.time() * 1000)), "type": "ping"}))
+
+    def _handle(self, message: dict):
+        if message.get("type") != "message":
+            return
+        prefix, pair = message["topic"].split(":", 1)
+        data = message["data"]
+        if prefix == "/market/ticker":
+            self.state.update_ticker(pair, data["bestAsk"], data["bestBid"], data["price"])
+        elif prefix == "/spotMarket/level2Depth50":
+            self.state.update_order_book(pair, data["asks"], data["bids"])
+        elif prefix == "/market/level2":
+            sequence = (data["sequenceStart"], data["sequenceEnd"])
+            changes = data["changes"]
+            self._update_diff(pair, sequence, changes["bids"], changes["asks"])
+        elif prefix == "/market/candles":
+            pair, interval = pair.rsplit("_", 1)
+            self.state.update_candle(pair, interval, parse_candles([data["candles"]])[0])
+
+
+async def reload_balances(client: ExchangeAPI):
+    """
+    Downloads balances of the client again, changes pushed after the download
+    are applied to them. Changes missed while disconnected are lost otherwise.
+
+    :param client: exchange client caching balances
+    """
+
+    def reload():
+        client.balances.invalidate()
+        try:
+            client.balances.get()
+        except (BinanceAPIException, BinanceRequestException,
+                requests.RequestException) as error:
+            print(f"ERROR: {client.name} client - Balances download failed: {error!r}")
+
+    await asyncio.get_running_loop().run_in_executor(None, reload)
+
+
+class KucoinAccountStream(KucoinStream):
+    """
+    Kucoin private balance channel keeping balances cached by client up to date.
+    Balances are downloaded again after every connection, between connections
+    they are updated only with pushed changes instead of polling.
+    """
+
+    def __init__(self, client: Kucoin, reconnect_delay: float = RECONNECT_DELAY):
+        """
+        :param client: Kucoin client used for private handshake and updated with balances
+        """
+        super().__init__(client.api_addr, reconnect_delay)
+        self.client = client
+        client.balances.ttl = float("inf")
+
+    async def _connect_url(self) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        try:
+            data = await loop.run_in_executor(
+                None, functools.partial(self.client.send_priv_request, "bullet-private",
+                                        req_type="post")
+            )
+        except requests.RequestException as error:
+            print(f"ERROR: {self.name} stream - Handshake failed: {error!r}")
+            return None
+
+        if not is_response_valid(data):
+            return None
+        await reload_balances(self.client)
+        return self._server_url(data["data"])
+
+    def _subscribe_messages(self) -> List[dict]:
+        return [
+            {
+                "id": self._next_id(),
+                "type": "subscribe",
+                "topic": "/account/balance",
+                "privateChannel": True,
+                "response": True,
+            }
+        ]
+
+    def _handle(self, message: dict):
+        if message.get("type") != "message" or message.get("topic") != "/account/balance":
+            return
+        data = message["data"]
+        self.client.update_balance(data["currency"], data["total"], data["accountId"])
+        self.state.record_update()
+
+
+class BinanceAccountStream(MarketStream):
+    """
+    Binance user data stream keeping balances cached by client up to date.
+    Balances are downloaded again after every connection, between connections
+    they are updated only with pushed changes instead of polling.
+    """
+
+    def __init__(
+        self,
+        client: Binance,
+        url: str = BINANCE_STREAM_URL,
+        reconnect_delay: float = RECONNECT_DELAY,
+        keep_alive_interval: float = LISTEN_KEY_KEEP_ALIVE,
+    ):
+        """
+        :param client: Binance client used to open user data stream and updated with balances
+        :param url: address of Binance WebSocket server
+        :param keep_alive_interval: time in seconds between listen key prolongations
+        """
+        super().__init__("binance", reconnect_delay)
+        self.client = client
+        self.url = url
+        self.keep_alive_interval = keep_alive_interval
+        self.listen_key: Optional[str] = None
+        client.balances.ttl = float("inf")
+
+    async def _call_client(self, method: Callable, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, functools.partial(method, *args))
+        except (BinanceAPIException, BinanceRequestException,
+                requests.RequestException) as error:
+            print(f"ERROR: {self.name} stream - User data stream request failed: {error!r}")
+            return None
+
+    async def _connect_url(self) -> Optional[str]:
+        self.listen_key = await self._call_client(self.client.client.stream_get_listen_key)
+        if self.listen_key is None:
+            return None
+        await reload_balances(self.client)
+        return f"{self.url}/ws/{self.listen_key}"
+
+    async def _keep_alive(self, websocket):
+        while True:
+            await asyncio.sleep(self.keep_alive_interval)
+            await self._call_client(self.client.client.stream_keepalive, self.listen_key)
+
+    def _handle(self, message: dict):
+        if message.get("e") != "outboundAccountPosition":
+            return
+        for asset in message["B"]:
+            self.client.update_balance(asset["a"], float(asset["f"]) + float(asset["l"]))
+        self.state.record_update()
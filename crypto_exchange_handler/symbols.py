@@ -0,0 +1,137 @@
+"""
+Module contains index of markets listed on exchange, built once from exchange
+metadata and used to resolve base and quote currencies without string scanning.
+"""
+
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .pair import Pair, as_pair
+
+
+class SymbolInfo(NamedTuple):
+    """
+    Metadata of single market.
+    """
+    symbol: str
+    base: str
+    quote: str
+    tick_size: Optional[str] = None
+    lot_size: Optional[str] = None
+    min_size: Optional[str] = None
+    trading: bool = True
+
+    @property
+    def pair(self) -> Pair:
+        """
+        :return: normalized pair of the market
+        """
+        return Pair.of(self.base, self.quote)
+
+
+class SymbolIndex:
+    """
+    Markets listed on exchange indexed by exchange symbol, by base and quote pair,
+    by base currency and by quote currency.
+    """
+
+    def __init__(self, symbols: Iterable[SymbolInfo]):
+        self._by_symbol: Dict[str, SymbolInfo] = {}
+        self._by_pair: Dict[Pair, SymbolInfo] = {}
+        by_base: Dict[str, List[SymbolInfo]] = {}
+        by_quote: Dict[str, List[SymbolInfo]] = {}
+        for info in symbols:
+            self._by_symbol[info.symbol] = info
+            self._by_pair[info.pair] = info
+            by_base.setdefault(info.base, []).append(info)
+            by_quote.setdefault(info.quote, []).append(info)
+        self._by_base = {base: tuple(infos) for base, infos in by_base.items()}
+        self._by_quote = {quote: tuple(infos) for quote, infos in by_quote.items()}
+
+    def __len__(self) -> int:
+        return len(self._by_symbol)
+
+    def __iter__(self) -> Iterator[SymbolInfo]:
+        return iter(self._by_symbol.values())
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._by_symbol
+
+    def get(self, symbol: str) -> Optional[SymbolInfo]:
+        """
+        :param symbol: market symbol in exchange format i.e. ADABTC or ADA-BTC
+        :return: market metadata or None if market is not listed
+        """
+        return self._by_symbol.get(symbol)
+
+    def find(self, base: Union[str, Pair], quote: Optional[str] = None) -> Optional[SymbolInfo]:
+        """
+        :param base: base currency or Pair
+        :param quote: quote currency, ignored if base is Pair
+        :return: market metadata or None if market is not listed
+        """
+        return self._by_pair.get(as_pair(base, quote))
+
+    def with_base(self, base: str) -> Tuple[SymbolInfo, ...]:
+        """
+        :return: all markets trading given base currency
+        """
+        return self._by_base.get(base.upper(), ())
+
+    def with_quote(self, quote: str) -> Tuple[SymbolInfo, ...]:
+        """
+        :return: all markets quoted in given currency
+        """
+        return self._by_quote.get(quote.upper(), ())
+
+    def symbols(self) -> Tuple[str, ...]:
+        """
+        :return: all market symbols in exchange format
+        """
+        return tuple(self._by_symbol)
+
+    def pairs(self) -> Tuple[Pair, ...]:
+        """
+        :return: normalized pairs of all markets
+        """
+        return tuple(self._by_pair)
+
+
+def binance_symbol_index(exchange_info: dict) -> SymbolIndex:
+    """
+    :param exchange_info: response of Binance exchangeInfo endpoint
+    :return: SymbolIndex
+    """
+    symbols = []
+    for item in exchange_info["symbols"]:
+        filters = {entry["filterType"]: entry for entry in item.get("filters", ())}
+        symbols.append(
+            SymbolInfo(
+                symbol=item["symbol"],
+                base=item["baseAsset"],
+                quote=item["quoteAsset"],
+                tick_size=filters.get("PRICE_FILTER", {}).get("tickSize"),
+                lot_size=filters.get("LOT_SIZE", {}).get("stepSize"),
+                min_size=filters.get("LOT_SIZE", {}).get("minQty"),
+                trading=item.get("status", "TRADING") == "TRADING",
+            )
+        )
+    return SymbolIndex(symbols)
+
+
+def kucoin_symbol_index(symbols: list) -> SymbolIndex:
+    """
+    :param symbols: data of Kucoin symbols endpoint
+    :return: SymbolIndex
+    """
+    return SymbolIndex(
+        SymbolInfo(
+            symbol=item["symbol"],
+            base=item["baseCurrency"],
+            quote=item["quoteCurrency"],
+            tick_size=item.get("priceIncrement"),
+            lot_size=item.get("baseIncrement"),
+            min_size=item.get("baseMinSize"),
+            trading=item.get("enableTrading", True),
+        )
+        for item in symbols
+    )
@@ -0,0 +1,32 @@
+"""
+Module contains helpers for building HTTP transport shared by exchange clients.
+Every client keeps its own pooled session, so consecutive requests reuse
+already established TCP/TLS connections instead of opening a new one per call.
+"""
+
+from typing import Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = (3.05, 10.0)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True) -> requests.Session:
+    """
+    Creates requests session with connection pool mounted for http and https.
+
+    :param pool_size: maximum number of connections kept open per host
+    :param keep_alive: when False, every request asks server to close the connection
+    :return: configured requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
@@ -7,14 +7,44 @@ import pytest
 @pytest.fixture
 def binance_markets_ok_resp():
     """
-    Mock ok response with a binance-like format.
-    :return: response list
+    Mock ok response of exchangeInfo endpoint with a binance-like format.
+    :return: response dictionary
     """
-    return [
-        {"symbol": "REQETH", "price": "0.07990400"},
-        {"symbol": "REQBTC", "price": "0.00260900"},
-        {"symbol": "NULSETH", "price": "0.01302100"},
-    ]
+    return {
+        "timezone": "UTC",
+        "symbols": [
+            {
+                "symbol": "REQETH",
+                "status": "TRADING",
+                "baseAsset": "REQ",
+                "quoteAsset": "ETH",
+                "filters": [
+                    {"filterType": "PRICE_FILTER", "tickSize": "0.00000001"},
+                    {"filterType": "LOT_SIZE", "minQty": "1.00000000", "stepSize": "1.00000000"},
+                ],
+            },
+            {
+                "symbol": "REQBTC",
+                "status": "TRADING",
+                "baseAsset": "REQ",
+                "quoteAsset": "BTC",
+                "filters": [
+                    {"filterType": "PRICE_FILTER", "tickSize": "0.00000001"},
+                    {"filterType": "LOT_SIZE", "minQty": "1.00000000", "stepSize": "1.00000000"},
+                ],
+            },
+            {
+                "symbol": "NULSETH",
+                "status": "BREAK",
+                "baseAsset": "NULS",
+                "quoteAsset": "ETH",
+                "filters": [
+                    {"filterType": "PRICE_FILTER", "tickSize": "0.00000010"},
+                    {"filterType": "LOT_SIZE", "minQty": "0.10000000", "stepSize": "0.10000000"},
+                ],
+            },
+        ],
+    }
 
 
 @pytest.fixture
@@ -95,3 +125,199 @@ def binance_klines_resp():
             "0",
         ],
     ]
+
+
+@pytest.fixture
+def binance_book_tickers_resp():
+    """
+    Response with order book tickers from ticker/bookTicker endpoint.
+    :return: response list
+    """
+    return [
+        {
+            "symbol": "ADABTC",
+            "bidPrice": "0.00002373",
+            "bidQty": "1200.00000000",
+            "askPrice": "0.00002375",
+            "askQty": "800.00000000",
+        },
+        {
+            "symbol": "XRPBTC",
+            "bidPrice": "0.00001614",
+            "bidQty": "5300.00000000",
+            "askPrice": "0.00001616",
+            "askQty": "4100.00000000",
+        },
+        {
+            "symbol": "ADAETH",
+            "bidPrice": "0.00031990",
+            "bidQty": "300.00000000",
+            "askPrice": "0.00032010",
+            "askQty": "250.00000000",
+        },
+    ]
+
+
+@pytest.fixture
+def binance_order_book_resp():
+    """
+    Response with order book from depth endpoint.
+    :return: response dictionary
+    """
+    return {
+        "lastUpdateId": 1027024,
+        "bids": [["4.00000000", "431.00000000"], ["3.99000000", "12.00000000"]],
+        "asks": [["4.00000200", "12.00000000"], ["4.01000000", "3.50000000"]],
+    }
+
+
+@pytest.fixture
+def binance_tickers_exchange_info_resp():
+    """
+    Response of exchangeInfo endpoint with markets from binance_book_tickers_resp.
+    :return: response dictionary
+    """
+    return {
+        "symbols": [
+            {"symbol": "ADABTC", "status": "TRADING", "baseAsset": "ADA", "quoteAsset": "BTC"},
+            {"symbol": "XRPBTC", "status": "TRADING", "baseAsset": "XRP", "quoteAsset": "BTC"},
+            {"symbol": "ADAETH", "status": "TRADING", "baseAsset": "ADA", "quoteAsset": "ETH"},
+            {"symbol": "WBTCBTC", "status": "TRADING", "baseAsset": "WBTC", "quoteAsset": "BTC"},
+        ]
+    }
+
+
+@pytest.fixture
+def binance_stream_messages():
+    """
+    Messages recorded from Binance combined streams of ADABTC.
+    :return: list of messages
+    """
+    return [
+        {
+            "stream": "adabtc@ticker",
+            "data": {
+                "e": "24hrTicker",
+                "E": 1655652664013,
+                "s": "ADABTC",
+                "c": "0.00002374",
+                "b": "0.00002373",
+                "B": "1200.00000000",
+                "a": "0.00002375",
+                "A": "800.00000000",
+            },
+        },
+        {
+            "stream": "adabtc@depth20@100ms",
+            "data": {
+                "lastUpdateId": 1027024,
+                "bids": [["0.00002373", "1200.00000000"], ["0.00002372", "300.00000000"]],
+                "asks": [["0.00002375", "800.00000000"], ["0.00002376", "4100.00000000"]],
+            },
+        },
+        {
+            "stream": "adabtc@kline_1m",
+            "data": {
+                "e": "kline",
+                "s": "ADABTC",
+                "k": {
+                    "t": 1655652600000,
+                    "i": "1m",
+                    "o": "0.00002370",
+                    "c": "0.00002372",
+                    "h": "0.00002374",
+                    "l": "0.00002369",
+                    "x": False,
+                },
+            },
+        },
+        {
+            "stream": "adabtc@kline_1m",
+            "data": {
+                "e": "kline",
+                "s": "ADABTC",
+                "k": {
+                    "t": 1655652600000,
+                    "i": "1m",
+                    "o": "0.00002370",
+                    "c": "0.00002374",
+                    "h": "0.00002375",
+                    "l": "0.00002369",
+                    "x": True,
+                },
+            },
+        },
+        {
+            "stream": "adabtc@kline_1m",
+            "data": {
+                "e": "kline",
+                "s": "ADABTC",
+                "k": {
+                    "t": 1655652660000,
+                    "i": "1m",
+                    "o": "0.00002374",
+                    "c": "0.00002374",
+                    "h": "0.00002374",
+                    "l": "0.00002374",
+                    "x": False,
+                },
+            },
+        },
+    ]
+
+
+@pytest.fixture
+def binance_depth_diff_messages():
+    """
+    Diff depth messages of ADABTC continuing binance_order_book_resp snapshot.
+    :return: list of messages
+    """
+    return [
+        {
+            "stream": "adabtc@depth@100ms",
+            "data": {
+                "e": "depthUpdate",
+                "s": "ADABTC",
+                "U": 1027020,
+                "u": 1027026,
+                "b": [["4.00000000", "0.00000000"]],
+                "a": [["4.00000100", "7.00000000"]],
+            },
+        },
+        {
+            "stream": "adabtc@depth@100ms",
+            "data": {
+                "e": "depthUpdate",
+                "s": "ADABTC",
+                "U": 1027027,
+                "u": 1027030,
+                "b": [["3.99500000", "20.00000000"]],
+                "a": [["4.00000200", "0.00000000"]],
+            },
+        },
+    ]
+
+
+@pytest.fixture
+def binance_account_messages():
+    """
+    Messages of Binance user data stream.
+    :return: list of messages
+    """
+    return [
+        {
+            "e": "executionReport",
+            "E": 1564034571105,
+            "s": "ADABTC",
+            "X": "FILLED",
+        },
+        {
+            "e": "outboundAccountPosition",
+            "E": 1564034571105,
+            "u": 1564034571073,
+            "B": [
+                {"a": "BTC", "f": "0.04000000", "l": "0.00500000"},
+                {"a": "ADA", "f": "250.00000000", "l": "0.00000000"},
+            ],
+        },
+    ]
@@ -0,0 +1,29 @@
+"""
+Fixtures for testing caching layers of exchange clients
+"""
+import pytest
+
+from crypto_exchange_handler.candle_cache import CandleCache
+
+
+@pytest.fixture
+def cached_kucoin(kucoin_client, tmp_path, monkeypatch):
+    """
+    Kucoin client wrapped in cache, every request to exchange is recorded in `requested`.
+    """
+    requested = []
+
+    def get_candles_mock(  # pylint: disable=unused-argument,too-many-arguments
+        coin, quote, interval, start=None, end=None
+    ):
+        requested.append((start, end))
+        return tuple(
+            {"ts": ts, "open": 1.0, "close": 1.5, "high": 2.0, "low": 0.5}
+            for ts in reversed(range(start - start % 60, end + 1, 60))
+        )
+
+    monkeypatch.setattr(kucoin_client, "get_candles", get_candles_mock)
+    cache = CandleCache(kucoin_client, str(tmp_path / "candles.sqlite"))
+    cache.requested = requested
+    yield cache
+    cache.close()
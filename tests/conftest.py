@@ -4,7 +4,13 @@ from crypto_exchange_handler.kucoin import Kucoin
 from crypto_exchange_handler.binance import Binance
 
 
-pytest_plugins = ["kucoin_fixtures", "binance_fixtures"]
+pytest_plugins = [
+    "kucoin_fixtures",
+    "binance_fixtures",
+    "http_stub_fixtures",
+    "websocket_stub_fixtures",
+    "cache_fixtures",
+]
 
 
 @pytest.fixture
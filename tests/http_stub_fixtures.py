@@ -0,0 +1,77 @@
+"""
+Fixtures providing local stub HTTP server used instead of real exchange API.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Handler answering every request with response registered for its path.
+    Keeps track of client connections to verify connection reuse.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Serves GET request."""
+        self._respond()
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Serves POST request."""
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._respond()
+
+    def _respond(self):
+        server = self.server
+        path = self.path.split("?")[0]
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.requests.append((self.command, self.path, dict(self.headers)))
+            statuses = server.statuses.get(path)
+            status = statuses.pop(0) if statuses else 200
+        body = json.dumps(server.routes.get(path, {"code": "404000"})).encode("utf-8")
+        if status != 200 and path in server.error_bodies:
+            body = server.error_bodies[path]
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in server.headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Silences default request logging."""
+
+
+@pytest.fixture
+def http_stub_server():
+    """
+    Local HTTP server registering served routes in `routes` attribute.
+    Additional response headers are taken from `headers` attribute.
+    Statuses listed for path in `statuses` attribute are returned before status 200,
+    with raw body from `error_bodies` attribute if it is registered for the path.
+    :return: running server instance, its address is available in `url` attribute
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.routes = {}
+    server.headers = {}
+    server.statuses = {}
+    server.error_bodies = {}
+    server.connections = set()
+    server.requests = []
+    server.lock = threading.Lock()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
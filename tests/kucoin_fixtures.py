@@ -91,6 +91,24 @@ def kucoin_ticker_all_ok_resp():
                     "takerCoefficient": "1",
                     "makerCoefficient": "1",
                 },
+                {
+                    "symbol": "ADA-ETH",
+                    "symbolName": "ADA-ETH",
+                    "buy": "0.00031990",
+                    "sell": "0.00032010",
+                    "changeRate": "-0.0049",
+                    "changePrice": "-0.00000157",
+                    "high": "0.00032400",
+                    "low": "0.00031800",
+                    "vol": "53211.1234",
+                    "volValue": "17.0293",
+                    "last": "0.00032000",
+                    "averagePrice": "0.00032051",
+                    "takerFeeRate": "0.001",
+                    "makerFeeRate": "0.001",
+                    "takerCoefficient": "1",
+                    "makerCoefficient": "1",
+                },
             ],
         },
     }
@@ -184,3 +202,142 @@ def kucoin_nok_resp():
     return {
         "code": "404",
     }
+
+
+@pytest.fixture
+def kucoin_stream_messages():
+    """
+    Messages recorded from Kucoin public channels of ADA-BTC.
+    :return: list of messages
+    """
+    return [
+        {"id": "hQvf8jkno", "type": "welcome"},
+        {"id": "1", "type": "ack"},
+        {
+            "type": "message",
+            "topic": "/market/ticker:ADA-BTC",
+            "subject": "trade.ticker",
+            "data": {
+                "sequence": "1545896668986",
+                "price": "0.00002374",
+                "size": "0.17",
+                "bestAsk": "0.00002375",
+                "bestAskSize": "800",
+                "bestBid": "0.00002373",
+                "bestBidSize": "1200",
+            },
+        },
+        {
+            "type": "message",
+            "topic": "/spotMarket/level2Depth50:ADA-BTC",
+            "subject": "level2",
+            "data": {
+                "asks": [["0.00002375", "800"], ["0.00002376", "4100"]],
+                "bids": [["0.00002373", "1200"], ["0.00002372", "300"]],
+                "timestamp": 1655652664013,
+            },
+        },
+        {
+            "type": "message",
+            "topic": "/market/candles:ADA-BTC_1min",
+            "subject": "trade.candles.update",
+            "data": {
+                "symbol": "ADA-BTC",
+                "candles": [
+                    "1655652600", "0.00002370", "0.00002374", "0.00002375", "0.00002369",
+                    "1520.1", "0.036",
+                ],
+                "time": 1655652664013000000,
+            },
+        },
+    ]
+
+
+@pytest.fixture
+def kucoin_bullet_resp():
+    """
+    Response of bullet-public endpoint, endpoint is set by test.
+    :return: response dictionary
+    """
+    return {
+        "code": "200000",
+        "data": {
+            "token": "2neAiuYvAU61ZDXANAGAsiL4-iAExhsBXZxftpOeh_55i3Ysy2q2LEsEWU64mdzUOPusi34M",
+            "instanceServers": [
+                {
+                    "endpoint": None,
+                    "protocol": "websocket",
+                    "encrypt": False,
+                    "pingInterval": 50,
+                    "pingTimeout": 10000,
+                }
+            ],
+        },
+    }
+
+
+@pytest.fixture
+def kucoin_accounts_resp():
+    """
+    Response of accounts endpoint with BTC on main and trade account.
+    :return: response dictionary
+    """
+    return {
+        "code": "200000",
+        "data": [
+            {
+                "id": "5bd6e9286d99522a52e458de",
+                "currency": "BTC",
+                "type": "main",
+                "balance": "0.5",
+                "available": "0.5",
+                "holds": "0",
+            },
+            {
+                "id": "5bd6e9216d99522a52e458d6",
+                "currency": "BTC",
+                "type": "trade",
+                "balance": "0.25",
+                "available": "0.2",
+                "holds": "0.05",
+            },
+            {
+                "id": "5bd6e9216d99522a52e458d7",
+                "currency": "ADA",
+                "type": "trade",
+                "balance": "1200",
+                "available": "1200",
+                "holds": "0",
+            },
+        ],
+    }
+
+
+@pytest.fixture
+def kucoin_balance_messages():
+    """
+    Messages of Kucoin private balance channel.
+    :return: list of messages
+    """
+    return [
+        {"id": "hQvf8jkno", "type": "welcome"},
+        {"id": "1", "type": "ack"},
+        {
+            "type": "message",
+            "topic": "/account/balance",
+            "subject": "account.balance",
+            "channelType": "private",
+            "data": {
+                "accountId": "5bd6e9216d99522a52e458d6",
+                "available": "0.1",
+                "availableChange": "-0.1",
+                "currency": "BTC",
+                "hold": "0.05",
+                "holdChange": "0",
+                "relationEvent": "trade.setted",
+                "relationEventId": "5c21e80303aa677bd09d7dff",
+                "time": "1545743136994",
+                "total": "0.15",
+            },
+        },
+    ]
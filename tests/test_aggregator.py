@@ -0,0 +1,114 @@
+""" Unit tests for aggregator.py """
+import time
+
+from crypto_exchange_handler.aggregator import Aggregator
+from crypto_exchange_handler.exchange_template import MarketSide
+
+
+def delayed(result, delay):
+    """
+    :return: function returning result after delay, ignoring its arguments
+    """
+
+    def func(*args, **kwargs):  # pylint: disable=unused-argument
+        time.sleep(delay)
+        return result
+
+    return func
+
+
+def test_coins_prices_run_concurrently(binance_client, kucoin_client, monkeypatch):
+    """Tests if prices are merged by pair and wall time is the slowest exchange latency"""
+    monkeypatch.setattr(
+        binance_client, "get_coins_prices", delayed({"ADA-BTC": "0.00002375"}, 0.2)
+    )
+    monkeypatch.setattr(
+        kucoin_client,
+        "get_coins_prices",
+        delayed({"ADA-BTC": "0.00002380", "XRP-BTC": "0.00001616"}, 0.2),
+    )
+
+    with Aggregator([binance_client, kucoin_client]) as aggregator:
+        result = aggregator.get_coins_prices(iter(["ADA", "XRP"]), "BTC", MarketSide.ASK)
+
+    assert result.data == {
+        "ADA-BTC": {"binance": "0.00002375", "kucoin": "0.00002380"},
+        "XRP-BTC": {"kucoin": "0.00001616"},
+    }
+    assert set(result.timings) == {"binance", "kucoin"}
+    assert all(timing >= 0.2 for timing in result.timings.values())
+    assert result.elapsed < 0.35
+    assert not result.errors
+
+
+def test_errors_and_timeout(binance_client, kucoin_client, monkeypatch):
+    """Tests if failed and slow exchanges are reported without losing other results"""
+    monkeypatch.setattr(binance_client, "get_all_balances", delayed({"btc": "1.0"}, 0))
+    monkeypatch.setattr(kucoin_client, "get_all_balances", delayed(None, 0))
+
+    with Aggregator([binance_client, kucoin_client]) as aggregator:
+        balances = aggregator.get_all_balances()
+
+    assert balances.data == {"BTC": {"binance": "1.0"}}
+    assert balances.errors == {"kucoin": "no data"}
+
+    def failing_order_book(coin, quote, numeric):  # pylint: disable=unused-argument
+        raise ConnectionError("unavailable")
+
+    monkeypatch.setattr(binance_client, "get_order_book", failing_order_book)
+    monkeypatch.setattr(kucoin_client, "get_order_book", delayed({}, 0.5))
+
+    with Aggregator([binance_client, kucoin_client], timeout=0.1) as aggregator:
+        order_books = aggregator.get_order_book("ADA", "BTC")
+
+    assert order_books.data == {}
+    assert "ConnectionError" in order_books.errors["binance"]
+    assert order_books.errors["kucoin"].startswith("timeout")
+    assert order_books.elapsed < 0.3
+
+
+def test_timed_out_exchange_does_not_starve_pool(binance_client, kucoin_client, monkeypatch):
+    """Tests if exchange still running abandoned request is skipped instead of queued"""
+    monkeypatch.setattr(binance_client, "get_order_book", delayed({"bids": []}, 0))
+    monkeypatch.setattr(kucoin_client, "get_order_book", delayed({"asks": []}, 0.3))
+
+    with Aggregator([binance_client, kucoin_client], timeout=0.1) as aggregator:
+        first = aggregator.get_order_book("ADA", "BTC")
+        second = aggregator.get_order_book("ADA", "BTC")
+        time.sleep(0.3)
+        third = aggregator.get_order_book("ADA", "BTC")
+
+    assert first.errors["kucoin"].startswith("timeout")
+    assert second.data == {"binance": {"bids": []}}
+    assert second.errors == {"kucoin": "busy with request which timed out"}
+    assert second.elapsed < 0.1
+    assert third.errors["kucoin"].startswith("timeout")
+
+
+def test_available_markets(
+    binance_client,
+    kucoin_client,
+    binance_tickers_exchange_info_resp,
+    kucoin_markets_ok_resp,
+    monkeypatch,
+):
+    """Tests if markets of both exchanges are merged by normalized pair"""
+    monkeypatch.setattr(
+        binance_client.client, "get_exchange_info", lambda: binance_tickers_exchange_info_resp
+    )
+    monkeypatch.setattr(
+        kucoin_client, "send_pub_request", lambda addr: kucoin_markets_ok_resp
+    )
+
+    with Aggregator([binance_client, kucoin_client]) as aggregator:
+        markets = aggregator.get_available_markets()
+
+    assert markets.data == {
+        "ADA-BTC": ("binance",),
+        "XRP-BTC": ("binance",),
+        "ADA-ETH": ("binance",),
+        "WBTC-BTC": ("binance",),
+        "REQ-ETH": ("kucoin",),
+        "REQ-BTC": ("kucoin",),
+        "NULS-ETH": ("kucoin",),
+    }
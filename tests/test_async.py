@@ -0,0 +1,117 @@
+""" Unit tests for asyncio exchange clients """
+import asyncio
+
+from crypto_exchange_handler.async_binance import AsyncBinance
+from crypto_exchange_handler.async_exchange_template import create_async_session
+from crypto_exchange_handler.async_kucoin import AsyncKucoin
+from crypto_exchange_handler.exchange_template import MarketSide
+
+
+def test_async_candles_format(http_stub_server, kucoin_klines_resp, binance_klines_resp):
+    """Tests if asyncio clients return candles in the same format as blocking ones"""
+    http_stub_server.routes["/api/v1/market/candles"] = kucoin_klines_resp
+    http_stub_server.routes["/api/v3/klines"] = binance_klines_resp
+
+    async def fetch():
+        async with create_async_session() as session:
+            kucoin = AsyncKucoin("access", "secret", "passphrase", session=session)
+            binance = AsyncBinance("access", "secret", session=session)
+            kucoin.api_addr = binance.api_addr = http_stub_server.url
+            return await asyncio.gather(
+                kucoin.get_candles("BTC", "USDT", "30min", "2022-06-15", "2022-06-17"),
+                binance.get_candles("BTC", "USDT", "30m", "2022-06-15", "2022-06-17"),
+            )
+
+    klines_kucoin, klines_binance = asyncio.run(fetch())
+
+    assert klines_kucoin == klines_binance
+    assert klines_kucoin[0] == {
+        "ts": 1655415000, "open": 20843.9, "close": 20673.8, "high": 20920.8, "low": 20626.0
+    }
+
+
+def test_async_order_book(http_stub_server, binance_order_book_resp):
+    """Tests if order book is keyed by market side"""
+    http_stub_server.routes["/api/v3/depth"] = binance_order_book_resp
+
+    async def fetch():
+        async with AsyncBinance("access", "secret") as binance:
+            binance.api_addr = http_stub_server.url
+            return await binance.get_order_book("ADA", "BTC")
+
+    order_book = asyncio.run(fetch())
+
+    assert order_book[MarketSide.ASK] == binance_order_book_resp["asks"]
+    assert order_book[MarketSide.BID] == binance_order_book_resp["bids"]
+
+
+def test_async_concurrent_queries(
+    http_stub_server, kucoin_ticker_ok_resp, binance_book_tickers_resp
+):
+    """Tests if hundreds of concurrent queries share one connection pool"""
+    http_stub_server.routes["/api/v1/market/orderbook/level1"] = kucoin_ticker_ok_resp
+    http_stub_server.routes["/api/v3/ticker/bookTicker"] = binance_book_tickers_resp
+
+    async def fetch():
+        async with create_async_session(pool_size=20) as session:
+            kucoin = AsyncKucoin("access", "secret", "passphrase", session=session)
+            binance = AsyncBinance("access", "secret", session=session)
+            kucoin.api_addr = binance.api_addr = http_stub_server.url
+            queries = [kucoin.get_coin_price("BTC", "USDT") for _ in range(300)]
+            queries += [binance.get_coin_price("ADA", "BTC") for _ in range(300)]
+            return await asyncio.gather(*queries)
+
+    prices = asyncio.run(fetch())
+
+    assert prices == ["19284.4"] * 300 + ["0.00002375"] * 300
+    assert len(http_stub_server.connections) <= 20
+
+
+def test_async_coins_prices(
+    http_stub_server,
+    kucoin_ticker_all_ok_resp,
+    binance_book_tickers_resp,
+    binance_tickers_exchange_info_resp,
+):
+    """Tests if asyncio clients return prices of many pairs in the same format"""
+    http_stub_server.routes["/api/v1/market/allTickers"] = kucoin_ticker_all_ok_resp
+    http_stub_server.routes["/api/v3/ticker/bookTicker"] = binance_book_tickers_resp
+    http_stub_server.routes["/api/v3/exchangeInfo"] = binance_tickers_exchange_info_resp
+
+    async def fetch():
+        async with create_async_session() as session:
+            kucoin = AsyncKucoin("access", "secret", "passphrase", session=session)
+            binance = AsyncBinance("access", "secret", session=session)
+            kucoin.api_addr = binance.api_addr = http_stub_server.url
+            return await asyncio.gather(
+                kucoin.get_coins_prices(("ADA", "XRP"), ("BTC", "ETH")),
+                binance.get_coins_prices(("ADA", "XRP"), ("BTC", "ETH")),
+            )
+
+    prices_kucoin, prices_binance = asyncio.run(fetch())
+
+    assert prices_kucoin == prices_binance
+    assert prices_binance == {
+        "ADA-BTC": "0.00002375", "XRP-BTC": "0.00001616", "ADA-ETH": "0.00032010"
+    }
+
+
+def test_async_balances_snapshot(http_stub_server, kucoin_accounts_resp):
+    """Tests if concurrent balance lookups share one accounts download"""
+    http_stub_server.routes["/api/v1/accounts"] = kucoin_accounts_resp
+
+    async def fetch():
+        async with AsyncKucoin("access", "secret", "passphrase") as kucoin:
+            kucoin.api_addr = http_stub_server.url
+            balances = await asyncio.gather(
+                kucoin.get_balance("BTC"), kucoin.get_balance("ETH"), kucoin.get_all_balances()
+            )
+            kucoin.balances.invalidate()
+            return balances, await kucoin.get_balance("btc")
+
+    (btc, eth, all_balances), reloaded = asyncio.run(fetch())
+
+    assert btc == reloaded == "0.7500000000"
+    assert eth == "0.0000000000"
+    assert all_balances == {"BTC": "0.7500000000", "ADA": "1200.0000000000"}
+    assert len(http_stub_server.requests) == 2
@@ -0,0 +1,132 @@
+""" Unit tests for balances.py and balance caching of exchange clients """
+from crypto_exchange_handler.balances import Balances
+from crypto_exchange_handler.streaming import BinanceAccountStream, KucoinAccountStream
+
+
+def test_balances_sum_accounts():
+    """Tests if balances of accounts are summed per coin and replaced by updates"""
+    balances = Balances([("main", "btc", "0.5"), ("trade", "BTC", 0.25), ("trade", "ADA", "0")])
+
+    assert balances.get("BTC") == "0.7500000000"
+    assert balances.get("xrp") is None
+    assert balances.get("XRP", "0") == "0"
+
+    balances.update("trade", "BTC", "0.1")
+    balances.update("main", "XRP", 10)
+    assert balances.get("btc") == "0.6000000000"
+    assert balances.to_dict(non_zero=True) == {"BTC": "0.6000000000", "XRP": "10.0000000000"}
+    assert balances.to_dict()["ADA"] == "0.0000000000"
+
+
+def test_binance_balances_downloaded_once(binance_client, binance_balances_resp, monkeypatch):
+    """Tests if balances of many coins are looked up in one account snapshot"""
+    calls = []
+
+    def get_account_mock():
+        calls.append(1)
+        return binance_balances_resp
+
+    monkeypatch.setattr(binance_client.client, "get_account", get_account_mock)
+    monkeypatch.setattr(binance_client.client, "withdraw", lambda **params: {"id": "1"})
+
+    for coin in ("BTC", "LTC", "USDT", "EOS", "QAB"):
+        binance_client.get_balance(coin)
+    assert binance_client.get_all_balances() == {
+        "BTC": "0.0509013500", "LTC": "0.0003184400", "USDT": "0.1049598900"
+    }
+    assert len(calls) == 1
+
+    assert binance_client.withdraw_asset("BTC", "address", "0.01") == {"id": "1"}
+    assert binance_client.get_balance("BTC") == "0.0509013500"
+    assert len(calls) == 2
+
+
+def test_kucoin_balances_invalidated_by_order(kucoin_client, kucoin_accounts_resp, monkeypatch):
+    """Tests if accounts are downloaded once and again after market order"""
+    calls = []
+
+    def send_priv_request_mock(addr, data=None, req_type="get"):  # pylint: disable=unused-argument
+        calls.append(addr)
+        if addr == "orders":
+            return {"code": "200000", "data": {"orderId": "5bd6e9286d99522a52e458de"}}
+        return kucoin_accounts_resp
+
+    monkeypatch.setattr(kucoin_client, "send_priv_request", send_priv_request_mock)
+
+    assert kucoin_client.get_balance("BTC") == "0.7500000000"
+    assert kucoin_client.get_balance("ada") == "1200.0000000000"
+    assert kucoin_client.get_balance("XRP") == "0.0000000000"
+    assert calls == ["accounts"]
+
+    kucoin_client.create_market_order("buy", "ADA", "BTC", size="10")
+    kucoin_client.get_balance("BTC")
+    assert calls == ["accounts", "orders", "accounts"]
+
+
+def test_update_balance(binance_client, binance_balances_resp, monkeypatch):
+    """Tests if pushed balance replaces cached one and is ignored before first download"""
+    monkeypatch.setattr(binance_client.client, "get_account", lambda: binance_balances_resp)
+
+    assert not binance_client.update_balance("BTC", "1.5")
+    binance_client.get_balance("BTC")
+    assert binance_client.update_balance("BTC", "1.5")
+    assert binance_client.get_balance("BTC") == "1.5000000000"
+
+
+def test_kucoin_account_stream(  # pylint: disable=too-many-arguments
+    websocket_stub_server,
+    kucoin_client,
+    kucoin_bullet_resp,
+    kucoin_accounts_resp,
+    kucoin_balance_messages,
+    monkeypatch,
+):
+    """Tests if private channel is subscribed and pushed balances update the cache"""
+    kucoin_bullet_resp["data"]["instanceServers"][0]["endpoint"] = websocket_stub_server.url
+    websocket_stub_server.replay = kucoin_balance_messages
+    calls = []
+
+    def send_priv_request_mock(addr, data=None, req_type="get"):  # pylint: disable=unused-argument
+        calls.append((addr, req_type))
+        return kucoin_bullet_resp if addr == "bullet-private" else kucoin_accounts_resp
+
+    monkeypatch.setattr(kucoin_client, "send_priv_request", send_priv_request_mock)
+    assert kucoin_client.get_balance("BTC") == "0.7500000000"
+
+    stream = KucoinAccountStream(kucoin_client)
+    stream.start()
+    try:
+        assert stream.state.wait_for_updates(1, timeout=5)
+    finally:
+        stream.stop()
+
+    subscriptions = [item for item in websocket_stub_server.received if item["type"] == "subscribe"]
+    assert subscriptions[0]["topic"] == "/account/balance"
+    assert subscriptions[0]["privateChannel"]
+    assert kucoin_client.get_balance("BTC") == "0.6500000000"
+    assert calls == [("accounts", "get"), ("bullet-private", "post"), ("accounts", "get")]
+
+
+def test_binance_account_stream(
+    websocket_stub_server,
+    binance_client,
+    binance_balances_resp,
+    binance_account_messages,
+    monkeypatch,
+):
+    """Tests if listen key is used to connect and account positions update the cache"""
+    websocket_stub_server.replay = binance_account_messages
+    monkeypatch.setattr(binance_client.client, "get_account", lambda: binance_balances_resp)
+    monkeypatch.setattr(binance_client.client, "stream_get_listen_key", lambda: "pqia91ma19a5s61")
+
+    stream = BinanceAccountStream(binance_client, websocket_stub_server.url)
+    stream.start()
+    try:
+        assert stream.state.wait_for_updates(1, timeout=5)
+    finally:
+        stream.stop()
+
+    assert websocket_stub_server.paths == ["/ws/pqia91ma19a5s61"]
+    assert binance_client.get_balance("BTC") == "0.0450000000"
+    assert binance_client.get_balance("ADA") == "250.0000000000"
+    assert binance_client.get_balance("LTC") == "0.0003184400"
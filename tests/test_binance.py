@@ -1,4 +1,7 @@
 """ Unit tests for binance.py """
+import requests
+
+from crypto_exchange_handler.exchange_template import MarketSide
 
 
 def test_binance_object_created(binance_client):
@@ -18,3 +21,107 @@ def test_get_balance(binance_client, binance_balances_resp, monkeypatch):
     assert binance_client.get_balance("BTC") == "0.0509013500"
     assert binance_client.get_balance("EOS") == "0.0000000000"
     assert binance_client.get_balance("QAB") is None
+
+
+def test_get_coin_price_uses_ticker_snapshot(
+    binance_client, binance_book_tickers_resp, binance_tickers_exchange_info_resp, monkeypatch
+):
+    """Tests if prices of many coins are looked up in one downloaded ticker"""
+    calls = []
+
+    def get_orderbook_tickers_mock():
+        calls.append(1)
+        return binance_book_tickers_resp
+
+    monkeypatch.setattr(binance_client.client, "get_orderbook_tickers", get_orderbook_tickers_mock)
+    monkeypatch.setattr(
+        binance_client.client, "get_exchange_info", lambda: binance_tickers_exchange_info_resp
+    )
+
+    for _ in range(50):
+        assert binance_client.get_coin_price("ADA", "BTC") == "0.00002375"
+        assert binance_client.get_coin_price("XRP", "BTC", MarketSide.BID) == "0.00001614"
+    assert binance_client.get_coin_price("DOGE", "BTC") is None
+    assert len(calls) == 1
+
+
+def test_get_coins_prices(
+    binance_client, binance_book_tickers_resp, binance_tickers_exchange_info_resp, monkeypatch
+):
+    """Tests if only requested pairs are picked from indexed ticker"""
+    monkeypatch.setattr(
+        binance_client.client, "get_orderbook_tickers", lambda: binance_book_tickers_resp
+    )
+    monkeypatch.setattr(
+        binance_client.client, "get_exchange_info", lambda: binance_tickers_exchange_info_resp
+    )
+
+    ask_prices = binance_client.get_coins_prices(("ADA", "XRP"))
+    bid_prices = binance_client.get_coins_prices({"ada"}, "BTC", MarketSide.BID)
+    multi_quote_prices = binance_client.get_coins_prices(("ADA", "DOGE"), ("BTC", "ETH"))
+
+    assert ask_prices == {"ADA-BTC": "0.00002375", "XRP-BTC": "0.00001616"}
+    assert bid_prices == {"ADA-BTC": "0.00002373"}
+    assert multi_quote_prices == {"ADA-BTC": "0.00002375", "ADA-ETH": "0.00032010"}
+    assert binance_client.get_symbol_info("ADABTC").base == "ADA"
+
+
+def test_get_candles_paginated(binance_client, monkeypatch):
+    """Tests if long range is fetched in planned windows and ordered from the oldest candle"""
+    requested = []
+
+    def get_klines_mock(**params):
+        requested.append(params)
+        start, end = params["startTime"], params["endTime"]
+        return [[ts, "1", "2", "0.5", "1.5"] for ts in range(start, end + 1, 60000)]
+
+    monkeypatch.setattr(binance_client.client, "get_klines", get_klines_mock)
+
+    klines = binance_client.get_candles("BTC", "USDT", "1min", "2022-06-01", "2022-06-06")
+
+    timestamps = [kline["ts"] for kline in klines]
+    assert len(requested) == 8
+    assert all(params["interval"] == "1m" for params in requested)
+    assert timestamps == list(range(1654041600, 1654473600 + 1, 60))
+
+    requested.clear()
+    assert binance_client.get_candles("BTC", "USDT", "1M", "2022-6-1", "2022-09-01") is not None
+    monthly = [(params["interval"], params["startTime"], params["endTime"]) for params in requested]
+    assert monthly == [("1M", 1654041600000, 1661990400000)]
+
+
+def test_markets_unavailable(binance_client, monkeypatch):
+    """Tests if failed exchange info download gives None instead of raising"""
+
+    def get_exchange_info_mock():
+        raise requests.ConnectionError("unavailable")
+
+    monkeypatch.setattr(binance_client.client, "get_exchange_info", get_exchange_info_mock)
+    binance_client.retry.max_attempts = 1
+
+    assert binance_client.get_available_markets() is None
+    assert binance_client.get_listed_coins() is None
+    assert binance_client.get_coin_price("ADA") is None
+
+
+def test_order_book_unavailable(binance_client, monkeypatch):
+    """Tests if connection errors of order book requests give None instead of raising"""
+
+    def get_order_book_mock(**params):  # pylint: disable=unused-argument
+        raise requests.ConnectionError("unavailable")
+
+    monkeypatch.setattr(binance_client.client, "get_order_book", get_order_book_mock)
+    binance_client.retry.max_attempts = 1
+
+    assert binance_client.get_order_book("ADA", "BTC") is None
+    assert binance_client.get_order_book_snapshot("ADA", "BTC") is None
+
+
+def test_weight_headers_read_from_own_response(binance_client, http_stub_server):
+    """Tests if used weight reported in response of request corrects the scheduler"""
+    http_stub_server.routes["/api/v3/depth"] = {"lastUpdateId": 1, "bids": [], "asks": []}
+    http_stub_server.headers["x-mbx-used-weight-1m"] = "5990"
+    binance_client.client.API_URL = f"{http_stub_server.url}/api"
+
+    assert binance_client.get_order_book("ADA", "BTC") is not None
+    assert binance_client.scheduler.pools["weight"].available() < 20
@@ -0,0 +1,35 @@
+""" Unit tests for candle_cache.py """
+
+
+def test_repeated_range_served_from_cache(cached_kucoin):
+    """Tests if the same range is downloaded only once"""
+    first = cached_kucoin.get_candles("BTC", "USDT", "1min", 6000, 12000)
+    second = cached_kucoin.get_candles("BTC", "USDT", "1min", 6000, 12000)
+
+    assert first == second
+    assert [candle["ts"] for candle in first] == list(range(6000, 12001, 60))
+    assert cached_kucoin.requested == [(6000, 12000)]
+    assert (cached_kucoin.hits, cached_kucoin.misses) == (1, 1)
+
+
+def test_only_gaps_are_downloaded(cached_kucoin):
+    """Tests if only missing parts of wider range are requested"""
+    cached_kucoin.get_candles("BTC", "USDT", "1min", 6000, 12000)
+    cached_kucoin.get_candles("BTC", "USDT", "1min", 18000, 24000)
+    candles = cached_kucoin.get_candles("BTC", "USDT", "1min", 0, 30000, as_series=True)
+
+    assert cached_kucoin.requested[2:] == [
+        (0, 5999), (12001, 17999), (24001, 30000)
+    ]
+    assert list(candles.ts) == list(range(0, 30001, 60))
+    assert cached_kucoin.missing_ranges("BTC-USDT", "1min", 0, 30000) == []
+
+
+def test_interval_spellings_share_cache(cached_kucoin):
+    """Tests if Binance and Kucoin spellings of the same interval hit the same rows"""
+    first = cached_kucoin.get_candles("BTC", "USDT", "1min", 6000, 12000)
+    second = cached_kucoin.get_candles("BTC", "USDT", "1m", 6000, 12000)
+
+    assert first == second
+    assert cached_kucoin.requested == [(6000, 12000)]
+    assert cached_kucoin.missing_ranges("BTC-USDT", "1m", 6000, 12000) == []
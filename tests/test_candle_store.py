@@ -0,0 +1,166 @@
+""" Unit tests for candle_store.py """
+import os
+
+import pytest
+
+from crypto_exchange_handler.candle_store import (
+    CandleFile,
+    append_candles,
+    check_series,
+    last_timestamp,
+    candle_file_to_csv,
+    csv_to_candle_file,
+    write_candle_file,
+)
+from crypto_exchange_handler.exchange_template import ExchangeAPI
+
+
+def make_candles(amount):
+    """Creates candles with one minute interval, the newest one first"""
+    return [
+        {"ts": 60 * i, "open": float(i), "high": i + 2.0, "low": i - 1.0, "close": i + 1.0}
+        for i in reversed(range(amount))
+    ]
+
+
+def test_candle_file_header_and_access(tmp_path):
+    """Tests if file keeps metadata and candles sorted by timestamp"""
+    file = str(tmp_path / "btc.candles")
+    write_candle_file(file, make_candles(1000), "kucoin", "BTC-USDT", "1min")
+
+    with CandleFile(file) as candle_file:
+        assert (candle_file.exchange, candle_file.pair, candle_file.interval) == (
+            "kucoin", "BTC-USDT", "1min"
+        )
+        assert len(candle_file) == 1000
+        assert candle_file[0] == {"ts": 0, "open": 0.0, "high": 2.0, "low": -1.0, "close": 1.0}
+        assert candle_file[-1]["ts"] == 999 * 60
+
+
+def test_candle_file_slice_by_time(tmp_path):
+    """Tests if candles are sliced by timestamp range"""
+    file = str(tmp_path / "btc.candles")
+    write_candle_file(file, make_candles(1000), "kucoin", "BTC-USDT", "1min")
+
+    with CandleFile(file) as candle_file:
+        series = candle_file.slice_by_time(600, 1200)
+
+    assert list(series.ts) == [60.0 * i for i in range(10, 20)]
+    assert list(series.close) == [i + 1.0 for i in range(10, 20)]
+
+
+def test_csv_conversion_round_trip(tmp_path):
+    """Tests if candles survive conversion between csv and binary file"""
+    candle_file = str(tmp_path / "btc.candles")
+    csv_file = str(tmp_path / "btc.csv")
+    write_candle_file(candle_file, make_candles(50), "binance", "BTC-USDT", "1m")
+
+    assert candle_file_to_csv(candle_file, csv_file) == 50
+    assert csv_to_candle_file(csv_file, str(tmp_path / "copy.candles"), "binance", "BTC-USDT", "1m")
+
+    original = ExchangeAPI.load_market_data_file(candle_file)
+    converted = ExchangeAPI.load_market_data_file(str(tmp_path / "copy.candles"))
+    assert original == converted == ExchangeAPI.load_market_data_file(csv_file)
+
+
+def test_append_replaces_open_candle(tmp_path):
+    """Tests if appending replaces the last stored candle and adds newer ones"""
+    for name in ("btc.candles", "btc.csv"):
+        file = str(tmp_path / name)
+        write_candle_file(str(tmp_path / "source.candles"), make_candles(10), "kucoin", "BTC", "1m")
+        candle_file_to_csv(str(tmp_path / "source.candles"), str(tmp_path / "btc.csv"))
+        write_candle_file(str(tmp_path / "btc.candles"), make_candles(10), "kucoin", "BTC", "1m")
+
+        update = [{"ts": 60 * i, "open": 5.0, "high": 6.0, "low": 4.0, "close": 5.5}
+                  for i in range(8, 13)]
+
+        assert append_candles(file, update) == 3
+        assert append_candles(file, update) == 0
+
+        candles = ExchangeAPI.load_market_data_file(file)
+        assert [candle["ts"] for candle in candles] == [60 * i for i in range(13)]
+        assert candles[8]["close"] == 7.0 + 2.0
+        assert candles[9]["close"] == 5.5
+        assert last_timestamp(file) == 720
+
+
+def test_sync_market_data_file(kucoin_client, tmp_path, monkeypatch):
+    """Tests if only candles newer than the stored ones are requested"""
+    file = str(tmp_path / "btc.csv")
+    requested = []
+
+    def get_candles_mock(  # pylint: disable=unused-argument,too-many-arguments
+        coin, quote, interval, start=None, end=None
+    ):
+        requested.append(start)
+        first = 0 if isinstance(start, str) else start
+        return tuple(
+            {"ts": ts, "open": 1.0, "close": 1.5, "high": 2.0, "low": 0.5}
+            for ts in reversed(range(first, first + 300, 60))
+        )
+
+    monkeypatch.setattr(kucoin_client, "get_candles", get_candles_mock)
+
+    assert kucoin_client.sync_market_data_file("BTC", "USDT", "1min", file, "1970-01-01") == 5
+    assert kucoin_client.sync_market_data_file("BTC", "USDT", "1min", file) == 4
+    assert kucoin_client.sync_market_data_file("BTC", "USDT", "1hour", file) is None
+
+    candles = ExchangeAPI.load_market_data_file(file)
+    assert requested == ["1970-01-01", 240]
+    assert [candle["ts"] for candle in candles] == [60.0 * i for i in range(9)]
+    assert candles[0] == {"ts": 0.0, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5}
+
+
+def test_csv_append_in_place(tmp_path):
+    """Tests if csv rows are appended to the same file and incomplete row is overwritten"""
+    file = str(tmp_path / "btc.csv")
+    write_candle_file(str(tmp_path / "source.candles"), make_candles(10), "kucoin", "BTC", "1m")
+    candle_file_to_csv(str(tmp_path / "source.candles"), file)
+    inode = os.stat(file).st_ino
+    with open(file, "a", encoding="utf-8") as csv_file:
+        csv_file.write("600,1.0,2")
+
+    assert last_timestamp(file) == 540
+    update = [{"ts": 60 * i, "open": 5.0, "high": 6.0, "low": 4.0, "close": 5.5}
+              for i in range(9, 12)]
+    assert append_candles(file, update) == 2
+
+    candles = ExchangeAPI.load_market_data_file(file)
+    assert os.stat(file).st_ino == inode
+    assert [candle["ts"] for candle in candles] == [60 * i for i in range(12)]
+    assert candles[10]["close"] == 5.5
+
+
+def test_check_series(tmp_path):
+    """Tests if appending candles of other pair or interval is rejected"""
+    candle_file = str(tmp_path / "btc.candles")
+    csv_file = str(tmp_path / "btc.csv")
+    write_candle_file(candle_file, make_candles(10), "kucoin", "BTC-USDT", "1min")
+    candle_file_to_csv(candle_file, csv_file)
+
+    check_series(candle_file, "BTC-USDT", "1m", "kucoin")
+    check_series(csv_file, "BTC-USDT", "1min")
+    for pair, interval, exchange in (("ETH-USDT", "1min", "kucoin"), ("BTC-USDT", "5min", None),
+                                     ("BTC-USDT", "1min", "binance")):
+        with pytest.raises(ValueError):
+            check_series(candle_file, pair, interval, exchange)
+    with pytest.raises(ValueError):
+        check_series(csv_file, "BTC-USDT", "1hour")
+
+
+def test_interrupted_binary_append_invisible(tmp_path):
+    """Tests if records written without updated count are not read and are overwritten"""
+    file = str(tmp_path / "btc.candles")
+    write_candle_file(file, make_candles(10), "kucoin", "BTC-USDT", "1min")
+    with open(file, "ab") as candle_file:
+        candle_file.write(b"\xff" * 100)
+
+    with CandleFile(file) as candle_file:
+        assert len(candle_file) == 10
+    assert last_timestamp(file) == 540
+    update = [{"ts": 60 * i, "open": 5.0, "high": 6.0, "low": 4.0, "close": 5.5}
+              for i in range(9, 12)]
+    assert append_candles(file, update) == 2
+    with CandleFile(file) as candle_file:
+        assert [candle["ts"] for candle in candle_file] == [60 * i for i in range(12)]
+        assert candle_file[9]["close"] == 5.5
@@ -0,0 +1,54 @@
+""" Unit tests for candles.py """
+import pytest
+
+from crypto_exchange_handler.candles import CandleSeries
+from crypto_exchange_handler.exchange_template import ExchangeAPI
+
+
+def test_series_rows_match_dicts(kucoin_client, kucoin_klines_resp, monkeypatch):
+    """Tests if series rows are the same as candle dictionaries"""
+
+    def send_pub_request_mock(self, data):  # pylint: disable=unused-argument
+        return kucoin_klines_resp
+
+    monkeypatch.setattr(kucoin_client, "send_pub_request", send_pub_request_mock)
+
+    candles = kucoin_client.get_candles("BTC", "USDT", "30min", "2022-06-15", "2022-06-17")
+    series = kucoin_client.get_candles(
+        "BTC", "USDT", "30min", "2022-06-15", "2022-06-17", as_series=True
+    )
+
+    assert isinstance(series, CandleSeries)
+    assert len(series) == len(candles)
+    assert series.to_dicts() == candles
+    assert series[1] == candles[1]
+    assert series[-2:].to_dicts() == candles[-2:]
+
+
+def test_series_to_numpy_zero_copy():
+    """Tests if NumPy export shares memory with series"""
+    np = pytest.importorskip("numpy")
+    series = CandleSeries.from_dicts(
+        [{"ts": 60 * i, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5} for i in range(10)]
+    )
+
+    arrays = series.to_numpy()
+    series.close[3] = 7.0
+
+    assert arrays["close"][3] == 7.0
+    assert np.array_equal(arrays["ts"], np.arange(0, 600, 60))
+
+
+def test_load_market_data_file_as_series(tmp_path):
+    """Tests if csv dump is loaded into series"""
+    file = tmp_path / "data.csv"
+    file.write_text(
+        "ts,open,high,low,close\n1655407800,2.0,3.0,1.0,2.5\n1655409600,2.5,4.0,2.0,3.5\n"
+    )
+
+    series = ExchangeAPI.load_market_data_file(str(file), as_series=True)
+
+    assert series.to_dicts() == (
+        {"ts": 1655407800, "open": 2.0, "high": 3.0, "low": 1.0, "close": 2.5},
+        {"ts": 1655409600, "open": 2.5, "high": 4.0, "low": 2.0, "close": 3.5},
+    )
@@ -9,16 +9,16 @@ def test_get_available_markets_ok(
 ):
     """Tests if available markets is extracted in desired format"""
 
-    def send_priv_request_mock(self):  # pylint: disable=unused-argument
+    def send_pub_request_mock(self):  # pylint: disable=unused-argument
         return kucoin_markets_ok_resp
 
-    def get_symbol_ticker_mock():
+    def get_exchange_info_mock():
         return binance_markets_ok_resp
 
-    monkeypatch.setattr(binance_client.client, "get_symbol_ticker", get_symbol_ticker_mock)
-    monkeypatch.setattr(kucoin_client, "send_priv_request", send_priv_request_mock)
+    monkeypatch.setattr(binance_client.client, "get_exchange_info", get_exchange_info_mock)
+    monkeypatch.setattr(kucoin_client, "send_pub_request", send_pub_request_mock)
 
-    expected_result = ("REQETH", "REQBTC", "NULSETH")
+    expected_result = ("REQ-ETH", "REQ-BTC", "NULS-ETH")
 
     assert kucoin_client.get_available_markets() == expected_result
     assert binance_client.get_available_markets() == expected_result
@@ -29,14 +29,14 @@ def test_get_candles(
 ):
     """Tests if proper candles tuple is returned"""
 
-    def send_priv_request_mock(self, data):  # pylint: disable=unused-argument
+    def send_pub_request_mock(self, data):  # pylint: disable=unused-argument
         return kucoin_klines_resp
 
-    def get_historical_klines_mock(**kwargs):  # pylint: disable=unused-argument
+    def get_klines_mock(**kwargs):  # pylint: disable=unused-argument
         return binance_klines_resp
 
-    monkeypatch.setattr(kucoin_client, "send_priv_request", send_priv_request_mock)
-    monkeypatch.setattr(binance_client.client, "get_historical_klines", get_historical_klines_mock)
+    monkeypatch.setattr(kucoin_client, "send_pub_request", send_pub_request_mock)
+    monkeypatch.setattr(binance_client.client, "get_klines", get_klines_mock)
 
     klines_kucoin = kucoin_client.get_candles("BTC", "USDT", "30min", "2022-06-15", "2022-06-17")
     klines_binance = binance_client.get_candles("BTC", "USDT", "30m", "2022-06-15", "2022-06-17")
@@ -51,3 +51,32 @@ def test_get_candles(
 
     assert klines_kucoin == expected_result
     assert klines_binance == expected_result
+
+
+def test_get_coins_prices(  # pylint: disable=too-many-arguments
+    kucoin_client,
+    binance_client,
+    kucoin_ticker_all_ok_resp,
+    binance_book_tickers_resp,
+    binance_tickers_exchange_info_resp,
+    monkeypatch,
+):
+    """Tests if prices of many pairs are returned in the same format"""
+
+    def send_pub_request_mock(self):  # pylint: disable=unused-argument
+        return kucoin_ticker_all_ok_resp
+
+    monkeypatch.setattr(kucoin_client, "send_pub_request", send_pub_request_mock)
+    monkeypatch.setattr(
+        binance_client.client, "get_orderbook_tickers", lambda: binance_book_tickers_resp
+    )
+    monkeypatch.setattr(
+        binance_client.client, "get_exchange_info", lambda: binance_tickers_exchange_info_resp
+    )
+
+    coins = ("ADA", "XRP", "DOGE")
+    quotes = ("BTC", "ETH")
+    expected_result = {"ADA-BTC": "0.00002375", "XRP-BTC": "0.00001616", "ADA-ETH": "0.00032010"}
+
+    assert kucoin_client.get_coins_prices(coins, quotes) == expected_result
+    assert binance_client.get_coins_prices(coins, quotes) == expected_result
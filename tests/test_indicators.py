@@ -0,0 +1,124 @@
+""" Unit tests for indicators.py """
+import math
+import random
+
+import pytest
+
+from crypto_exchange_handler.candles import CandleSeries
+from crypto_exchange_handler.indicators import (
+    RollingATR,
+    RollingEMA,
+    RollingRSI,
+    RollingSMA,
+    atr,
+    candle_columns,
+    ema,
+    rsi,
+    sma,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def make_candles(amount: int, seed: int = 0) -> list:
+    """
+    Creates random walk candles ordered from the oldest one.
+    """
+    generator = random.Random(seed)
+    candles = []
+    close = 100.0
+    for index in range(amount):
+        open_ = close
+        close = max(1.0, open_ + generator.gauss(0, 1))
+        high = max(open_, close) + generator.random()
+        low = min(open_, close) - generator.random()
+        candles.append({"ts": 60 * index, "open": open_, "high": high, "low": low, "close": close})
+    return candles
+
+
+def naive_ema(values: list, alpha: float, period: int) -> list:
+    """
+    Reference smoothing computed value by value.
+    """
+    result = [math.nan] * len(values)
+    for index in range(period - 1, len(values)):
+        if index == period - 1:
+            result[index] = sum(values[:period]) / period
+        else:
+            result[index] = result[index - 1] + alpha * (values[index] - result[index - 1])
+    return result
+
+
+def test_vectorized_match_naive_loops():
+    """Tests if vectorized indicators equal values computed in Python loops"""
+    candles = make_candles(3000)
+    columns = candle_columns(candles)
+    closes = [candle["close"] for candle in candles]
+
+    expected_sma = [math.nan] * 19 + [sum(closes[i - 19:i + 1]) / 20 for i in range(19, 3000)]
+    assert np.allclose(sma(columns["close"], 20), expected_sma, equal_nan=True)
+    assert np.allclose(
+        ema(columns["close"], 10), naive_ema(closes, 2 / 11, 10), equal_nan=True, rtol=1e-9
+    )
+
+    ranges = [candles[0]["high"] - candles[0]["low"]] + [
+        max(cur["high"] - cur["low"], abs(cur["high"] - prev["close"]),
+            abs(cur["low"] - prev["close"]))
+        for prev, cur in zip(candles, candles[1:])
+    ]
+    assert np.allclose(
+        atr(columns["high"], columns["low"], columns["close"], 14),
+        naive_ema(ranges, 1 / 14, 14),
+        equal_nan=True,
+    )
+
+    values = rsi(columns["close"], 14)
+    assert np.isnan(values[:14]).all() and not np.isnan(values[14:]).any()
+    assert ((values[14:] >= 0) & (values[14:] <= 100)).all()
+
+
+def test_candle_columns_ordered_from_oldest():
+    """Tests if candles from get_candles, newest first, are reversed"""
+    candles = make_candles(5)
+    newest_first = list(reversed(candles))
+
+    columns = candle_columns(newest_first)
+    series_columns = candle_columns(CandleSeries.from_dicts(newest_first))
+
+    assert list(columns["ts"]) == [0, 60, 120, 180, 240]
+    assert np.array_equal(series_columns["close"], columns["close"])
+
+
+def test_rolling_match_vectorized():
+    """Tests if indicators updated candle by candle equal vectorized ones"""
+    candles = make_candles(500, seed=1)
+    columns = candle_columns(candles)
+    expected = {
+        "sma": sma(columns["close"], 20),
+        "ema": ema(columns["close"], 20),
+        "atr": atr(columns["high"], columns["low"], columns["close"]),
+        "rsi": rsi(columns["close"]),
+    }
+    rolling = {
+        "sma": RollingSMA(20), "ema": RollingEMA(20), "atr": RollingATR(), "rsi": RollingRSI()
+    }
+
+    for name, indicator in rolling.items():
+        values = [indicator.update(candle) for candle in candles]
+        assert np.allclose(values, expected[name], equal_nan=True), name
+
+
+def test_rolling_replaces_open_candle():
+    """Tests if polling the same open candle again does not count it twice"""
+    candles = make_candles(60, seed=2)
+    indicators = [RollingSMA(10), RollingEMA(10), RollingATR(10), RollingRSI(10)]
+    reference = [RollingSMA(10), RollingEMA(10), RollingATR(10), RollingRSI(10)]
+
+    for indicator, expected in zip(indicators, reference):
+        indicator.update_many(reversed(candles[:-1]))
+        open_candle = dict(candles[-1], close=candles[-1]["close"] + 5, high=100000.0)
+        indicator.update(open_candle)
+        indicator.update(candles[-1])
+        indicator.update(candles[0])
+
+        assert indicator.value == pytest.approx(expected.update_many(candles))
@@ -0,0 +1,85 @@
+""" Unit tests for intervals.py """
+import time
+
+import pytest
+
+from crypto_exchange_handler.intervals import (
+    PAGE_LIMITS,
+    exchange_interval,
+    parse_interval,
+    to_timestamp,
+)
+
+
+def test_spellings_of_both_exchanges():
+    """Tests if Binance and Kucoin spellings are parsed into the same interval"""
+    assert parse_interval("1min") is parse_interval("1m") is parse_interval(60)
+    assert parse_interval("4hour").binance == "4h"
+    assert parse_interval("1w").kucoin == "1week"
+    assert parse_interval("7min").seconds == 420
+    assert parse_interval("7min").native("kucoin") is None
+    assert parse_interval("1M").binance == "1M" and parse_interval("1M").months == 1
+    for invalid in ("2M", "0m", "min", "1year"):
+        with pytest.raises(ValueError):
+            parse_interval(invalid)
+
+
+def test_exchange_interval_validation():
+    """Tests if intervals not offered by exchange are rejected"""
+    assert exchange_interval("1min", "binance").binance == "1m"
+    assert exchange_interval("3d", "kucoin") is None
+    assert exchange_interval("1s", "kucoin") is None
+    assert exchange_interval("7min", "binance") is None
+    assert exchange_interval("1month", "kucoin") is None
+
+
+def test_to_timestamp_is_utc(monkeypatch):
+    """Tests if dates are converted in UTC regardless of local timezone"""
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        assert to_timestamp("2022-06-15") == 1655251200
+        assert to_timestamp("2022-6-15") == 1655251200
+        assert to_timestamp("2022-06-15T12:00:00") == 1655294400
+        assert to_timestamp("2022-06-15T12:00:00+02:00") == 1655287200
+        assert to_timestamp(1655251200) == 1655251200
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_windows_cover_range_without_overlap():
+    """Tests if windows hold full pages of candles aligned to interval starts"""
+    interval = parse_interval("1h")
+
+    windows = interval.windows(1655251230, 1655251200 + 3600 * 2500, PAGE_LIMITS["binance"])
+
+    assert windows == (
+        (1655254800, 1655254800 + 3600 * 999),
+        (1655254800 + 3600 * 1000, 1655254800 + 3600 * 1999),
+        (1655254800 + 3600 * 2000, 1655251200 + 3600 * 2500),
+    )
+    assert interval.windows(1655251230, 1655251300) == ()
+
+
+def test_weekly_windows_start_on_monday():
+    """Tests if weekly candles are aligned to Monday 00:00 UTC"""
+    windows = parse_interval("1week").windows("2022-06-15", "2022-07-15", PAGE_LIMITS["kucoin"])
+
+    # Monday 2022-06-20 and Monday 2022-07-11
+    assert windows == ((1655683200, 1657497600),)
+
+
+def test_monthly_windows_follow_calendar():
+    """Tests if monthly candles start on the first day of calendar months"""
+    interval = parse_interval("1M")
+
+    assert interval.floor(to_timestamp("2022-02-15")) == to_timestamp("2022-02-01")
+    assert interval.ceil(to_timestamp("2022-02-15")) == to_timestamp("2022-03-01")
+    assert interval.ceil(to_timestamp("2022-03-01")) == to_timestamp("2022-03-01")
+    assert interval.windows("2021-12-10", "2022-05-31", limit=2) == (
+        (to_timestamp("2022-01-01"), to_timestamp("2022-02-01")),
+        (to_timestamp("2022-03-01"), to_timestamp("2022-04-01")),
+        (to_timestamp("2022-05-01"), to_timestamp("2022-05-01")),
+    )
+    assert exchange_interval("1M", "kucoin") is None
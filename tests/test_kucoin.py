@@ -1,5 +1,10 @@
 """ Unit tests for kucoin.py """
+import base64
+import hashlib
+import hmac
+
 from crypto_exchange_handler.exchange_template import MarketSide
+from crypto_exchange_handler.kucoin import Kucoin, RequestSigner
 
 
 def test_kucoin_object_created(kucoin_client):
@@ -17,10 +22,10 @@ def test_get_balance(kucoin_client):
 def test_get_available_markets_nok(kucoin_client, kucoin_nok_resp, monkeypatch):
     """Tests if None is returned in case of error in response"""
 
-    def send_priv_request_mock(self):  # pylint: disable=unused-argument
+    def send_pub_request_mock(self):  # pylint: disable=unused-argument
         return kucoin_nok_resp
 
-    monkeypatch.setattr(kucoin_client, "send_priv_request", send_priv_request_mock)
+    monkeypatch.setattr(kucoin_client, "send_pub_request", send_pub_request_mock)
 
     assert kucoin_client.get_available_markets() is None
 
@@ -28,10 +33,10 @@ def test_get_available_markets_nok(kucoin_client, kucoin_nok_resp, monkeypatch):
 def test_get_coin_price(kucoin_client, kucoin_ticker_ok_resp, monkeypatch):
     """Tests if coin price for given coin has been gathered correctly"""
 
-    def send_priv_request_mock(self, data):  # pylint: disable=unused-argument
+    def send_pub_request_mock(self, data):  # pylint: disable=unused-argument
         return kucoin_ticker_ok_resp
 
-    monkeypatch.setattr(kucoin_client, "send_priv_request", send_priv_request_mock)
+    monkeypatch.setattr(kucoin_client, "send_pub_request", send_pub_request_mock)
 
     ask_price = kucoin_client.get_coin_price("COIN", "PAIR", MarketSide.ASK)
     bid_price = kucoin_client.get_coin_price("COIN", "PAIR", MarketSide.BID)
@@ -45,10 +50,10 @@ def test_get_coin_price(kucoin_client, kucoin_ticker_ok_resp, monkeypatch):
 def test_get_coins_prices(kucoin_client, kucoin_ticker_all_ok_resp, monkeypatch):
     """Tests if coins prices for given tuple has been gathered correctly"""
 
-    def send_priv_request_mock(self):  # pylint: disable=unused-argument
+    def send_pub_request_mock(self):  # pylint: disable=unused-argument
         return kucoin_ticker_all_ok_resp
 
-    monkeypatch.setattr(kucoin_client, "send_priv_request", send_priv_request_mock)
+    monkeypatch.setattr(kucoin_client, "send_pub_request", send_pub_request_mock)
 
     ask_prices = kucoin_client.get_coins_prices(("ADA", "XRP"), "BTC", MarketSide.ASK)
     bid_prices = kucoin_client.get_coins_prices(("ADA", "XRP"), price_type=MarketSide.BID)
@@ -58,14 +63,17 @@ def test_get_coins_prices(kucoin_client, kucoin_ticker_all_ok_resp, monkeypatch)
     assert bid_prices == {"ADA-BTC": "0.00002373", "XRP-BTC": "0.00001614"}
     assert latest_prices == {"ADA-BTC": "0.00002375"}
 
+    multi_quote_prices = kucoin_client.get_coins_prices({"ADA", "DOGE"}, ("BTC", "ETH"))
+    assert multi_quote_prices == {"ADA-BTC": "0.00002375", "ADA-ETH": "0.00032010"}
+
 
 # def test_get_order_book(kucoin_client, kucoin_klines_resp, monkeypatch):
 #     """Tests if proper candles tuple is returned"""
 #
-#     def send_priv_request_mock(self, data):  # pylint: disable=unused-argument
+#     def send_pub_request_mock(self, data):  # pylint: disable=unused-argument
 #         return kucoin_klines_resp
 #
-#     monkeypatch.setattr(kucoin_client, "send_priv_request", send_priv_request_mock)
+#     monkeypatch.setattr(kucoin_client, "send_pub_request", send_pub_request_mock)
 #
 #     klines = kucoin_client.get_candles("BTC-USDT", "30min", "2022-06-15", "2022-06-17")
 #
@@ -78,3 +86,66 @@ def test_get_coins_prices(kucoin_client, kucoin_ticker_all_ok_resp, monkeypatch)
 #     )
 #
 #     assert klines == expected_result
+
+
+def test_get_candles_paginated(kucoin_client, monkeypatch):
+    """Tests if long range is fetched in pages and merged without duplicates"""
+    requested = []
+
+    def send_pub_request_mock(self, data):  # pylint: disable=unused-argument
+        requested.append(data)
+        start, end = int(data["startAt"]), int(data["endAt"])
+        # exchange returns candles from the newest one, including candle starting at endAt
+        candles = [[str(ts), "1", "2", "3", "0.5"] for ts in range(end, start - 1, -60)]
+        return {"code": "200000", "data": candles[:1500]}
+
+    monkeypatch.setattr(kucoin_client, "send_pub_request", send_pub_request_mock)
+
+    klines = kucoin_client.get_candles("BTC", "USDT", "1min", "2022-06-01", "2022-06-06")
+
+    timestamps = [kline["ts"] for kline in klines]
+    assert len(requested) == 5
+    assert timestamps == sorted(set(timestamps), reverse=True)
+    assert len(timestamps) == 5 * 24 * 60 + 1
+
+
+def test_request_signer():
+    """Tests if signature made with prepared key matches signature of the secret"""
+    headers = RequestSigner("access", "secret", "passphrase").headers(
+        "post", "orders", '{"side": "buy"}'
+    )
+
+    expected = hmac.new(
+        b"secret",
+        f'{headers["KC-API-TIMESTAMP"]}POST/api/v1/orders{{"side": "buy"}}'.encode("utf-8"),
+        hashlib.sha256,
+    ).digest()
+    assert headers["KC-API-SIGN"] == base64.b64encode(expected).decode("utf-8")
+    assert headers["KC-API-KEY"] == "access"
+    assert headers["KC-API-PASSPHRASE"] == "passphrase"
+
+
+def test_public_requests_not_signed(http_stub_server, kucoin_ticker_ok_resp):
+    """Tests if market data is requested without keys and private requests are signed"""
+    http_stub_server.routes["/api/v1/market/orderbook/level1"] = kucoin_ticker_ok_resp
+    http_stub_server.routes["/api/v1/accounts"] = {"code": "200000", "data": []}
+    client = Kucoin("access", "secret", "passphrase")
+    client.api_addr = http_stub_server.url
+
+    assert client.get_coin_price("BTC", "USDT") == "19284.4"
+    client.send_priv_request("accounts", {"currency": "BTC"})
+    client.close()
+
+    (_, public_path, public_headers), (_, private_path, private_headers) = (
+        http_stub_server.requests
+    )
+    assert public_path == "/api/v1/market/orderbook/level1?symbol=BTC-USDT"
+    assert not any(name.startswith("KC-API") for name in public_headers)
+    assert private_path == "/api/v1/accounts?currency=BTC"
+    assert private_headers["KC-API-KEY"] == "access"
+    expected = hmac.new(
+        b"secret",
+        f'{private_headers["KC-API-TIMESTAMP"]}GET/api/v1/accounts?currency=BTC'.encode("utf-8"),
+        hashlib.sha256,
+    ).digest()
+    assert private_headers["KC-API-SIGN"] == base64.b64encode(expected).decode("utf-8")
@@ -0,0 +1,66 @@
+""" Unit tests of numeric order book """
+import pytest
+
+from crypto_exchange_handler.exchange_template import MarketSide
+from crypto_exchange_handler.numeric_book import NumericOrderBook
+
+ORDER_BOOK = {
+    MarketSide.ASK: [["10.1", "2"], ["10.2", "1"], ["10.5", "4"]],
+    MarketSide.BID: [["10.0", "1"], ["9.9", "3"], ["9.5", "2"]],
+}
+
+
+def test_numeric_order_book_metrics():
+    """Tests if spread, mid, depth and vwap are calculated from arrays"""
+    np = pytest.importorskip("numpy")
+    book = NumericOrderBook.from_dict(ORDER_BOOK)
+
+    assert len(book) == 6
+    assert book.best(MarketSide.ASK) == 10.1
+    assert book.spread() == pytest.approx(0.1)
+    assert book.mid() == pytest.approx(10.05)
+    assert np.array_equal(book.cumulative_depth(MarketSide.BID), [1.0, 4.0, 6.0])
+    assert book.cumulative_notional(MarketSide.ASK)[-1] == pytest.approx(72.4)
+    assert book.vwap(MarketSide.ASK, 1) == pytest.approx(10.1)
+    assert book.vwap(MarketSide.ASK, 3) == pytest.approx((2 * 10.1 + 10.2) / 3)
+    assert book.vwap(MarketSide.BID, 5) == pytest.approx((10.0 + 3 * 9.9 + 9.5) / 5)
+    assert book.vwap(MarketSide.BID, 7) is None
+    assert np.array_equal(book.ticks(MarketSide.ASK, 0.1), [101, 102, 105])
+
+
+def test_numeric_order_book_sorting():
+    """Tests if unsorted and empty sides are handled"""
+    pytest.importorskip("numpy")
+    book = NumericOrderBook.from_dict(
+        {MarketSide.ASK: [["10.5", "4"], ["10.1", "2"]], MarketSide.BID: []}
+    )
+
+    assert list(book.prices[MarketSide.ASK]) == [10.1, 10.5]
+    assert list(book.sizes[MarketSide.ASK]) == [2.0, 4.0]
+    assert book.best(MarketSide.BID) is None
+    assert book.spread() is None
+
+
+def test_numeric_order_book_large():
+    """Tests if thousands of string levels are converted in one pass"""
+    pytest.importorskip("numpy")
+    levels = [[f"{100 + i / 100:.2f}", "1.5"] for i in range(5000)]
+    book = NumericOrderBook.from_dict({MarketSide.ASK: levels, MarketSide.BID: levels[::-1]})
+
+    assert book.cumulative_depth(MarketSide.ASK)[-1] == 7500.0
+    assert book.best(MarketSide.BID) == 149.99
+
+
+def test_get_order_book_numeric(binance_client, binance_order_book_resp, monkeypatch):
+    """Tests if clients return numeric order book on request"""
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(
+        binance_client.client, "get_order_book", lambda **kwargs: binance_order_book_resp
+    )
+
+    book = binance_client.get_order_book("ADA", "BTC", numeric=True)
+
+    assert book.best(MarketSide.ASK) == 4.000002
+    assert book.best(MarketSide.BID) == 4.0
+    order_book = binance_client.get_order_book("ADA", "BTC")
+    assert order_book[MarketSide.BID][0] == ["4.00000000", "431.00000000"]
@@ -0,0 +1,160 @@
+""" Unit tests of local order book engine """
+import threading
+
+from crypto_exchange_handler.exchange_template import MarketSide
+from crypto_exchange_handler.order_book import BookSide, OrderBook
+from crypto_exchange_handler.streaming import BinanceStream, Channel
+
+SNAPSHOT = {
+    "sequence": 100,
+    MarketSide.ASK: [["10.2", "1"], ["10.1", "2"], ["10.3", "5"]],
+    MarketSide.BID: [["9.9", "3"], ["10.0", "1"], ["9.8", "4"]],
+}
+
+
+def test_book_side_best_level():
+    """Tests if the best level is found after removals and compaction of the heap"""
+    asks = BookSide(descending=False)
+    bids = BookSide(descending=True)
+    for price in range(1, 1001):
+        asks.set(str(price), "1")
+        bids.set(str(price), "1")
+    for price in range(1, 1000):
+        asks.set(str(price), "0")
+        asks.set(str(1000 - price), "2")
+        asks.set(str(1000 - price), "0")
+
+    assert asks.best() == ["1000", "1"]
+    assert len(asks) == 1
+    assert bids.best() == ["1000", "1"]
+    assert bids.levels(3) == [["1000", "1"], ["999", "1"], ["998", "1"]]
+    asks.set("1000", "0")
+    assert asks.best() is None
+
+
+def test_order_book_updates():
+    """Tests if diffs are applied and updates older than the book are ignored"""
+    book = OrderBook()
+    book.apply_snapshot(SNAPSHOT)
+
+    assert book.best_ask() == ["10.1", "2"]
+    assert book.best_bid() == ["10.0", "1"]
+    assert book.update(95, 100, [["10.05", "9"]], [])
+    assert book.update(101, 102, [["10.0", "0"], ["9.95", "7"]], [["10.1", "0"]])
+    assert book.update(103, 103, [], [["10.3", "6"]])
+
+    assert book.sequence == 103
+    assert book.to_dict(2) == {
+        MarketSide.ASK: [["10.2", "1"], ["10.3", "6"]],
+        MarketSide.BID: [["9.95", "7"], ["9.9", "3"]],
+    }
+    assert book.to_dict()[MarketSide.BID] == [["9.95", "7"], ["9.9", "3"], ["9.8", "4"]]
+
+
+def test_order_book_resync_after_gap():
+    """Tests if gap in sequence loads snapshot and replays buffered updates"""
+    snapshots = [SNAPSHOT, dict(SNAPSHOT, sequence=110)]
+    book = OrderBook(lambda: snapshots.pop(0), resync_delay=0)
+
+    assert book.update(99, 101, [], [["10.1", "8"]])
+    assert book.resyncs == 1
+    assert book.best_ask() == ["10.1", "8"]
+
+    assert book.update(105, 111, [["10.0", "5"]], [])
+    assert book.resyncs == 2
+    assert book.synced
+    assert book.sequence == 111
+    assert book.best_bid() == ["10.0", "5"]
+    assert book.best_ask() == ["10.1", "2"]
+
+
+def test_order_book_waits_for_newer_snapshot():
+    """Tests if updates are buffered while snapshot is older than the stream"""
+    snapshots = [SNAPSHOT, dict(SNAPSHOT, sequence=103)]
+    book = OrderBook(lambda: snapshots.pop(0), resync_delay=0)
+
+    assert not book.update(102, 103, [], [["10.1", "0"]])
+    assert not book.synced
+    assert book.update(104, 104, [], [["10.2", "0"]])
+    assert book.resyncs == 2
+    assert book.sequence == 104
+    assert book.asks.levels() == [["10.1", "2"], ["10.3", "5"]]
+
+
+def test_order_book_resync_outside_of_book():
+    """Tests if snapshot requested by start_resync is loaded only once"""
+    book = OrderBook(resync_delay=0)
+
+    assert not book.update(101, 101, [], [["10.1", "8"]])
+    assert book.start_resync()
+    assert not book.start_resync()
+    assert not book.update(102, 102, [], [["10.2", "0"]])
+    assert book.finish_resync(SNAPSHOT)
+    assert book.sequence == 102
+    assert book.asks.levels() == [["10.1", "8"], ["10.3", "5"]]
+
+
+def test_order_book_change_sequences():
+    """Tests if Kucoin changes already included in the book are skipped"""
+    book = OrderBook()
+    book.apply_snapshot(SNAPSHOT)
+
+    assert book.update(99, 102, [["10.0", "0", "99"], ["9.9", "0", "101"]], [])
+
+    assert book.best_bid() == ["10.0", "1"]
+    assert book.bids.levels() == [["10.0", "1"], ["9.8", "4"]]
+
+
+def test_binance_order_book_snapshot(binance_client, binance_order_book_resp, monkeypatch):
+    """Tests if snapshot keeps sequence number of the order book"""
+
+    def get_order_book_mock(**kwargs):
+        assert kwargs == {"symbol": "ADABTC", "limit": 1000}
+        return binance_order_book_resp
+
+    monkeypatch.setattr(binance_client.client, "get_order_book", get_order_book_mock)
+
+    snapshot = binance_client.get_order_book_snapshot("ada", "btc")
+
+    assert snapshot["sequence"] == 1027024
+    assert snapshot[MarketSide.ASK] == binance_order_book_resp["asks"]
+
+
+def test_stream_diff_order_book(
+    websocket_stub_server, binance_depth_diff_messages, binance_order_book_resp
+):
+    """Tests if stream keeps local order book synchronized with diff messages"""
+    websocket_stub_server.replay = binance_depth_diff_messages
+    snapshot = {
+        "sequence": binance_order_book_resp["lastUpdateId"],
+        MarketSide.ASK: binance_order_book_resp["asks"],
+        MarketSide.BID: binance_order_book_resp["bids"],
+    }
+    requested = []
+    release = threading.Event()
+
+    def snapshot_loader(coin, quote):
+        requested.append((coin, quote))
+        release.wait(5)
+        return snapshot
+
+    stream = BinanceStream(websocket_stub_server.url, snapshot_loader=snapshot_loader)
+    stream.subscribe(Channel.DIFF, "ADA", "BTC")
+
+    stream.start()
+    try:
+        # diffs are received and buffered while snapshot is still loading
+        assert stream.state.wait_for_updates(2, timeout=5)
+        assert stream.get_order_book("ADA", "BTC") is None
+        release.set()
+        assert stream.state.wait_for_updates(3, timeout=5)
+    finally:
+        release.set()
+        stream.stop()
+
+    assert websocket_stub_server.paths == ["/stream?streams=adabtc@depth@100ms"]
+    assert requested == [("ADA", "BTC")]
+    assert stream.get_order_book("ADA", "BTC") == {
+        MarketSide.ASK: [["4.00000100", "7.00000000"], ["4.01000000", "3.50000000"]],
+        MarketSide.BID: [["3.99500000", "20.00000000"], ["3.99000000", "12.00000000"]],
+    }
@@ -0,0 +1,70 @@
+""" Unit tests for order_id.py """
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from crypto_exchange_handler.order_id import ORDER_IDS, OrderIdGenerator
+from crypto_exchange_handler.orders import OrderRequest
+from crypto_exchange_handler.pair import Pair
+
+BINANCE_CLIENT_ID = re.compile(r"^[.A-Z:/a-z0-9_-]{1,36}$")
+
+
+def test_ids_unique_and_increasing_between_threads():
+    """Tests if ids taken concurrently never repeat and sort in order of generation"""
+    generator = OrderIdGenerator()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        batches = list(
+            executor.map(lambda _: [generator.next_id() for _ in range(5000)], range(8))
+        )
+
+    ids = [order_id for batch in batches for order_id in batch]
+    assert len(set(ids)) == len(ids)
+    assert all(batch == sorted(batch) for batch in batches)
+    assert all(BINANCE_CLIENT_ID.match(order_id) for order_id in ids)
+
+
+def test_ids_unique_after_restart():
+    """Tests if generators started at the same or later time produce different ids"""
+    first = OrderIdGenerator(clock=lambda: 1655652600.0)
+    same_time = OrderIdGenerator(clock=lambda: 1655652600.0)
+    restarted = OrderIdGenerator(clock=lambda: 1655652600.5)
+
+    assert first.next_id() != same_time.next_id()
+    assert restarted.next_id() > first.next_id()
+    assert first.next_id().startswith("handler_")
+    assert OrderIdGenerator("bot").next_id().startswith("bot_")
+
+
+def test_id_format():
+    """Tests if many ids keep fixed length and format, cost is measured by bench_order_id"""
+    ids = [ORDER_IDS.next_id() for _ in range(100000)]
+
+    assert len(set(ids)) == len(ids)
+    assert {len(order_id) for order_id in ids} == {34}
+    assert all(BINANCE_CLIENT_ID.match(order_id) for order_id in ids)
+    assert int(ids[-1][-8:], 16) - int(ids[0][-8:], 16) == len(ids) - 1
+
+
+def test_orders_get_client_ids(kucoin_client, kucoin_markets_ok_resp, monkeypatch):
+    """Tests if client order id is assigned before sending and reused by retries"""
+    sent = []
+
+    def send_priv_request_mock(addr, data=None, req_type="get"):  # pylint: disable=unused-argument
+        sent.append(data["clientOid"])
+        if len(sent) == 1:
+            return {"code": "429000", "msg": "Too Many Requests"}
+        return {"code": "200000", "data": {"orderId": "5bd6e9286d99522a52e458de"}}
+
+    monkeypatch.setattr(kucoin_client, "send_pub_request", lambda addr: kucoin_markets_ok_resp)
+    monkeypatch.setattr(kucoin_client, "send_priv_request", send_priv_request_mock)
+    kucoin_client.order_ids = OrderIdGenerator("test")
+
+    order = OrderRequest(Pair.of("REQ", "BTC"), "buy", "10", "0.0000025")
+    result = next(kucoin_client.create_orders([order]))
+    assert not result.ok
+    retried = next(kucoin_client.create_orders([result.request]))
+
+    assert retried.ok
+    assert sent[0] == sent[1] == result.request.client_oid
+    assert sent[0].startswith("test_")
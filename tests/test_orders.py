@@ -0,0 +1,115 @@
+""" Unit tests for orders.py and batch order placement of exchange clients """
+import threading
+
+from crypto_exchange_handler.balances import Balances
+from crypto_exchange_handler.orders import OrderRequest, validate_order
+from crypto_exchange_handler.pair import Pair
+from crypto_exchange_handler.symbols import binance_symbol_index
+
+REQ_BTC = Pair.of("REQ", "BTC")
+
+
+def test_validate_order(binance_markets_ok_resp):
+    """Tests if orders breaking market rules are rejected before sending"""
+    index = binance_symbol_index(binance_markets_ok_resp)
+    info = index.find(REQ_BTC)
+
+    assert validate_order(OrderRequest(REQ_BTC, "buy", "10", "0.00000250"), info) is None
+    assert validate_order(OrderRequest(REQ_BTC, "sell", amount="0.01"), info) is None
+    assert "not listed" in validate_order(OrderRequest(REQ_BTC, "buy", "10"), None)
+    nuls = Pair.of("NULS", "ETH")
+    assert "not trading" in validate_order(OrderRequest(nuls, "buy", "1"), index.find(nuls))
+    assert "side" in validate_order(OrderRequest(REQ_BTC, "hold", "10"), info)
+    assert "exactly one" in validate_order(OrderRequest(REQ_BTC, "buy", "10", amount="1"), info)
+    assert "requires size" in validate_order(
+        OrderRequest(REQ_BTC, "buy", price="0.1", amount="1"), info
+    )
+    assert "decimal" in validate_order(OrderRequest(REQ_BTC, "buy", "ten"), info)
+    for value in ("nan", "sNaN", "inf", "-Infinity"):
+        assert "decimal" in validate_order(OrderRequest(REQ_BTC, "buy", value), info)
+        assert "decimal" in validate_order(OrderRequest(REQ_BTC, "buy", "10", value), info)
+        assert "decimal" in validate_order(OrderRequest(REQ_BTC, "buy", amount=value), info)
+    assert "positive" in validate_order(OrderRequest(REQ_BTC, "buy", "-1"), info)
+    assert "minimum" in validate_order(OrderRequest(REQ_BTC, "buy", "0.5"), info)
+    assert "multiple of 1" in validate_order(OrderRequest(REQ_BTC, "buy", "10.5"), info)
+    assert "price" in validate_order(OrderRequest(REQ_BTC, "buy", "10", "0.000000001"), info)
+
+
+def test_kucoin_batches_limit_orders(kucoin_client, kucoin_markets_ok_resp, monkeypatch):
+    """Tests if limit orders are sent in batches of five and market orders separately"""
+    requests = []
+
+    def send_priv_request_mock(addr, data=None, req_type="get"):  # pylint: disable=unused-argument
+        requests.append((addr, data))
+        if addr == "orders":
+            return {"code": "200000", "data": {"orderId": "single"}}
+        items = [
+            {"clientOid": item["clientOid"], "id": f'id_{item["clientOid"]}', "status": "success"}
+            for item in data["orderList"]
+        ]
+        items[-1].update(status="fail", failMsg="Balance insufficient!")
+        return {"code": "200000", "data": {"data": items}}
+
+    monkeypatch.setattr(kucoin_client, "send_pub_request", lambda addr: kucoin_markets_ok_resp)
+    monkeypatch.setattr(kucoin_client, "send_priv_request", send_priv_request_mock)
+    kucoin_client.balances.set(Balances())
+
+    orders = [OrderRequest(REQ_BTC, "buy", str(size), "0.0000025") for size in range(1, 13)]
+    orders.append(OrderRequest(Pair.of("REQ", "ETH"), "sell", amount="0.5"))
+    orders.append(OrderRequest(Pair.of("ADA", "BTC"), "buy", "10"))
+    results = list(kucoin_client.create_orders(orders))
+
+    assert results[0].error == "market ADA-BTC is not listed"
+    assert len(results) == 14
+    assert sorted(len(data.get("orderList", [data])) for _, data in requests) == [1, 2, 5, 5]
+    multi = [data for addr, data in requests if addr == "orders/multi"]
+    assert all(data["symbol"] == "REQ-BTC" for data in multi)
+    single = [data for addr, data in requests if addr == "orders"][0]
+    assert single["type"] == "market" and single["funds"] == "0.5"
+    failed = [result for result in results[1:] if not result.ok]
+    assert [result.error for result in failed] == ["Balance insufficient!"] * 3
+    assert sum(result.ok for result in results) == 10
+    assert len({result.request.client_oid for result in results[1:]}) == 13
+    assert not kucoin_client.balances.is_fresh()
+
+
+def test_binance_orders_sent_concurrently(binance_client, binance_markets_ok_resp, monkeypatch):
+    """Tests if orders are placed concurrently and results are streamed when ready"""
+    lock = threading.Lock()
+    # the test thread passes only when seven blocked orders are in flight at once
+    in_flight = threading.Barrier(8, timeout=5)
+    release = threading.Event()
+    placed = []
+
+    def create_order_mock(**params):
+        if params["newClientOrderId"] != "0":
+            in_flight.wait()
+            assert release.wait(5)
+        with lock:
+            placed.append(params)
+            return {"orderId": len(placed)}
+
+    monkeypatch.setattr(binance_client.client, "get_exchange_info", lambda: binance_markets_ok_resp)
+    monkeypatch.setattr(binance_client.client, "create_order", create_order_mock)
+
+    results = binance_client.create_orders(
+        OrderRequest(REQ_BTC, "buy", "10", "0.00000250", client_oid=str(num)) for num in range(8)
+    )
+    first = next(results)
+    assert first.request.client_oid == "0"
+    in_flight.wait()
+    release.set()
+    results = [first, *results]
+
+    assert all(result.ok for result in results)
+    assert sorted(result.order_id for result in results) == [str(num) for num in range(1, 9)]
+    assert placed[0]["symbol"] == "REQBTC" and placed[0]["timeInForce"] == "GTC"
+
+
+def test_create_order(binance_client, binance_markets_ok_resp, monkeypatch):
+    """Tests if single limit order is placed and invalid one is rejected"""
+    monkeypatch.setattr(binance_client.client, "get_exchange_info", lambda: binance_markets_ok_resp)
+    monkeypatch.setattr(binance_client.client, "create_order", lambda **params: {"orderId": 7})
+
+    assert binance_client.create_order("REQ-BTC", "sell", "0.00000250", "3").order_id == "7"
+    assert binance_client.create_order("REQ/BTC", "sell", "0.00000250", "0.3") is None
@@ -0,0 +1,49 @@
+""" Unit tests for pair.py """
+import pickle
+
+import pytest
+
+from crypto_exchange_handler.pair import Pair, as_pair
+from crypto_exchange_handler.symbols import binance_symbol_index
+
+
+def test_pair_is_interned():
+    """Tests if equal pairs are the same object with native spellings"""
+    pair = Pair.of("ada", "btc")
+
+    assert pair is Pair.of("ADA", "BTC")
+    assert pair is Pair.parse("ADA/BTC")
+    assert pair is Pair.parse("ada_btc")
+    assert pair is pickle.loads(pickle.dumps(pair))
+    assert (pair.base, pair.quote) == ("ADA", "BTC")
+    assert (pair.binance, pair.kucoin) == ("ADABTC", "ADA-BTC")
+    assert repr(pair) == "Pair('ADA', 'BTC')"
+
+
+def test_pair_is_string_key():
+    """Tests if Pair and its canonical spelling are interchangeable dictionary keys"""
+    prices = {Pair.of("ADA", "BTC"): "0.00002375"}
+
+    assert prices["ADA-BTC"] == "0.00002375"
+    assert {"ADA-BTC": "0.00002375"} == prices
+    assert Pair.parse("XRP-BTC") in {"XRP-BTC"}
+
+
+def test_parse_errors_and_as_pair():
+    """Tests if symbols without separator are rejected and arguments are resolved"""
+    with pytest.raises(ValueError):
+        Pair.parse("ADABTC")
+
+    pair = Pair.of("XRP", "ETH")
+    assert as_pair(pair, "BTC") is pair
+    assert as_pair("xrp", "eth") is pair
+    assert as_pair("XRP-ETH") is pair
+
+
+def test_symbol_index_by_pair(binance_markets_ok_resp):
+    """Tests if markets are found by Pair and listed as pairs"""
+    index = binance_symbol_index(binance_markets_ok_resp)
+
+    assert index.find(Pair.of("REQ", "BTC")).symbol == "REQBTC"
+    assert index.find("req", "eth").pair is Pair.of("REQ", "ETH")
+    assert index.pairs() == ("REQ-ETH", "REQ-BTC", "NULS-ETH")
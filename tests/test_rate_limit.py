@@ -0,0 +1,85 @@
+""" Unit tests for rate_limit.py """
+import asyncio
+import threading
+
+import pytest
+
+from crypto_exchange_handler import binance, kucoin
+from crypto_exchange_handler.kucoin import Kucoin
+from crypto_exchange_handler.rate_limit import TokenBucket, WeightScheduler
+
+
+def test_token_bucket_burst_and_delay():
+    """Tests if bucket allows burst up to capacity and delays further requests"""
+    bucket = TokenBucket(capacity=3, rate=10)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert 0.09 < bucket.reserve() <= 0.1
+
+
+def test_binance_request_weights():
+    """Tests if weight of request depends on endpoint and its params"""
+    scheduler = binance.create_scheduler()
+
+    assert scheduler.cost("api/v3/depth") == ("weight", 5)
+    assert scheduler.cost("api/v3/depth", {"limit": 1000}) == ("weight", 50)
+    assert scheduler.cost("api/v3/depth", {"limit": 5000}) == ("weight", 250)
+    assert scheduler.cost("api/v3/ticker/bookTicker") == ("weight", 4)
+    assert scheduler.cost("api/v3/ticker/bookTicker", {"symbol": "ADABTC"}) == ("weight", 2)
+    assert scheduler.cost("api/v3/order") == ("orders", 1)
+    assert scheduler.cost("api/v3/unknown") == ("weight", 1)
+
+
+def test_scheduler_corrected_by_headers():
+    """Tests if limit usage reported by exchange lowers local buckets"""
+    scheduler = binance.create_scheduler()
+
+    scheduler.update_from_headers("api/v3/depth", {"x-mbx-used-weight-1m": "5990"})
+    assert scheduler.pools["weight"].available() == pytest.approx(10, abs=1)
+    scheduler.update_from_headers("api/v3/depth", {"x-mbx-used-weight-1m": "10"})
+    assert scheduler.pools["weight"].available() < 20
+    assert scheduler.reserve("api/v3/depth", {"limit": 1000}) > 0.3
+
+    scheduler = kucoin.create_scheduler()
+    scheduler.update_from_headers("accounts", {"gw-ratelimit-remaining": "3"})
+    assert scheduler.pools["management"].available() == pytest.approx(3, abs=1)
+    assert scheduler.pools["public"].available() == 2000
+
+
+def test_scheduler_metrics():
+    """Tests if queued requests and waiting time are reported"""
+    scheduler = WeightScheduler(
+        pools={"weight": TokenBucket(capacity=2, rate=100)},
+        weights={"heavy": ("weight", 2)},
+        default=("weight", 1),
+    )
+
+    threads = [
+        threading.Thread(target=scheduler.acquire, args=("heavy",)) for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    asyncio.run(scheduler.acquire_async("light"))
+    metrics = scheduler.metrics()
+
+    assert metrics["requests"] == 6
+    assert metrics["queued"] == 0
+    assert 1 <= metrics["max_queued"] <= 5
+    assert 0.07 < metrics["max_wait"] <= 0.08
+    assert metrics["wait_time"] == pytest.approx(0.02 + 0.04 + 0.06 + 0.08, abs=0.01)
+
+
+def test_kucoin_reads_limit_headers(http_stub_server, kucoin_ticker_ok_resp):
+    """Tests if Kucoin client schedules requests and reads pool quota from responses"""
+    http_stub_server.routes["/api/v1/market/orderbook/level1"] = kucoin_ticker_ok_resp
+    http_stub_server.headers = {"gw-ratelimit-remaining": "50", "gw-ratelimit-limit": "2000"}
+    client = Kucoin("access", "secret", "passphrase")
+    client.api_addr = http_stub_server.url
+
+    assert client.get_coin_price("BTC", "USDT") == "19284.4"
+    client.close()
+
+    assert client.scheduler.metrics()["requests"] == 1
+    assert client.scheduler.pools["public"].available() == pytest.approx(50, abs=1)
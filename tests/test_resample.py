@@ -0,0 +1,106 @@
+""" Unit tests for resample.py """
+import random
+
+import pytest
+
+from crypto_exchange_handler.candle_store import write_candle_file
+from crypto_exchange_handler.candles import CandleSeries
+from crypto_exchange_handler.resample import resample, resample_chunks, resample_file
+
+pytest.importorskip("numpy")
+
+START = 1655078400  # Monday 2022-06-13 00:00 UTC
+
+
+def make_candles(amount: int, step: int = 60) -> list:
+    """
+    Creates random candles ordered from the oldest one, some minutes are missing.
+    """
+    generator = random.Random(0)
+    candles = []
+    for index in range(amount):
+        if generator.random() < 0.05:
+            continue
+        open_ = round(generator.uniform(90, 110), 2)
+        close = round(generator.uniform(90, 110), 2)
+        candles.append(
+            {
+                "ts": START + step * index,
+                "open": open_,
+                "high": max(open_, close) + 1,
+                "low": min(open_, close) - 1,
+                "close": close,
+            }
+        )
+    return candles
+
+
+def naive_resample(candles: list, width: int, origin: int = 0) -> list:
+    """
+    Reference aggregation grouping candle dictionaries one by one.
+    """
+    result = {}
+    for candle in sorted(candles, key=lambda candle: candle["ts"]):
+        start = (candle["ts"] - origin) // width * width + origin
+        if start not in result:
+            result[start] = dict(candle, ts=start)
+        else:
+            bucket = result[start]
+            bucket["high"] = max(bucket["high"], candle["high"])
+            bucket["low"] = min(bucket["low"], candle["low"])
+            bucket["close"] = candle["close"]
+    return list(result.values())
+
+
+def test_resample_matches_naive():
+    """Tests if 1min candles are aggregated into 7min and 2hour candles"""
+    candles = make_candles(1000)
+
+    assert resample(candles, "7min").to_dicts() == tuple(naive_resample(candles, 420))
+    assert resample(reversed(candles), "2h").to_dicts() == tuple(naive_resample(candles, 7200))
+    shuffled = random.Random(1).sample(candles, len(candles))
+    assert resample(CandleSeries.from_dicts(shuffled), 300).to_dicts() == tuple(
+        naive_resample(candles, 300)
+    )
+    assert len(resample([], "1h")) == 0
+
+
+def test_weekly_candles_start_on_monday():
+    """Tests if weekly candles are aligned to Monday like exchange candles"""
+    candles = make_candles(30, step=86400)
+
+    weeks = resample(candles, "1week")
+
+    assert [candle["ts"] for candle in weeks] == [START + 604800 * week for week in range(5)]
+    assert weeks.to_dicts() == tuple(naive_resample(candles, 604800, origin=START))
+
+
+def test_resample_file_in_chunks(tmp_path):
+    """Tests if files are resampled chunk by chunk with the same result"""
+    candles = make_candles(2000)
+    expected = resample(candles, "7min").to_dicts()
+    binary = str(tmp_path / "data.candles")
+    write_candle_file(binary, candles, "kucoin", "BTC-USDT", "1min")
+    csv_file = str(tmp_path / "data.csv")
+    with open(csv_file, "w", encoding="utf-8") as file:
+        file.write("ts,open,high,low,close\n")
+        file.writelines(
+            f'{c["ts"]},{c["open"]},{c["high"]},{c["low"]},{c["close"]}\n' for c in candles
+        )
+
+    for file in (binary, csv_file):
+        chunks = list(resample_file(file, "7min", chunk_size=37))
+        assert len(chunks) > 1
+        merged = CandleSeries()
+        for chunk in chunks:
+            merged.extend(chunk)
+        assert merged.to_dicts() == expected
+
+
+def test_unsorted_chunks_rejected():
+    """Tests if chunks going back in time are rejected"""
+    candles = make_candles(100)
+    chunks = [CandleSeries.from_dicts(candles[50:]), CandleSeries.from_dicts(candles[:50])]
+
+    with pytest.raises(ValueError):
+        list(resample_chunks(chunks, "5min"))
@@ -0,0 +1,309 @@
+""" Unit tests for retry.py and retries of exchange clients """
+import asyncio
+import time
+
+import aiohttp
+import pytest
+import requests
+from binance.exceptions import BinanceAPIException
+
+from crypto_exchange_handler.async_binance import AsyncBinance
+from crypto_exchange_handler.binance import is_retryable
+from crypto_exchange_handler.exchange_template import MarketSide
+from crypto_exchange_handler.kucoin import Kucoin
+from crypto_exchange_handler.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryableError,
+    RetryBudget,
+    RetryPolicy,
+    TransportError,
+    is_retryable_status,
+    is_transient,
+    parse_retry_after,
+)
+
+
+def failing(failures: int, exception: Exception = None):
+    """
+    :return: function raising exception on first calls and returning "ok" afterwards
+    """
+    calls = []
+
+    def func():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise exception or RetryableError("unavailable")
+        return "ok"
+
+    func.calls = calls
+    return func
+
+
+def binance_error(status: int, method: str = "GET", retry_after: str = None):
+    """
+    :return: BinanceAPIException of response with given status
+    """
+    response = requests.Response()
+    response.status_code = status
+    response.request = requests.Request(method, "https://api.binance.com/api/v3/order").prepare()
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return BinanceAPIException(response, status, '{"code": -1003, "msg": "Too many requests"}')
+
+
+def test_backoff_grows_with_jitter():
+    """Tests if backoff is random and bounded by exponentially growing cap"""
+    policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+
+    delays = [policy.backoff(attempt) for attempt in range(6) for _ in range(50)]
+    assert all(0 <= delay <= 1.0 for delay in delays)
+    assert max(delays[:50]) <= 0.1
+    assert len(set(delays[:50])) > 1
+    assert max(delays[-50:]) > 0.5
+
+
+def test_retry_status_and_header():
+    """Tests if only rejected requests are repeated for all methods"""
+    assert is_retryable_status(429, "POST")
+    assert is_retryable_status(503, "GET")
+    assert not is_retryable_status(503, "POST")
+    assert not is_retryable_status(400, "GET")
+    assert parse_retry_after({"Retry-After": "3"}) == 3.0
+    assert parse_retry_after({}) is None
+    assert parse_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+
+
+def test_call_retries_transient_errors():
+    """Tests if transient failures are repeated and other errors raised at once"""
+    policy = RetryPolicy(base_delay=0.001)
+
+    func = failing(2)
+    assert policy.call("depth", func) == "ok"
+    assert len(func.calls) == 3
+
+    func = failing(1, ValueError("bad request"))
+    with pytest.raises(ValueError):
+        policy.call("depth", func)
+    assert len(func.calls) == 1
+
+    func = failing(10)
+    with pytest.raises(RetryableError):
+        policy.call("depth", func)
+    assert len(func.calls) == 4
+
+    metrics = policy.metrics()
+    assert metrics["calls"] == 3
+    assert metrics["retries"] == 5
+    assert metrics["failures"] == 1
+
+
+def test_call_honors_retry_after():
+    """Tests if requested delay is kept and too long delay is not waited for"""
+    policy = RetryPolicy(max_delay=1.0)
+
+    func = failing(1, RetryableError("rate limited", retry_after=0.05))
+    start = time.monotonic()
+    assert policy.call("orders", func) == "ok"
+    assert time.monotonic() - start >= 0.05
+
+    func = failing(1, RetryableError("banned", retry_after=120))
+    start = time.monotonic()
+    with pytest.raises(RetryableError):
+        policy.call("orders", func)
+    assert time.monotonic() - start < 0.05
+    assert len(func.calls) == 1
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """Tests if failing endpoint is rejected until trial request succeeds"""
+    policy = RetryPolicy(max_attempts=1, failure_threshold=3, reset_timeout=0.05)
+
+    for _ in range(3):
+        with pytest.raises(RetryableError):
+            policy.call("depth", failing(1))
+    func = failing(0)
+    with pytest.raises(CircuitOpenError):
+        policy.call("depth", func)
+    assert not func.calls
+    assert policy.call("klines", func) == "ok"
+    assert policy.metrics()["open"] == ["depth"]
+
+    time.sleep(0.05)
+    assert policy.breaker("depth").state == "half-open"
+    assert policy.call("depth", func) == "ok"
+    assert policy.breaker("depth").state == "closed"
+    assert policy.metrics()["rejected"] == 1
+
+
+def test_failures_not_retried_open_circuit():
+    """Tests if server errors of orders count as failures while client errors do not"""
+    policy = RetryPolicy(is_retryable=is_retryable, failure_threshold=2)
+
+    for _ in range(2):
+        with pytest.raises(BinanceAPIException):
+            policy.call("order", failing(1, binance_error(502, "POST")))
+    assert policy.breaker("order").state == "open"
+
+    for _ in range(2):
+        with pytest.raises(BinanceAPIException):
+            policy.call("account", failing(1, binance_error(400)))
+    with pytest.raises(requests.ReadTimeout):
+        policy.call("account", failing(1, requests.ReadTimeout()))
+    assert policy.breaker("account").state == "closed"
+    assert policy.breaker("account").failures == 1
+
+
+def test_failed_trial_opens_circuit():
+    """Tests if single failure in half-open state opens the circuit again"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.02)
+    breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.allow() > 0
+
+    time.sleep(0.02)
+    assert breaker.allow() == 0
+    assert breaker.allow() > 0
+    assert breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_retry_budget_limits_retries():
+    """Tests if retries stop when budget is spent"""
+    policy = RetryPolicy(base_delay=0, budget=RetryBudget(ratio=0.5, capacity=2))
+
+    func = failing(10)
+    with pytest.raises(RetryableError):
+        policy.call("tickers", func)
+    assert len(func.calls) == 3
+
+    func = failing(10)
+    with pytest.raises(RetryableError):
+        policy.call("tickers", func)
+    assert len(func.calls) == 1
+    assert policy.metrics()["budget"] == pytest.approx(0.5)
+
+
+def test_call_async():
+    """Tests if coroutine functions are repeated"""
+    policy = RetryPolicy(base_delay=0.001)
+    calls = []
+
+    async def fetch(value):
+        calls.append(value)
+        if len(calls) < 3:
+            raise RetryableError("unavailable")
+        return value
+
+    assert asyncio.run(policy.call_async("depth", fetch, "ok")) == "ok"
+    assert calls == ["ok", "ok", "ok"]
+
+
+def test_cancelled_trial_releases_circuit():
+    """Tests if cancelled trial request does not keep the circuit half-open forever"""
+    policy = RetryPolicy(max_attempts=1, failure_threshold=1, reset_timeout=0.02)
+    with pytest.raises(RetryableError):
+        policy.call("depth", failing(1))
+    time.sleep(0.02)
+
+    async def hanging():
+        await asyncio.sleep(10)
+
+    async def cancel_trial():
+        task = asyncio.ensure_future(policy.call_async("depth", hanging))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+
+    assert policy.breaker("depth").allow() == 0
+    policy.breaker("depth").release()
+    assert policy.call("depth", failing(0)) == "ok"
+    assert policy.breaker("depth").state == "closed"
+
+
+def test_transport_errors_are_transient():
+    """Tests if aiohttp failures are repeated only when it is safe"""
+    disconnected = aiohttp.ServerDisconnectedError()
+    assert is_transient(TransportError("get", disconnected))
+    assert is_transient(TransportError("get", asyncio.TimeoutError()))
+    assert not is_transient(TransportError("post", disconnected))
+    assert is_transient(TransportError("post", OSError(), connect_failed=True))
+
+
+def test_async_binance_retries(http_stub_server, binance_order_book_resp):
+    """Tests if asyncio client repeats failed connections and responses with HTML body"""
+    path = "/api/v3/depth"
+    http_stub_server.routes[path] = binance_order_book_resp
+    http_stub_server.statuses[path] = [503, 429]
+    http_stub_server.error_bodies[path] = b"<html>Service Unavailable</html>"
+
+    async def fetch(api_addr):
+        async with AsyncBinance("access", "secret", retry=RetryPolicy(base_delay=0.001)) as client:
+            client.api_addr = api_addr
+            return await client.get_order_book("ADA", "BTC"), client.retry.metrics()
+
+    order_book, metrics = asyncio.run(fetch(http_stub_server.url))
+    assert order_book[MarketSide.ASK] == binance_order_book_resp["asks"]
+    assert len(http_stub_server.requests) == 3
+    assert metrics["retries"] == 2
+
+    order_book, metrics = asyncio.run(fetch("http://127.0.0.1:1"))
+    assert order_book is None
+    assert metrics["retries"] == 3
+    assert metrics["failures"] == 1
+
+
+def test_binance_is_retryable():
+    """Tests if orders are repeated only when rejected by rate limit"""
+    assert is_retryable(binance_error(429, "POST"))
+    assert is_retryable(binance_error(502))
+    assert not is_retryable(binance_error(502, "POST"))
+    assert not is_retryable(binance_error(400))
+    assert RetryPolicy().retry_after(binance_error(429, retry_after="7")) == 7.0
+
+
+def test_binance_get_coins_prices_retries(
+    binance_client, binance_book_tickers_resp, binance_tickers_exchange_info_resp, monkeypatch
+):
+    """Tests if tickers are downloaded again after server error"""
+    binance_client.retry = RetryPolicy(base_delay=0.001, is_retryable=is_retryable)
+    responses = [binance_error(503), binance_book_tickers_resp]
+
+    def get_orderbook_tickers_mock():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(binance_client.client, "get_orderbook_tickers", get_orderbook_tickers_mock)
+    monkeypatch.setattr(
+        binance_client.client, "get_exchange_info", lambda: binance_tickers_exchange_info_resp
+    )
+
+    assert binance_client.get_coins_prices(("ADA",), "BTC", MarketSide.ASK) == {
+        "ADA-BTC": "0.00002375"
+    }
+    assert binance_client.retry.metrics()["retries"] == 1
+
+
+def test_kucoin_retries_server_errors(http_stub_server, kucoin_ticker_ok_resp):
+    """Tests if Kucoin client repeats requests answered with 429 and 503"""
+    path = "/api/v1/market/orderbook/level1"
+    http_stub_server.routes[path] = kucoin_ticker_ok_resp
+    http_stub_server.statuses[path] = [503, 429]
+    client = Kucoin("access", "secret", "passphrase", retry=RetryPolicy(base_delay=0.001))
+    client.api_addr = http_stub_server.url
+
+    assert client.get_coin_price("BTC", "USDT") == "19284.4"
+    assert len(http_stub_server.requests) == 3
+
+    http_stub_server.routes[path] = {"code": "503", "msg": "Service Unavailable"}
+    http_stub_server.statuses[path] = [503] * 4
+    assert client.get_coin_price("BTC", "USDT") is None
+    client.close()
+
+    assert len(http_stub_server.requests) == 7
+    assert client.retry.metrics()["failures"] == 1
@@ -0,0 +1,181 @@
+""" Unit tests for singleflight.py """
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from crypto_exchange_handler.async_kucoin import AsyncKucoin
+from crypto_exchange_handler.async_exchange_template import create_async_session
+from crypto_exchange_handler.singleflight import AsyncSingleFlight, SingleFlight, call_key
+
+
+def slow(result, calls, delay=0.05):
+    """
+    :return: function registering its calls and returning result after delay
+    """
+
+    def func():
+        calls.append(threading.get_ident())
+        time.sleep(delay)
+        return result
+
+    return func
+
+
+def test_concurrent_calls_share_result():
+    """Tests if identical calls in flight execute function once"""
+    flights = SingleFlight()
+    calls = []
+    func = slow({"ADA-BTC": "0.00002375"}, calls)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: flights.do("prices", "ADA", func), range(8)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert (flights.calls, flights.executions) == (8, 1)
+
+    flights.do("prices", "ADA", func)
+    assert len(calls) == 2
+
+
+def test_distinct_keys_are_not_shared():
+    """Tests if calls with different arguments run separately"""
+    flights = SingleFlight()
+    calls = []
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda key: flights.do("prices", key, slow(key, calls)), "ABCD"))
+
+    assert len(calls) == 4
+    key = call_key((["ADA", "XRP"],), {"quote": "BTC"})
+    assert key == call_key((("ADA", "XRP"),), {"quote": "BTC"})
+
+
+def test_error_is_shared_and_not_cached():
+    """Tests if exception is raised for every waiting caller and call is repeated later"""
+    flights = SingleFlight(windows={"book": 10})
+    calls = []
+
+    def func():
+        calls.append(1)
+        time.sleep(0.05)
+        raise ConnectionError("unavailable")
+
+    def call(_):
+        with pytest.raises(ConnectionError):
+            flights.do("book", "ADA-BTC", func)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(call, range(4)))
+    assert len(calls) == 1
+
+    call(None)
+    assert len(calls) == 2
+
+
+def test_freshness_window():
+    """Tests if completed result is reused within window of its method"""
+    flights = SingleFlight(windows={"book": 0.05})
+    calls = []
+
+    for _ in range(5):
+        flights.do("book", "ADA-BTC", slow("book", calls, delay=0))
+        flights.do("price", "ADA-BTC", slow("price", calls, delay=0))
+    assert calls.count(calls[0]) == 6
+
+    time.sleep(0.05)
+    flights.do("book", "ADA-BTC", slow("book", calls, delay=0))
+    assert len(calls) == 7
+
+
+def test_expired_results_are_evicted():
+    """Tests if results outside of their window do not stay in memory"""
+    flights = SingleFlight(windows={"book": 0.05})
+    calls = []
+
+    for pair in ("ADA-BTC", "XRP-BTC", "ETH-BTC"):
+        flights.do("book", pair, slow(pair, calls, delay=0))
+    assert len(flights._flights) == 3  # pylint: disable=protected-access
+
+    time.sleep(0.05)
+    flights.do("book", "DOT-BTC", slow("DOT-BTC", calls, delay=0))
+    assert list(flights._flights) == [("book", "DOT-BTC")]  # pylint: disable=protected-access
+
+
+def test_async_expired_results_are_evicted():
+    """Tests if coroutine results are dropped when their window ends"""
+    flights = AsyncSingleFlight(windows={"book": 0.05})
+
+    async def fetch():
+        return "book"
+
+    async def run():
+        await flights.do("book", "ADA-BTC", fetch)
+        cached = len(flights._flights)  # pylint: disable=protected-access
+        await asyncio.sleep(0.1)
+        return cached, len(flights._flights)  # pylint: disable=protected-access
+
+    assert asyncio.run(run()) == (1, 0)
+
+
+def test_async_calls_share_task():
+    """Tests if concurrent coroutines await single task"""
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "0.00002375"
+
+    async def run():
+        waiter = asyncio.ensure_future(flights.do("price", "ADA", fetch))
+        await asyncio.sleep(0)
+        results = asyncio.gather(*(flights.do("price", "ADA", fetch) for _ in range(9)))
+        waiter.cancel()
+        return await results
+
+    assert asyncio.run(run()) == ["0.00002375"] * 9
+    assert len(calls) == 1
+    assert (flights.calls, flights.executions) == (10, 1)
+
+
+def test_async_client_coalesces_requests(http_stub_server, kucoin_ticker_all_ok_resp):
+    """Tests if strategies asking for the same prices send one request"""
+    http_stub_server.routes["/api/v1/market/allTickers"] = kucoin_ticker_all_ok_resp
+
+    async def fetch():
+        async with create_async_session() as session:
+            kucoin = AsyncKucoin("access", "secret", "passphrase", session=session)
+            kucoin.api_addr = http_stub_server.url
+            return await asyncio.gather(
+                *(kucoin.get_coins_prices(["ADA", "XRP"], "BTC") for _ in range(10))
+            )
+
+    results = asyncio.run(fetch())
+
+    assert results == [{"ADA-BTC": "0.00002375", "XRP-BTC": "0.00001616"}] * 10
+    assert len(http_stub_server.requests) == 1
+
+
+def test_client_coalesces_threads(kucoin_client, kucoin_ticker_ok_resp, monkeypatch):
+    """Tests if strategy threads asking for the same price send one request"""
+    requests = []
+
+    def send_pub_request_mock(addr, data=None):  # pylint: disable=unused-argument
+        requests.append(data)
+        time.sleep(0.05)
+        return kucoin_ticker_ok_resp
+
+    monkeypatch.setattr(kucoin_client, "send_pub_request", send_pub_request_mock)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        prices = list(
+            executor.map(lambda coin: kucoin_client.get_coin_price(coin, "USDT"), ["BTC"] * 6)
+        )
+
+    assert prices == ["19284.4"] * 6
+    assert requests == [{"symbol": "BTC-USDT"}]
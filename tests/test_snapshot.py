@@ -0,0 +1,62 @@
+""" Unit tests for snapshot.py """
+import asyncio
+
+from crypto_exchange_handler.snapshot import AsyncSnapshot, Snapshot
+
+
+def test_snapshot_reused_within_ttl(monkeypatch):
+    """Tests if value is loaded again only after ttl expires"""
+    now = [100.0]
+    monkeypatch.setattr("crypto_exchange_handler.snapshot.time.monotonic", lambda: now[0])
+    snapshot = Snapshot(lambda: {"loaded_at": now[0]}, ttl=5)
+
+    assert snapshot.get() == {"loaded_at": 100.0}
+    now[0] = 104.0
+    assert snapshot.get() == {"loaded_at": 100.0}
+    now[0] = 105.0
+    assert snapshot.get() == {"loaded_at": 105.0}
+    assert snapshot.loads == 2
+
+
+def test_snapshot_does_not_cache_failures():
+    """Tests if failed load is retried and invalidation forces reload"""
+    results = [None, {"ok": 1}, {"ok": 2}]
+    snapshot = Snapshot(lambda: results.pop(0), ttl=60)
+
+    assert snapshot.get() is None
+    assert snapshot.get() == {"ok": 1}
+    snapshot.invalidate()
+    assert snapshot.get() == {"ok": 2}
+
+
+def test_snapshot_expired_value_not_returned_on_failure(monkeypatch):
+    """Tests if failed reload of expired value returns None instead of stale data"""
+    now = [100.0]
+    monkeypatch.setattr("crypto_exchange_handler.snapshot.time.monotonic", lambda: now[0])
+    results = [{"ok": 1}, None, {"ok": 2}]
+    snapshot = Snapshot(lambda: results.pop(0), ttl=5)
+
+    assert snapshot.get() == {"ok": 1}
+    now[0] = 105.0
+    assert snapshot.get() is None
+    assert not snapshot.is_fresh()
+    assert snapshot.get() == {"ok": 2}
+    assert snapshot.loads == 3
+
+
+def test_async_snapshot_single_load():
+    """Tests if concurrent coroutines await single load and failures are not cached"""
+    results = [None, {"ok": 1}]
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        return results.pop(0)
+
+    snapshot = AsyncSnapshot(loader, ttl=60)
+
+    async def run():
+        failed = await snapshot.get()
+        return failed, await asyncio.gather(*(snapshot.get() for _ in range(5)))
+
+    assert asyncio.run(run()) == (None, [{"ok": 1}] * 5)
+    assert snapshot.loads == 2
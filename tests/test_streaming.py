@@ -0,0 +1,93 @@
+""" Unit tests of WebSocket market data streams """
+import time
+
+from crypto_exchange_handler.exchange_template import MarketSide
+from crypto_exchange_handler.streaming import BinanceStream, Channel, KucoinStream
+
+EXPECTED_ORDER_BOOK_ASKS = [["0.00002375", "800"], ["0.00002376", "4100"]]
+
+
+def has_ping(messages):
+    """Checks if client sent application level ping."""
+    return any(message["type"] == "ping" for message in messages)
+
+
+def test_binance_stream(websocket_stub_server, binance_stream_messages):
+    """Tests if combined streams are subscribed and replayed messages update the state"""
+    websocket_stub_server.replay = binance_stream_messages
+    stream = BinanceStream(websocket_stub_server.url)
+    stream.subscribe(Channel.TICKER, "ADA", "BTC").subscribe(Channel.DEPTH, "ada", "btc")
+    stream.subscribe(Channel.CANDLES, "ADA", "BTC", "1m")
+
+    stream.start()
+    try:
+        assert stream.state.wait_for_updates(len(binance_stream_messages), timeout=5)
+    finally:
+        stream.stop()
+
+    assert websocket_stub_server.paths == [
+        "/stream?streams=adabtc@ticker/adabtc@depth20@100ms/adabtc@kline_1m"
+    ]
+    assert stream.get_coin_price("ADA", "BTC") == "0.00002375"
+    assert stream.get_coin_price("ADA", "BTC", MarketSide.BID) == "0.00002373"
+    assert stream.get_coins_prices(("ADA", "XRP"), price_type=MarketSide.LATEST) == {
+        "ADA-BTC": "0.00002374"
+    }
+    assert stream.get_order_book("ADA", "BTC")[MarketSide.BID][0] == ["0.00002373", "1200.00000000"]
+    candles = stream.get_last_candles("ADA", "BTC", "1m", 5)
+    assert [candle["ts"] for candle in candles] == [1655652660, 1655652600]
+    assert candles[1] == {
+        "ts": 1655652600, "open": 2.37e-05, "high": 2.375e-05, "low": 2.369e-05, "close": 2.374e-05
+    }
+    assert stream.get_coin_price("XRP", "BTC") is None
+
+
+def test_kucoin_stream(
+    http_stub_server, websocket_stub_server, kucoin_bullet_resp, kucoin_stream_messages
+):
+    """Tests if bullet token is used to connect and channels are subscribed"""
+    kucoin_bullet_resp["data"]["instanceServers"][0]["endpoint"] = websocket_stub_server.url
+    http_stub_server.routes["/api/v1/bullet-public"] = kucoin_bullet_resp
+    websocket_stub_server.replay = kucoin_stream_messages
+    stream = KucoinStream(http_stub_server.url)
+    stream.subscribe(Channel.TICKER, "ADA", "BTC").subscribe(Channel.DEPTH, "ADA", "BTC")
+    stream.subscribe(Channel.CANDLES, "ADA", "BTC", "1min")
+
+    stream.start()
+    try:
+        assert stream.state.wait_for_updates(3, timeout=5)
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not has_ping(websocket_stub_server.received):
+            time.sleep(0.01)
+    finally:
+        stream.stop()
+
+    assert http_stub_server.requests[0][:2] == ("POST", "/api/v1/bullet-public")
+    assert websocket_stub_server.paths[0].startswith("/?token=2neAiuYvAU61ZDXANAGAsiL4")
+    subscriptions = [item for item in websocket_stub_server.received if item["type"] == "subscribe"]
+    assert [item["topic"] for item in subscriptions] == [
+        "/market/ticker:ADA-BTC",
+        "/spotMarket/level2Depth50:ADA-BTC",
+        "/market/candles:ADA-BTC_1min",
+    ]
+    assert has_ping(websocket_stub_server.received)
+    assert stream.get_coin_price("ADA", "BTC", MarketSide.LATEST) == "0.00002374"
+    assert stream.get_order_book("ADA", "BTC")[MarketSide.ASK] == EXPECTED_ORDER_BOOK_ASKS
+    assert stream.get_last_candles("ADA", "BTC", "1min", 1)[0] == {
+        "ts": 1655652600, "open": 2.37e-05, "close": 2.374e-05, "high": 2.375e-05, "low": 2.369e-05
+    }
+
+
+def test_stream_reconnects(websocket_stub_server, binance_stream_messages):
+    """Tests if stream connects again after server closed the connection"""
+    websocket_stub_server.replay = binance_stream_messages[:1] + [None]
+    stream = BinanceStream(websocket_stub_server.url, reconnect_delay=0.01)
+    stream.subscribe(Channel.TICKER, "ADA", "BTC")
+
+    stream.start()
+    try:
+        assert stream.state.wait_for_updates(3, timeout=5)
+    finally:
+        stream.stop()
+
+    assert stream.connections >= 3
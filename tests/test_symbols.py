@@ -0,0 +1,60 @@
+"""
+Tests of markets metadata index
+"""
+from crypto_exchange_handler.symbols import binance_symbol_index, kucoin_symbol_index
+
+
+def test_binance_symbol_index(binance_markets_ok_resp):
+    """Tests if exchangeInfo filters are extracted to market metadata"""
+    index = binance_symbol_index(binance_markets_ok_resp)
+
+    assert len(index) == 3
+    assert index.symbols() == ("REQETH", "REQBTC", "NULSETH")
+    assert "REQBTC" in index
+    info = index.get("NULSETH")
+    assert (info.base, info.quote) == ("NULS", "ETH")
+    assert info.tick_size == "0.00000010"
+    assert (info.lot_size, info.min_size) == ("0.10000000", "0.10000000")
+    assert not info.trading
+    assert index.find("req", "btc").symbol == "REQBTC"
+    assert [info.symbol for info in index.with_quote("ETH")] == ["REQETH", "NULSETH"]
+    assert [info.symbol for info in index.with_base("REQ")] == ["REQETH", "REQBTC"]
+    assert index.get("ADABTC") is None
+    assert index.with_quote("USDT") == ()
+
+
+def test_binance_symbol_index_ambiguous_suffix(binance_tickers_exchange_info_resp):
+    """Tests if base currency is not guessed from symbol ending with quote"""
+    index = binance_symbol_index(binance_tickers_exchange_info_resp)
+
+    assert index.get("WBTCBTC").base == "WBTC"
+    assert index.find("WBTC", "BTC").symbol == "WBTCBTC"
+    assert index.find("W", "BTCBTC") is None
+
+
+def test_kucoin_symbol_index(kucoin_markets_ok_resp):
+    """Tests if Kucoin symbols are indexed by base and quote currency"""
+    index = kucoin_symbol_index(kucoin_markets_ok_resp["data"])
+
+    assert index.symbols() == ("REQ-ETH", "REQ-BTC", "NULS-ETH")
+    assert index.find("NULS", "ETH").symbol == "NULS-ETH"
+    assert index.get("REQ-BTC").trading
+
+
+def test_symbol_index_loaded_once(kucoin_client, kucoin_markets_ok_resp, monkeypatch):
+    """Tests if symbols are downloaded only once until refresh"""
+    calls = []
+
+    def send_pub_request_mock(self):  # pylint: disable=unused-argument
+        calls.append(1)
+        return kucoin_markets_ok_resp
+
+    monkeypatch.setattr(kucoin_client, "send_pub_request", send_pub_request_mock)
+
+    for _ in range(10):
+        assert kucoin_client.get_symbol_info("REQ-BTC").quote == "BTC"
+    assert kucoin_client.get_symbol_info("ADA-BTC") is None
+    assert len(calls) == 1
+
+    kucoin_client.refresh_symbols()
+    assert len(calls) == 2
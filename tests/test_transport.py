@@ -0,0 +1,39 @@
+""" Unit tests for transport.py and connection reuse of exchange clients """
+from crypto_exchange_handler.kucoin import Kucoin
+from crypto_exchange_handler.transport import create_session
+
+
+def test_create_session_pool_size():
+    """Tests if session is created with requested connection pool"""
+    session = create_session(pool_size=25, keep_alive=False)
+
+    adapter = session.get_adapter("https://api.kucoin.com")
+    assert adapter._pool_maxsize == 25  # pylint: disable=protected-access
+    assert session.headers["Connection"] == "close"
+
+
+def test_kucoin_reuses_connection(http_stub_server, kucoin_ticker_ok_resp):
+    """Tests if 1000 sequential requests are sent over single connection"""
+    http_stub_server.routes["/api/v1/market/orderbook/level1"] = kucoin_ticker_ok_resp
+    client = Kucoin("access", "secret", "passphrase", timeout=5)
+    client.api_addr = http_stub_server.url
+
+    for _ in range(1000):
+        assert client.get_coin_price("BTC", "USDT") == "19284.4"
+    client.close()
+
+    assert len(http_stub_server.requests) == 1000
+    assert len(http_stub_server.connections) == 1
+
+
+def test_kucoin_without_keep_alive(http_stub_server, kucoin_ticker_ok_resp):
+    """Tests if disabling keep-alive opens new connection for every request"""
+    http_stub_server.routes["/api/v1/market/orderbook/level1"] = kucoin_ticker_ok_resp
+    client = Kucoin("access", "secret", "passphrase", keep_alive=False)
+    client.api_addr = http_stub_server.url
+
+    for _ in range(10):
+        client.get_coin_price("BTC", "USDT")
+    client.close()
+
+    assert len(http_stub_server.connections) == 10
@@ -0,0 +1,70 @@
+"""
+Fixtures providing local WebSocket server replaying recorded exchange messages.
+"""
+import asyncio
+import json
+import threading
+
+import pytest
+import websockets
+
+
+class WebSocketStub:
+    """
+    WebSocket server sending `replay` messages to every connected client
+    and registering paths of connections and messages sent by clients.
+    None in `replay` closes the connection.
+    """
+
+    def __init__(self):
+        self.replay = []
+        self.paths = []
+        self.received = []
+        self.url = None
+        self.loop = asyncio.new_event_loop()
+        self._server = None
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    async def _handler(self, connection):
+        self.paths.append(connection.request.path)
+        for message in self.replay:
+            if message is None:
+                await connection.close()
+                return
+            await connection.send(json.dumps(message))
+        async for message in connection:
+            self.received.append(json.loads(message))
+
+    async def _serve(self):
+        self._server = await websockets.serve(self._handler, "127.0.0.1", 0)
+        port = next(iter(self._server.sockets)).getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}"
+
+    def start(self):
+        """Starts server in a background thread."""
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._serve(), self.loop).result(5)
+
+    def stop(self):
+        """Closes server and its connections."""
+
+        async def close():
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(close(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(5)
+        self.loop.close()
+
+
+@pytest.fixture
+def websocket_stub_server():
+    """
+    Local WebSocket server replaying messages registered in `replay` attribute.
+    :return: running server instance, its address is available in `url` attribute
+    """
+    server = WebSocketStub()
+    server.start()
+    yield server
+    server.stop()